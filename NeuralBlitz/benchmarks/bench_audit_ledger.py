@@ -0,0 +1,70 @@
+"""
+Throughput benchmark for the HALIC audit ledger.
+
+Appends seals one at a time and in batches, times inclusion proofs, then
+verifies the whole ledger from disk and reports seals/s and MB/s.
+
+Usage:
+    python -m benchmarks.bench_audit_ledger --seals 1000000 --batch-size 1000
+"""
+
+import argparse
+import hashlib
+import os
+import random
+import tempfile
+import time
+
+from interface_layer.halic.audit_ledger import RECORD_SIZE, AuditLedger, verify_inclusion, verify_ledger
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seals", type=int, default=1_000_000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--proofs", type=int, default=10_000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    seals = []
+    for number in range(args.seals):
+        digest = hashlib.sha256(number.to_bytes(8, "little")).hexdigest()
+        seals.append((digest, digest[:32], digest[32:], float(number)))
+
+    with tempfile.TemporaryDirectory() as directory:
+        single = min(args.seals, 100_000)
+        ledger = AuditLedger(os.path.join(directory, "single"), sync=False)
+        started = time.perf_counter()
+        for seal in seals[:single]:
+            ledger.append(*seal)
+        ledger.close()
+        print(f"{'append':<14}{single / (time.perf_counter() - started):>14,.0f} seals/s", flush=True)
+
+        path = os.path.join(directory, "batched")
+        ledger = AuditLedger(path, sync=False)
+        started = time.perf_counter()
+        for start in range(0, args.seals, args.batch_size):
+            ledger.append_many(seals[start:start + args.batch_size])
+        ledger.commit()
+        print(f"{'append_many':<14}{args.seals / (time.perf_counter() - started):>14,.0f} seals/s", flush=True)
+
+        started = time.perf_counter()
+        for _ in range(args.proofs):
+            index = rng.randrange(args.seals)
+            proof = ledger.prove(index)
+            assert verify_inclusion(proof["record"], index, proof["size"], proof["path"], proof["root"])
+        elapsed = time.perf_counter() - started
+        print(f"{'prove+verify':<14}{elapsed / args.proofs * 1e6:>14,.1f} us/proof "
+              f"({len(proof['path'])} hashes)", flush=True)
+        ledger.close()
+
+        started = time.perf_counter()
+        result = verify_ledger(path)
+        elapsed = time.perf_counter() - started
+        assert result["head_ok"] and not result["errors"]
+        print(f"{'verify_ledger':<14}{args.seals / elapsed:>14,.0f} seals/s "
+              f"({args.seals * RECORD_SIZE / elapsed / 1e6:,.0f} MB/s)", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Batch-evaluation benchmark for the Conscientia Engine.
+
+Generates proposed actions, evaluates them once with one
+`evaluate_ethical_implications` call each and once with `evaluate_many` in
+batches of the requested sizes, checks that the reports agree, and reports
+throughput and speed-up over per-item calls.
+
+Usage:
+    python -m benchmarks.bench_conscientia_batch --actions 100000 --batch-sizes 100 1000 10000
+"""
+
+import argparse
+import random
+import time
+
+from subsystems.conscientia.conscientia_core import ConscientiaEngine
+
+WORDS = [f"w{index}x" for index in range(5000)] + ["Stereotype"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--actions", type=int, default=100_000)
+    parser.add_argument("--content-length", type=int, default=400)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[100, 1000, 10_000])
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    actions = []
+    for index in range(args.actions):
+        content = ""
+        while len(content) < args.content_length:
+            content += rng.choice(WORDS) + " "
+        actions.append({"type": "generate_response", "content": content,
+                        "num_perspectives": rng.randint(1, 3)})
+    print(f"{args.actions:,} actions of {args.content_length} chars", flush=True)
+    print(f"{'mode':<14}{'actions/s':>12}{'speed-up':>10}", flush=True)
+
+    engine = ConscientiaEngine({}, charter_layer=None)
+    started = time.perf_counter()
+    expected = [engine.evaluate_ethical_implications(action) for action in actions]
+    baseline = args.actions / (time.perf_counter() - started)
+    print(f"{'per item':<14}{baseline:>12,.0f}{1.0:>10.2f}", flush=True)
+
+    for batch_size in args.batch_sizes:
+        started = time.perf_counter()
+        reports = []
+        for offset in range(0, args.actions, batch_size):
+            reports.extend(engine.evaluate_many(actions[offset:offset + batch_size]))
+        rate = args.actions / (time.perf_counter() - started)
+        if reports != expected:
+            raise SystemExit(f"Batch size {batch_size} produced different reports.")
+        print(f"{f'batch {batch_size}':<14}{rate:>12,.0f}{rate / baseline:>10.2f}",
+              flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Batched traversal benchmark for the DRS.
+
+Builds a random knowledge graph, then times answering the same work two ways:
+one `find_connections` / 1-hop `neighbourhood` call per concept, versus a single
+`connections_many` / `neighbourhood` call for the whole batch. Reports the time
+per concept as the batch grows.
+
+Usage:
+    python -m benchmarks.bench_drs_batch --concepts 100000 --batches 1 8 64 256
+"""
+
+import argparse
+import random
+import time
+
+from core_engine.drs_engine.drs_manager import DRSEngine
+
+RELATIONS = ("depends_on", "part_of", "causes", "related_to")
+
+
+def timed(function) -> float:
+    started = time.perf_counter()
+    function()
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--concepts", type=int, default=100_000)
+    parser.add_argument("--backend", default="in-memory")
+    parser.add_argument("--hops", type=int, default=2)
+    parser.add_argument("--batches", type=int, nargs="+", default=[1, 8, 64, 256])
+    args = parser.parse_args()
+
+    print(f"{'batch':>6}{'paths: each':>14}{'batched':>10}{'hood: each':>14}{'batched':>10}   (ms/concept)",
+          flush=True)
+    rng = random.Random(0)
+    engine = DRSEngine({"backend": args.backend})
+    engine.store_many((f"concept_{index}", {}, [
+        {"target": f"concept_{rng.randrange(args.concepts)}", "relation": rng.choice(RELATIONS)}
+        for _ in range(4)]) for index in range(args.concepts))
+
+    for size in args.batches:
+        # A request's key concepts are all looked up against a few targets.
+        starts = [f"concept_{rng.randrange(args.concepts)}" for _ in range(size)]
+        ends = [f"concept_{rng.randrange(args.concepts)}" for _ in range(4)]
+        pairs = [(start, end) for start in starts for end in ends]
+        each = timed(lambda: [engine.find_connections(start, end) for start, end in pairs])
+        batched = timed(lambda: engine.connections_many(pairs))
+        hood_each = timed(lambda: [engine.neighbourhood([start], hops=args.hops) for start in starts])
+        hood_batched = timed(lambda: engine.neighbourhood(starts, hops=args.hops))
+        print(f"{size:>6}{each * 1000 / size:>14.3f}{batched * 1000 / size:>10.3f}"
+              f"{hood_each * 1000 / size:>14.3f}{hood_batched * 1000 / size:>10.3f}",
+              flush=True)
+
+
+if __name__ == "__main__":
+    main()
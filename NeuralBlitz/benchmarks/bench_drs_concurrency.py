@@ -0,0 +1,81 @@
+"""
+Concurrency stress benchmark for the DRS.
+
+Preloads a random knowledge graph into a DRSEngine running in "rwlock" mode,
+then, for a growing number of reader threads, runs queries and path searches
+while one writer thread keeps ingesting new concepts. Reports query and write
+throughput for each thread count.
+
+Usage:
+    python -m benchmarks.bench_drs_concurrency --concepts 50000 --seconds 3
+"""
+
+import argparse
+import random
+import threading
+import time
+
+from core_engine.drs_engine.drs_manager import DRSEngine
+
+RELATIONS = ("depends_on", "part_of", "causes", "related_to")
+
+
+def random_record(rng: random.Random, name: str, concepts: int) -> tuple:
+    connections = [{"target": f"concept_{rng.randrange(concepts)}", "relation": rng.choice(RELATIONS)}
+                   for _ in range(4)]
+    return name, {"source": "benchmark"}, connections
+
+
+def run(engine: DRSEngine, concepts: int, readers: int, seconds: float) -> tuple:
+    """Runs `readers` query threads against one ingesting writer; returns (queries/s, writes/s)."""
+    stop = threading.Event()
+    query_counts = [0] * readers
+    write_count = [0]
+
+    def reader(slot: int):
+        rng = random.Random(slot)
+        while not stop.is_set():
+            start, end = f"concept_{rng.randrange(concepts)}", f"concept_{rng.randrange(concepts)}"
+            engine.query(start)
+            engine.find_connections(start, end, max_depth=4)
+            query_counts[slot] += 2
+
+    def writer():
+        rng = random.Random(-1)
+        while not stop.is_set():
+            batch = [random_record(rng, f"concept_{rng.randrange(concepts)}", concepts) for _ in range(100)]
+            engine.store_many(batch, batch_size=25)
+            write_count[0] += len(batch)
+
+    threads = [threading.Thread(target=reader, args=(slot,)) for slot in range(readers)]
+    threads.append(threading.Thread(target=writer))
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    return sum(query_counts) / elapsed, write_count[0] / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--concepts", type=int, default=50_000)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--backend", default="in-memory")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    print(f"{'readers':>8}{'queries/s':>14}{'writes/s':>12}", flush=True)
+    engine = DRSEngine({"backend": args.backend, "concurrency": "rwlock"})
+    rng = random.Random(0)
+    engine.store_many(random_record(rng, f"concept_{index}", args.concepts) for index in range(args.concepts))
+    for readers in args.threads:
+        queries, writes = run(engine, args.concepts, readers, args.seconds)
+        print(f"{readers:>8}{queries:>14,.0f}{writes:>12,.0f}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
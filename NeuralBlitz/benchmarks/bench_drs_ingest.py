@@ -0,0 +1,55 @@
+"""
+Ingestion throughput benchmark for the DRS.
+
+Loads the same random knowledge graph through per-concept `store()` calls and
+through `store_many()`, for each storage backend, and reports records per second.
+
+Usage:
+    python -m benchmarks.bench_drs_ingest --concepts 100000 --degree 4
+"""
+
+import argparse
+import random
+import time
+
+from core_engine.drs_engine.drs_manager import DRSEngine
+
+RELATIONS = ("depends_on", "part_of", "causes", "related_to", "contradicts")
+
+
+def generate_records(concepts: int, degree: int, seed: int = 7):
+    """Yields (concept, data, connections) records for a random graph."""
+    rng = random.Random(seed)
+    for index in range(concepts):
+        connections = [
+            {"target": f"concept_{rng.randrange(concepts)}", "relation": rng.choice(RELATIONS)}
+            for _ in range(degree)
+        ]
+        yield f"concept_{index}", {"rank": index}, connections
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--concepts", type=int, default=100_000)
+    parser.add_argument("--degree", type=int, default=4)
+    args = parser.parse_args()
+
+    print(f"{'backend':<10}{'method':<12}{'records/s':>12}{'seconds':>10}")
+    for backend in ("in-memory", "compact"):
+        engine = DRSEngine({"backend": backend})
+        started = time.perf_counter()
+        for concept, data, connections in generate_records(args.concepts, args.degree):
+            engine.store(concept, data, connections)
+        single = time.perf_counter() - started
+
+        engine = DRSEngine({"backend": backend})
+        started = time.perf_counter()
+        engine.store_many(generate_records(args.concepts, args.degree))
+        bulk = time.perf_counter() - started
+
+        print(f"{backend:<10}{'store':<12}{args.concepts / single:>12,.0f}{single:>10.2f}")
+        print(f"{backend:<10}{'store_many':<12}{args.concepts / bulk:>12,.0f}{bulk:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
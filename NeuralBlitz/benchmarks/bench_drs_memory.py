@@ -0,0 +1,70 @@
+"""
+Memory benchmark for the DRS storage backends.
+
+Builds the same random knowledge graph in the dict and compact backends and
+reports the memory each one retains, measured with tracemalloc.
+
+Usage:
+    python -m benchmarks.bench_drs_memory --concepts 200000 --degree 4
+"""
+
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+
+from core_engine.drs_engine.storage import CompactBackend, DictBackend
+
+RELATIONS = ("depends_on", "part_of", "causes", "related_to", "contradicts")
+
+
+def generate_records(concepts: int, degree: int, seed: int = 7):
+    """Yields (concept, data, connections, edges) records for a random graph."""
+    rng = random.Random(seed)
+    for index in range(concepts):
+        connections = [
+            {"target": f"concept_{rng.randrange(concepts)}", "relation": rng.choice(RELATIONS)}
+            for _ in range(degree)
+        ]
+        edges = [(c["target"], c["relation"], 1.0) for c in connections]
+        yield f"concept_{index}", {"rank": index}, connections, edges
+
+
+def measure(backend_factory, concepts: int, degree: int) -> dict:
+    """Builds a backend and returns its retained memory and build time."""
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    backend = backend_factory()
+    for concept, data, connections, edges in generate_records(concepts, degree):
+        # The compact backend only keeps the normalized edges, so it is not handed
+        # the connection dicts; the dict backend retains them by design.
+        backend.put(concept, data, connections if isinstance(backend, DictBackend) else None, edges)
+    if isinstance(backend, CompactBackend):
+        backend.compact()
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"backend": backend, "retained": current, "peak": peak, "seconds": elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--concepts", type=int, default=100_000)
+    parser.add_argument("--degree", type=int, default=4)
+    args = parser.parse_args()
+
+    edges = args.concepts * args.degree
+    print(f"{args.concepts:,} concepts, {edges:,} edges")
+    print(f"{'backend':<10}{'retained MB':>14}{'peak MB':>12}{'bytes/edge':>13}{'build s':>10}")
+    for name, factory in (("dict", DictBackend), ("compact", CompactBackend)):
+        result = measure(factory, args.concepts, args.degree)
+        print(f"{name:<10}{result['retained'] / 2**20:>14.1f}{result['peak'] / 2**20:>12.1f}"
+              f"{result['retained'] / edges:>13.1f}{result['seconds']:>10.2f}")
+        del result
+
+
+if __name__ == "__main__":
+    main()
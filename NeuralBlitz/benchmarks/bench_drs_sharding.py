@@ -0,0 +1,61 @@
+"""
+Sharding benchmark for the DRS.
+
+Loads the same random knowledge graph into a single DRSEngine and into
+ShardedDRSEngines with a growing number of worker processes, then reports
+ingestion throughput and path-search throughput for each.
+
+Usage:
+    python -m benchmarks.bench_drs_sharding --concepts 200000 --shards 1 2 4
+"""
+
+import argparse
+import random
+import time
+
+from core_engine.drs_engine.drs_manager import DRSEngine
+from core_engine.drs_engine.sharding import ShardedDRSEngine
+
+RELATIONS = ("depends_on", "part_of", "causes", "related_to")
+
+
+def random_records(concepts: int, seed: int = 0):
+    rng = random.Random(seed)
+    for index in range(concepts):
+        connections = [{"target": f"concept_{rng.randrange(concepts)}", "relation": rng.choice(RELATIONS)}
+                       for _ in range(4)]
+        yield f"concept_{index}", {"source": "benchmark"}, connections
+
+
+def measure(engine, concepts: int, searches: int) -> tuple:
+    """Returns (records/s ingested, path searches/s) for one engine."""
+    stats = engine.store_many(random_records(concepts))
+    rng = random.Random(1)
+    started = time.perf_counter()
+    for _ in range(searches):
+        engine.find_connections(f"concept_{rng.randrange(concepts)}", f"concept_{rng.randrange(concepts)}")
+    return stats["records_per_second"], searches / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--concepts", type=int, default=200_000)
+    parser.add_argument("--searches", type=int, default=200)
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    print(f"{'engine':<12}{'records/s':>12}{'searches/s':>12}", flush=True)
+    ingest_rate, search_rate = measure(DRSEngine({}), args.concepts, args.searches)
+    print(f"{'single':<12}{ingest_rate:>12,.0f}{search_rate:>12,.1f}", flush=True)
+    for shards in args.shards:
+        engine = ShardedDRSEngine({"shards": shards})
+        try:
+            ingest_rate, search_rate = measure(engine, args.concepts, args.searches)
+        finally:
+            engine.close()
+        print(f"{f'{shards} shards':<12}{ingest_rate:>12,.0f}{search_rate:>12,.1f}",
+              flush=True)
+
+
+if __name__ == "__main__":
+    main()
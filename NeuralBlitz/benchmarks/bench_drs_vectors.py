@@ -0,0 +1,65 @@
+"""
+Recall and latency benchmark for the DRS vector index.
+
+Fills a VectorIndex with clustered random embeddings, then compares exact
+search with IVF search at several `nprobe` settings: mean latency per query
+(batched) and recall@k against the exact results. Requires NumPy.
+
+Usage:
+    python -m benchmarks.bench_drs_vectors --concepts 100000 --dim 64 --k 10
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from core_engine.drs_engine.vector_index import VectorIndex
+
+
+def clustered_vectors(count: int, dim: int, clusters: int, seed: int = 3):
+    """Returns `count` vectors scattered around `clusters` random centres."""
+    rng = np.random.default_rng(seed)
+    centres = rng.normal(size=(clusters, dim))
+    labels = rng.integers(clusters, size=count)
+    return (centres[labels] + 0.5 * rng.normal(size=(count, dim))).astype(np.float32)
+
+
+def timed_search(index: VectorIndex, queries, k: int, exact: bool) -> tuple:
+    started = time.perf_counter()
+    results = index.search(queries, k=k, exact=exact)
+    return results, (time.perf_counter() - started) / len(queries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--concepts", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=64)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    vectors = clustered_vectors(args.concepts + args.queries, args.dim, clusters=200)
+    index = VectorIndex(args.dim, ivf_threshold=0)
+    for row in range(args.concepts):
+        index.add(f"concept_{row}", vectors[row])
+    queries = vectors[args.concepts:]
+
+    started = time.perf_counter()
+    index.train()
+    print(f"{args.concepts:,} concepts, dim {args.dim}, IVF trained in {time.perf_counter() - started:.2f}s "
+          f"({len(index._centroids)} clusters)")
+
+    exact, exact_latency = timed_search(index, queries, args.k, exact=True)
+    truth = [{concept for concept, _score in hits} for hits in exact]
+    print(f"{'search':<14}{'ms/query':>10}{'recall@' + str(args.k):>12}")
+    print(f"{'exact':<14}{exact_latency * 1000:>10.3f}{1.0:>12.3f}")
+    for nprobe in (1, 4, 8, 16, 32):
+        index.nprobe = nprobe
+        approximate, latency = timed_search(index, queries, args.k, exact=False)
+        recall = np.mean([len(truth[i] & {c for c, _s in hits}) / args.k for i, hits in enumerate(approximate)])
+        print(f"{'ivf nprobe=' + str(nprobe):<14}{latency * 1000:>10.3f}{recall:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
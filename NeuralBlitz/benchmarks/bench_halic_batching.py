@@ -0,0 +1,120 @@
+"""
+Load test for HALIC micro-batching.
+
+Runs closed-loop clients, each sending interactions one after another through
+the full pipeline (UNE, Conscientia, SentiaGuard), first with every client
+calling `HALICEngine.process_interaction` directly, then through a
+MicroBatchScheduler with each of the requested batch sizes. Reports throughput
+and median and 99th-percentile latency for each.
+
+Each engine is modelled as a shared backend: every call to it waits a fixed
+round trip (--engine-latency), and only --engine-capacity calls are served at
+once. Direct interactions pay that per engine call. Batched ones pay it once
+per batch. With --engine-latency 0 the engines run in-process at full speed,
+and the per-call handoffs to the scheduler's thread usually cost more than
+batching saves.
+
+Usage:
+    python -m benchmarks.bench_halic_batching --clients 64 --requests 50 --batch-sizes 8 32 128
+"""
+
+import argparse
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from core_engine.drs_engine.drs_manager import DRSEngine
+from core_engine.une.une_core import UniversalNeuralEngine
+from interface_layer.halic.batching import MicroBatchScheduler
+from interface_layer.halic.halic_core import HALICEngine
+from subsystems.conscientia.conscientia_core import ConscientiaEngine
+from subsystems.sentiaguard.sentiaguard_core import SentiaGuardEngine
+
+
+class SharedEngine:
+    """Models an engine shared by all clients, with a round trip and limited capacity."""
+    def __init__(self, engine, latency: float, slots: threading.Semaphore):
+        self._engine = engine
+        self._latency = latency
+        self._slots = slots
+
+    def __getattr__(self, name):
+        attribute = getattr(self._engine, name)
+        if not callable(attribute) or not self._latency:
+            return attribute
+
+        def call(*args, **kwargs):
+            with self._slots:
+                time.sleep(self._latency)
+            return attribute(*args, **kwargs)
+        return call
+
+
+class Charter:
+    """A Charter Layer stand-in that finds every plan compliant."""
+    def is_compliant(self, action: str) -> bool:
+        return True
+
+
+def load(handle, clients: int, requests: int) -> tuple:
+    """Returns (interactions/s, per-interaction latencies) for `clients` closed-loop clients."""
+    latencies = []
+    mutex = threading.Lock()
+
+    def client(number):
+        mine = []
+        for index in range(requests):
+            started = time.perf_counter()
+            handle(f"Explain the relationship between concept_{number} and concept_{index} in detail")
+            mine.append(time.perf_counter() - started)
+        with mutex:
+            latencies.extend(mine)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        list(pool.map(client, range(clients)))
+    return clients * requests / (time.perf_counter() - started), latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=50, help="Interactions per client.")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[8, 32, 128])
+    parser.add_argument("--max-wait", type=float, default=0.002, help="Seconds a batch waits to fill.")
+    parser.add_argument("--dispatchers", type=int, default=4, help="Batches in flight at once.")
+    parser.add_argument("--engine-latency", type=float, default=0.001, help="Seconds per engine call.")
+    parser.add_argument("--engine-capacity", type=int, default=4, help="Concurrent calls per engine.")
+    args = parser.parse_args()
+
+    print(f"{args.clients} clients x {args.requests} interactions; engine calls take "
+          f"{args.engine_latency * 1e3:g} ms, {args.engine_capacity} at a time", flush=True)
+    print(f"{'mode':<12}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'mean batch':>12}", flush=True)
+    charter = Charter()
+    engines = [UniversalNeuralEngine({}, DRSEngine({}), charter), SentiaGuardEngine({}, charter),
+               ConscientiaEngine({}, charter)]
+    halic = HALICEngine({}, *(SharedEngine(engine, args.engine_latency, threading.Semaphore(args.engine_capacity))
+                              for engine in engines))
+
+    modes = [("direct", None)] + [(f"batch {size}", size) for size in args.batch_sizes]
+    for name, batch_size in modes:
+        scheduler = None
+        handle = halic.process_interaction
+        if batch_size is not None:
+            scheduler = MicroBatchScheduler(halic, max_batch_size=batch_size, max_wait=args.max_wait,
+                                            dispatchers=args.dispatchers)
+            handle = scheduler.process_interaction
+        try:
+            rate, latencies = load(handle, args.clients, args.requests)
+        finally:
+            if scheduler is not None:
+                scheduler.close()
+        quantiles = statistics.quantiles(latencies, n=100)
+        mean_batch = f"{scheduler.stats()['mean_batch']:.1f}" if scheduler is not None else "-"
+        print(f"{name:<12}{rate:>10,.0f}{quantiles[49] * 1e3:>10.2f}{quantiles[98] * 1e3:>10.2f}"
+              f"{mean_batch:>12}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Microbenchmark of HALIC response formatting and sealing.
+
+Compares `HALICEngine._format_response` with the formatter it replaced, which
+hashed freshly concatenated strings three times per response. Reports CPU time
+per response and the peak memory one response allocates, measured with
+tracemalloc.
+
+Usage:
+    python -m benchmarks.bench_halic_format --responses 200000 --prompt-length 200
+"""
+
+import argparse
+import hashlib
+import random
+import string
+import time
+import tracemalloc
+
+from interface_layer.halic.halic_core import HALICEngine
+
+
+def legacy_format_response(intent: str, core_output: dict) -> tuple:
+    """The formatter before incremental hashing and Codex ID memoization."""
+    response_body = f"This is a helpful response based on the concepts: {core_output.get('key_concepts')}."
+    timestamp = str(time.time())
+    trace_id = hashlib.sha256(f"{intent}{timestamp}".encode()).hexdigest()[:32]
+    codex_id = hashlib.sha256(f"{core_output.get('logical_path')}".encode()).hexdigest()[:32]
+    golden_dag_input = f"{intent}{trace_id}{response_body}".encode()
+    golden_dag = hashlib.sha256(golden_dag_input).hexdigest()
+    formatted_response = (
+        f"{response_body}\n\n"
+        f"***\n\n"
+        f"**GoldenDAG:** `{golden_dag}`\n"
+        f"**Trace ID:** `T-v14.0-RUNTIME-{trace_id}`\n"
+        f"**Codex ID:** `C-RUNTIME-RESPONSE-{codex_id}`"
+    )
+    return formatted_response, (golden_dag, trace_id, codex_id, float(timestamp))
+
+
+def measure(format_response, work: list, samples: int) -> tuple:
+    """Returns (microseconds per response, mean peak bytes allocated per response)."""
+    started = time.perf_counter()
+    for intent, core_output in work:
+        format_response(intent, core_output)
+    cpu = (time.perf_counter() - started) / len(work) * 1e6
+
+    peaks = 0
+    tracemalloc.start()
+    for intent, core_output in work[:samples]:
+        baseline = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        result = format_response(intent, core_output)
+        peaks += tracemalloc.get_traced_memory()[1] - baseline
+        del result
+    tracemalloc.stop()
+    return cpu, peaks / samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--responses", type=int, default=200_000)
+    parser.add_argument("--prompt-length", type=int, default=200)
+    parser.add_argument("--samples", type=int, default=10_000, help="Responses traced for allocation.")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    logical_path = "Start -> Query DRS for concepts -> Synthesize -> Verify with Charter -> Format Response"
+    work = []
+    for _ in range(args.responses):
+        intent = "".join(rng.choice(string.ascii_letters + " ") for _ in range(args.prompt_length))
+        work.append((intent, {"key_concepts": intent.split()[:8], "logical_path": logical_path}))
+    halic = HALICEngine({}, une_engine=None, sentiaguard_engine=None)
+
+    print(f"{args.responses:,} responses, prompts of {args.prompt_length} chars", flush=True)
+    print(f"{'formatter':<12}{'us/response':>13}{'peak bytes':>12}", flush=True)
+    for name, format_response in (("legacy", legacy_format_response), ("current", halic._format_response)):
+        cpu, peak = measure(format_response, work, min(args.samples, args.responses))
+        print(f"{name:<12}{cpu:>13.2f}{peak:>12,.0f}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
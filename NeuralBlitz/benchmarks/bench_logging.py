@@ -0,0 +1,89 @@
+"""
+Logging-overhead benchmark for the engine hot paths.
+
+Runs interactions through the full pipeline (UNE, Conscientia, SentiaGuard,
+with DRS queries alongside) from several threads, once per logging setup:
+
+- every per-call event written synchronously, as the engines' old print()
+  calls did;
+- every event through the non-blocking queue handler;
+- per-call events sampled at --sample-rate;
+- only INFO and above, the per-call events filtered out;
+- logging left unconfigured.
+
+Records go to --output, a temporary file by default; pass /dev/stderr to see
+the cost of a terminal. Reports throughput and the records dropped by a full
+queue.
+
+Usage:
+    python -m benchmarks.bench_logging --interactions 20000 --threads 4
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from core_engine.drs_engine.drs_manager import DRSEngine
+from core_engine.structured_logging import configure_logging, stop_logging
+from core_engine.une.une_core import UniversalNeuralEngine
+from interface_layer.halic.halic_core import HALICEngine
+from subsystems.conscientia.conscientia_core import ConscientiaEngine
+from subsystems.sentiaguard.sentiaguard_core import SentiaGuardEngine
+
+ENGINES = ("drs", "une", "conscientia", "sentiaguard", "halic")
+
+
+class Charter:
+    """A Charter Layer stand-in that finds every plan compliant."""
+    def is_compliant(self, action: str) -> bool:
+        return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--interactions", type=int, default=20_000)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--sample-rate", type=float, default=0.01)
+    parser.add_argument("--output", help="Where records are written (default: a temporary file).")
+    args = parser.parse_args()
+
+    charter = Charter()
+    drs = DRSEngine({})
+    for index in range(1000):
+        drs.store(f"concept_{index}", {"index": index}, [{"target": f"concept_{(index + 1) % 1000}"}])
+    halic = HALICEngine({}, UniversalNeuralEngine({}, drs, charter), SentiaGuardEngine({}, charter),
+                        ConscientiaEngine({}, charter))
+
+    def interact(index):
+        drs.query(f"concept_{index % 1000}")
+        halic.process_interaction(f"Explain how concept_{index % 1000} relates to its neighbours")
+
+    setups = [
+        ("sync, all", {"level": "DEBUG", "queue_size": 0}),
+        ("queued, all", {"level": "DEBUG"}),
+        ("queued, sampled", {"level": "DEBUG", "sample_rates": dict.fromkeys(ENGINES, args.sample_rate)}),
+        ("INFO only", {"level": "INFO"}),
+        ("unconfigured", None),
+    ]
+    print(f"{args.interactions:,} interactions from {args.threads} threads", flush=True)
+    print(f"{'logging':<18}{'req/s':>10}{'speed-up':>10}{'dropped':>10}", flush=True)
+    with tempfile.TemporaryDirectory() as directory:
+        path = args.output or os.path.join(directory, "neuralblitz.log")
+        baseline = None
+        for name, setup in setups:
+            with open(path, "a", encoding="utf-8") as output:
+                handler = configure_logging(stream=output, **setup) if setup is not None else None
+                started = time.perf_counter()
+                with ThreadPoolExecutor(max_workers=args.threads) as pool:
+                    list(pool.map(interact, range(args.interactions), chunksize=64))
+                stop_logging()  # Writes out the queue, which is part of the cost.
+                rate = args.interactions / (time.perf_counter() - started)
+            baseline = baseline or rate
+            dropped = getattr(handler, "dropped", 0)
+            print(f"{name:<18}{rate:>10,.0f}{rate / baseline:>10.2f}{dropped:>10,}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
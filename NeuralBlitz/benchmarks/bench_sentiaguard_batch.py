@@ -0,0 +1,65 @@
+"""
+Core-scaling benchmark for SentiaGuard batch scanning.
+
+Generates historical responses and a ruleset of the requested size, then times
+`SentiaGuardEngine.scan_many` with a growing number of worker processes and
+reports throughput and speed-up over one process. Speed-up can only approach
+the worker count on a machine with at least that many idle cores.
+
+Usage:
+    python -m benchmarks.bench_sentiaguard_batch --texts 20000 --rules 10000 --workers 1 2 4 8
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+from subsystems.sentiaguard.sentiaguard_core import SentiaGuardEngine
+
+WORDS = [f"w{index}x" for index in range(5000)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--texts", type=int, default=20_000)
+    parser.add_argument("--text-length", type=int, default=2000)
+    parser.add_argument("--rules", type=int, default=10_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    rules = {
+        "FORBIDDEN_PHRASES": [" ".join(rng.choice(WORDS) for _ in range(4)) for _ in range(args.rules // 2)],
+        "SENSITIVE_PATTERNS": {" ".join(rng.choice(WORDS) for _ in range(2)): "[REDACTED]"
+                               for _ in range(args.rules - args.rules // 2)},
+    }
+    texts = []
+    for _ in range(args.texts):
+        text = ""
+        while len(text) < args.text_length:
+            text += rng.choice(WORDS) + " "
+        texts.append(text)
+    print(f"{os.cpu_count()} CPUs; {args.texts:,} texts of {args.text_length} chars, {args.rules:,} rules",
+          flush=True)
+    print(f"{'workers':>8}{'texts/s':>12}{'speed-up':>10}", flush=True)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "rules.json")
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(rules, handle)
+        engine = SentiaGuardEngine({"rules_path": path}, charter_layer=None)
+        baseline = None
+        for workers in args.workers:
+            started = time.perf_counter()
+            for _verdict in engine.scan_many(texts, workers=workers):
+                pass
+            rate = args.texts / (time.perf_counter() - started)
+            baseline = baseline or rate
+            print(f"{workers:>8}{rate:>12,.0f}{rate / baseline:>10.2f}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
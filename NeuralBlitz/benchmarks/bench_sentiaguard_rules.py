@@ -0,0 +1,73 @@
+"""
+Rule-count scaling benchmark for SentiaGuard scanning.
+
+Generates random forbidden phrases and sensitive patterns (none of which block
+the sample response, so every rule has to be checked), then times the original
+per-rule loop (`in` per phrase, `str.replace` per pattern) against one pass of
+the compiled Aho-Corasick ruleset, for rule counts from 10 to 100,000.
+
+Usage:
+    python -m benchmarks.bench_sentiaguard_rules --text-kb 16 --rules 10 100 1000 10000 100000
+"""
+
+import argparse
+import random
+import time
+
+from subsystems.sentiaguard.matcher import CompiledRuleset
+
+WORDS = [f"w{index}x" for index in range(5000)]
+
+
+def random_phrase(rng: random.Random) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(3))
+
+
+def per_rule_scan(text: str, forbidden: list, sensitive: dict) -> str | None:
+    """The scan as written before the ruleset was compiled."""
+    for phrase in forbidden:
+        if phrase in text:
+            return None
+    for pattern, replacement in sensitive.items():
+        if pattern in text:
+            text = text.replace(pattern, replacement)
+    return text
+
+
+def timed(function, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - started) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--text-kb", type=int, default=16)
+    parser.add_argument("--rules", type=int, nargs="+", default=[10, 100, 1000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    text = ""
+    while len(text) < args.text_kb * 1024:
+        text += random_phrase(rng) + ". "
+    sensitive_hits = [text[offset:offset + 12] for offset in range(0, len(text), len(text) // 8)]
+
+    print(f"{'rules':>8}{'compile s':>11}{'states':>10}{'per-rule ms':>13}{'compiled ms':>13}", flush=True)
+    for count in args.rules:
+        forbidden = [f"never {random_phrase(rng)}" for _ in range(count // 2)]
+        sensitive = {f"secret {random_phrase(rng)}": "[REDACTED]" for _ in range(count - count // 2 - 8)}
+        sensitive.update((hit, "[REDACTED]") for hit in sensitive_hits)
+
+        started = time.perf_counter()
+        ruleset = CompiledRuleset(forbidden, sensitive)
+        compile_seconds = time.perf_counter() - started
+        per_rule = timed(lambda: per_rule_scan(text, forbidden, sensitive), args.repeat)
+        compiled = timed(lambda: ruleset.scan(text), args.repeat)
+        print(f"{count:>8}{compile_seconds:>11.2f}{ruleset.state_count:>10,}"
+              f"{per_rule * 1000:>13.2f}{compiled * 1000:>13.2f}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
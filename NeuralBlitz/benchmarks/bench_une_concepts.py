@@ -0,0 +1,70 @@
+"""
+Benchmark of UNE concept extraction as the DRS vocabulary grows.
+
+Builds a ConceptIndex over vocabularies of increasing size, with names of one
+to three words, and times `extract` on the same prompts at every size. One
+word in ten of a prompt starts a concept name. The extraction time should stay
+flat as the vocabulary grows, and grow linearly with prompt length.
+
+Usage:
+    python -m benchmarks.bench_une_concepts --vocabularies 1000,100000,1000000 --prompt-words 50,200
+"""
+
+import argparse
+import random
+import string
+import time
+
+from core_engine.une.concept_extractor import ConceptIndex
+
+
+def random_word(rng: random.Random) -> str:
+    return "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--vocabularies", default="1000,10000,100000,1000000",
+                        help="Comma-separated vocabulary sizes.")
+    parser.add_argument("--prompt-words", default="25,100,400", help="Comma-separated prompt lengths, in words.")
+    parser.add_argument("--prompts", type=int, default=500, help="Prompts timed per size.")
+    args = parser.parse_args()
+    vocabularies = [int(size) for size in args.vocabularies.split(",")]
+    lengths = [int(length) for length in args.prompt_words.split(",")]
+
+    rng = random.Random(0)
+    vocabulary_words = [random_word(rng) for _ in range(50_000)]
+    names = ["_".join(rng.choice(vocabulary_words) for _ in range(rng.randint(1, 3)))
+             for _ in range(max(vocabularies))]
+    # Prompts are filler words outside the vocabulary plus a fixed number of
+    # concepts every vocabulary holds, so each size does the same matching work.
+    filler = [word + "q" for word in vocabulary_words]
+    planted = names[:min(vocabularies)]
+    prompts = {}
+    for length in lengths:
+        prompts[length] = []
+        for _ in range(args.prompts):
+            prompt = [rng.choice(filler) for _ in range(length)]
+            for slot in rng.sample(range(length), max(1, length // 10)):
+                prompt[slot] = rng.choice(planted).replace("_", " ")
+            prompts[length].append(" ".join(prompt))
+
+    header = "".join(f"{f'us @ {length} words':>18}" for length in lengths)
+    print(f"{'concepts':>10}{'build s':>10}{'matches/prompt':>16}{header}", flush=True)
+    for size in vocabularies:
+        started = time.perf_counter()
+        index = ConceptIndex(names[:size])
+        build = time.perf_counter() - started
+        timings, matched = [], 0
+        for length in lengths:
+            started = time.perf_counter()
+            for prompt in prompts[length]:
+                matched += len(index.extract(prompt))
+            timings.append((time.perf_counter() - started) / args.prompts * 1e6)
+        per_prompt = matched / (args.prompts * len(lengths))
+        row = "".join(f"{timing:>18.1f}" for timing in timings)
+        print(f"{size:>10,}{build:>10.2f}{per_prompt:>16.1f}{row}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
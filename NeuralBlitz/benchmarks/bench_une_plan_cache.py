@@ -0,0 +1,94 @@
+"""
+Benchmark of the UNE focus-plan cache on a repetitive intent stream.
+
+Draws intents from a pool of templates with Zipf-distributed popularity, the
+way many users ask the same few things. A fraction of intents (--variants) are
+rephrased: cased or punctuated differently, which the exact tier normalises
+away, or with one filler word added, which only the near-duplicate tier
+catches. Runs the stream through `direct_focus` without a cache, with the
+exact tier only, and with both tiers, and reports throughput, hit ratios and
+Charter checks.
+
+The Charter check is given a round trip (--charter-latency), standing in for
+the cost of a real compliance evaluation.
+
+Usage:
+    python -m benchmarks.bench_une_plan_cache --intents 50000 --templates 2000 --concepts 100000
+"""
+
+import argparse
+import random
+import string
+import time
+
+from core_engine.drs_engine.drs_manager import DRSEngine
+from core_engine.une.une_core import UniversalNeuralEngine
+
+FILLERS = ["please", "briefly", "today", "again", "now", "exactly"]
+
+
+class Charter:
+    """A Charter Layer stand-in that finds every plan compliant after a delay."""
+    def __init__(self, latency: float):
+        self.version = 1
+        self.checks = 0
+        self._latency = latency
+
+    def is_compliant(self, action: str) -> bool:
+        self.checks += 1
+        if self._latency:
+            time.sleep(self._latency)
+        return True
+
+
+def random_word(rng: random.Random) -> str:
+    return "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9)))
+
+
+def vary(intent: str, rng: random.Random) -> str:
+    """Rephrases an intent slightly."""
+    if rng.random() < 0.5:
+        return f"  {intent.upper()}?!"
+    words = intent.split()
+    words.insert(rng.randrange(len(words) + 1), rng.choice(FILLERS))
+    return " ".join(words)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--intents", type=int, default=50_000)
+    parser.add_argument("--templates", type=int, default=2_000)
+    parser.add_argument("--concepts", type=int, default=100_000)
+    parser.add_argument("--variants", type=float, default=0.3, help="Fraction of intents rephrased.")
+    parser.add_argument("--charter-latency", type=float, default=0.0001, help="Seconds per Charter check.")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    words = [random_word(rng) for _ in range(20_000)]
+    drs = DRSEngine({})
+    drs.store_many((" ".join(rng.choice(words) for _ in range(rng.randint(1, 2))), {}, [])
+                   for _ in range(args.concepts))
+    templates = [" ".join(rng.choice(words) for _ in range(rng.randint(6, 14))) for _ in range(args.templates)]
+    weights = [1 / rank for rank in range(1, args.templates + 1)]
+    stream = [rng.choices(templates, weights)[0] for _ in range(args.intents)]
+    stream = [vary(intent, rng) if rng.random() < args.variants else intent for intent in stream]
+
+    print(f"{args.intents:,} intents from {args.templates:,} templates, {args.variants:.0%} rephrased, "
+          f"{args.concepts:,} DRS concepts", flush=True)
+    print(f"{'cache':<12}{'intents/s':>12}{'exact hits':>12}{'near hits':>11}{'checks':>9}", flush=True)
+    for name, setting in (("none", None), ("exact", {"max_distance": 0}), ("exact+near", {"max_distance": 3})):
+        charter = Charter(args.charter_latency)
+        une = UniversalNeuralEngine({"plan_cache": setting} if setting else {}, drs, charter)
+        une.direct_focus("warm up the concept index", {})
+        charter.checks = 0
+        started = time.perf_counter()
+        for intent in stream:
+            une.direct_focus(intent, {})
+        rate = len(stream) / (time.perf_counter() - started)
+        stats = une.cache_stats() or {"hits": 0, "near_hits": 0}
+        print(f"{name:<12}{rate:>12,.0f}{stats['hits']:>12,}{stats['near_hits']:>11,}{charter.checks:>9,}",
+              flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark of UNE relevance pruning and the downstream work it saves.
+
+Builds a DRS of concepts with short text summaries and weighted connections,
+then plans intents that each name a few concepts, with every pruning budget
+requested. For each budget it reports the context a plan keeps, the time the
+UNE spends planning, and the time SentiaGuard spends scanning that context and
+Conscientia reviewing it (one action per kept concept). Both safety stages
+scale with the context handed to them, so they shrink as the budget tightens.
+
+Usage:
+    python -m benchmarks.bench_une_pruning --concepts 20000 --degree 8 --budgets 0 256 64 16 4
+"""
+
+import argparse
+import random
+import string
+import time
+
+from core_engine.drs_engine.drs_manager import DRSEngine
+from core_engine.drs_engine.vector_index import concept_text
+from core_engine.une.une_core import UniversalNeuralEngine
+from subsystems.conscientia.conscientia_core import ConscientiaEngine
+from subsystems.sentiaguard.sentiaguard_core import SentiaGuardEngine
+
+
+class Charter:
+    """A Charter Layer stand-in that finds every plan compliant."""
+    def is_compliant(self, action: str) -> bool:
+        return True
+
+
+def random_word(rng: random.Random) -> str:
+    return "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--concepts", type=int, default=20_000)
+    parser.add_argument("--degree", type=int, default=8, help="Connections per concept.")
+    parser.add_argument("--hops", type=int, default=2, help="Hops searched around the key concepts.")
+    parser.add_argument("--intents", type=int, default=200)
+    parser.add_argument("--budgets", type=int, nargs="+", default=[0, 256, 64, 16, 4],
+                        help="Concepts kept per plan; 0 keeps the whole region.")
+    parser.add_argument("--budget-unit", default="nodes", choices=("nodes", "tokens"))
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    words = [random_word(rng) for _ in range(5_000)]
+    names = list(dict.fromkeys(f"{rng.choice(words)}_{rng.choice(words)}" for _ in range(args.concepts)))
+    drs = DRSEngine({})
+    drs.store_many((name, {"summary": " ".join(rng.choice(words) for _ in range(rng.randint(5, 25)))},
+                    [{"target": rng.choice(names), "relation": "related_to", "weight": round(rng.uniform(0.1, 5), 2)}
+                     for _ in range(args.degree)])
+                   for name in names)
+    intents = [f"How does {rng.choice(names).replace('_', ' ')} relate to {rng.choice(names).replace('_', ' ')} "
+               f"and {rng.choice(words)}?" for _ in range(args.intents)]
+    sentiaguard, conscientia = SentiaGuardEngine({}, Charter()), ConscientiaEngine({}, Charter())
+
+    print(f"{len(names):,} concepts x {args.degree} connections, {args.hops} hops, {args.intents} intents; "
+          f"budget in {args.budget_unit}", flush=True)
+    print(f"{'budget':>8}{'kept':>8}{'pruned':>8}{'tokens':>8}{'UNE ms':>9}{'SentiaGuard ms':>16}"
+          f"{'Conscientia ms':>16}", flush=True)
+    for budget in args.budgets:
+        une = UniversalNeuralEngine({"pruning": {"hops": args.hops, "candidates": None, "budget": budget or None,
+                                                 "budget_unit": args.budget_unit}}, drs, Charter())
+        une.direct_focus(intents[0], {})  # Builds the concept index.
+        kept = pruned = tokens = 0
+        planning = scanning = reviewing = 0.0
+        for intent in intents:
+            started = time.perf_counter()
+            focus_plan = une.direct_focus(intent, {})
+            planning += time.perf_counter() - started
+            texts = []
+            for item in focus_plan["relevant_context"]:
+                record = drs.query(item["concept"])
+                texts.append(concept_text(item["concept"], record["data"] if record else None))
+            kept += len(texts)
+            pruned += len(focus_plan["pruned_info"])
+            tokens += sum(item["tokens"] for item in focus_plan["relevant_context"])
+
+            started = time.perf_counter()
+            sentiaguard.scan_output("\n".join(texts))
+            scanning += time.perf_counter() - started
+            started = time.perf_counter()
+            conscientia.evaluate_many([{"type": "context", "content": text} for text in texts])
+            reviewing += time.perf_counter() - started
+        count = len(intents)
+        print(f"{budget or 'all':>8}{kept / count:>8.1f}{pruned / count:>8.1f}{tokens / count:>8.0f}"
+              f"{planning / count * 1e3:>9.2f}{scanning / count * 1e3:>16.3f}{reviewing / count * 1e3:>16.3f}",
+              flush=True)
+
+
+if __name__ == "__main__":
+    main()
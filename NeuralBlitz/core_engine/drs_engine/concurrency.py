@@ -0,0 +1,88 @@
+"""
+Concurrency control for the Dynamic Representational Substrate (DRS).
+
+The DRS is read far more often than it is written: every interaction queries it,
+while ingestion happens in comparatively rare batches. A readers-writer lock lets
+any number of queries and path searches run at the same time, each seeing a
+consistent graph, while writers get exclusive access for the (short) time it
+takes to apply a mutation or one ingestion batch.
+"""
+
+import contextlib
+import threading
+
+
+class ReadWriteLock:
+    """
+    A writer-preferring readers-writer lock.
+
+    Once a writer is waiting, new readers queue behind it, so a steady stream
+    of queries cannot starve ingestion. The lock is not reentrant: a thread
+    holding it must not try to acquire it again.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._readers = 0
+        self._writing = False
+        self._waiting_writers = 0
+
+    @contextlib.contextmanager
+    def read(self):
+        """Holds the lock in shared mode for the duration of the `with` block."""
+        with self._condition:
+            while self._writing or self._waiting_writers:
+                self._condition.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+
+    @contextlib.contextmanager
+    def write(self):
+        """Holds the lock exclusively for the duration of the `with` block."""
+        with self._condition:
+            self._waiting_writers += 1
+            while self._writing or self._readers:
+                self._condition.wait()
+            self._waiting_writers -= 1
+            self._writing = True
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writing = False
+                self._condition.notify_all()
+
+
+class NullLock:
+    """A stand-in for ReadWriteLock when the engine is used from a single thread."""
+
+    def read(self):
+        return contextlib.nullcontext()
+
+    def write(self):
+        return contextlib.nullcontext()
+
+
+def create_lock(config: dict):
+    """
+    Returns the lock named by the "concurrency" config setting.
+
+    Args:
+        config (dict): The DRS configuration. "concurrency" may be "none" (the
+                       default, for single-threaded use) or "rwlock".
+
+    Raises:
+        ValueError: If the mode is unknown.
+    """
+    mode = config.get("concurrency", "none")
+    if mode == "rwlock":
+        return ReadWriteLock()
+    if mode == "none":
+        return NullLock()
+    raise ValueError(f"Unknown DRS concurrency mode '{mode}'. Expected 'none' or 'rwlock'.")
@@ -7,6 +7,23 @@ the context and raw material upon which the Universal Neural Engine (UNE)
 directs its focus.
 """
 
+import os
+
+from core_engine.drs_engine.concurrency import create_lock
+from core_engine.drs_engine.graph_index import DEFAULT_WEIGHT, normalize_connections
+from core_engine.drs_engine.ingest import ingest
+from core_engine.drs_engine.path_cache import DependencyCache
+from core_engine.drs_engine.pathfinding import (find_path, focus_regions, neighbourhoods, region_path,
+                                                shortest_paths_many)
+from core_engine.drs_engine.snapshot import open_snapshot, write_snapshot
+from core_engine.drs_engine.storage import create_backend
+from core_engine.drs_engine.vector_index import HashingEmbedder, VectorIndex, concept_text
+from core_engine.drs_engine.wal import WriteAheadLog, read_wal
+from core_engine.structured_logging import get_logger
+
+logger = get_logger("drs")
+
+
 class DRSEngine:
     """
     Manages the storage, retrieval, and connection of knowledge concepts.
@@ -18,14 +35,82 @@ class DRSEngine:
 
         In a production environment, this would connect to a persistent
         storage backend (e.g., a graph database or a vector store). For this
-        initial scaffold, we use a simple in-memory dictionary.
+        initial scaffold, we use an in-memory storage backend: either plain
+        dictionaries or a compact, array-backed layout for large graphs (see
+        `core_engine.drs_engine.storage`). Both keep forward and reverse edges,
+        so `find_connections` can search the graph from both ends. A saved
+        snapshot can be mapped in place of an empty backend (see `load_snapshot`).
+
+        Durability is opt-in: with a "wal_path", every mutation is written ahead
+        to a group-committed log (see `core_engine.drs_engine.wal`), and with a
+        "checkpoint_path" the log is periodically compacted into a snapshot. On
+        startup the checkpoint is loaded and the log replayed on top of it.
+
+        For use from several threads, set "concurrency" to "rwlock": queries and
+        path searches then run concurrently under a shared lock, each seeing a
+        consistent graph, while mutations (and each bulk-ingestion batch) take
+        the lock exclusively.
+
+        With "vector_index" enabled, every concept also gets an embedding (taken
+        from its data's "embedding" field, or computed from its name and text) so
+        `query_similar` can find concepts by meaning rather than exact key. This
+        requires NumPy.
+
+        With "cache" enabled, `query` and `find_connections` answers are memoized
+        with LRU and TTL eviction. Each answer is dropped as soon as a mutation
+        touches a concept it depends on, so cached answers are never stale.
 
         Args:
-            config (dict): Configuration settings for the DRS.
+            config (dict): Configuration settings for the DRS. Recognised keys:
+                           "backend" ("in-memory" or "compact", default "in-memory"),
+                           "snapshot" (a snapshot file to start from),
+                           "path_strategy" ("bfs", "dijkstra" or "astar", default "bfs"),
+                           "max_path_depth" (default unlimited),
+                           "wal_path", "checkpoint_path", "checkpoint_every"
+                           (logged mutations between checkpoints, default 100000),
+                           "wal_group_commit_size" (default 64),
+                           "wal_group_commit_interval" (seconds, default 0.05)
+                           "wal_sync" (fsync on commit, default True)
+                           "concurrency" ("none" or "rwlock", default "none")
+                           and "vector_index" (True, or a dict of "dim", "ivf_threshold",
+                           "nlist" and "nprobe" options; default disabled)
+                           and "cache" (True, or a dict of "maxsize" and "ttl" in
+                           seconds; default disabled).
         """
         self.config = config
-        self._storage = {}  # In-memory dictionary as a simple storage backend.
-        print("Dynamic Representational Substrate (DRS) Initialized.")
+        self._lock = create_lock(config)
+        self._version = 0
+        self._added = []  # Concepts first stored since the storage was last replaced.
+        self._storage_epoch = 0  # Counts storage replacements; see `added_concepts`.
+        self._cache = None
+        if config.get("cache"):
+            options = config["cache"] if isinstance(config["cache"], dict) else {}
+            self._cache = DependencyCache(maxsize=options.get("maxsize", 10000), ttl=options.get("ttl"))
+        self._vectors = None
+        self._vectors_stale = False
+        if config.get("vector_index"):
+            options = config["vector_index"] if isinstance(config["vector_index"], dict) else {}
+            self._embedder = HashingEmbedder(options.get("dim", 256))
+            self._vectors = self._new_vector_index()
+        self._storage = create_backend(config)  # Behaves as a read-only dict of records.
+        self._wal = None
+        checkpoint = config.get("checkpoint_path")
+        if checkpoint and os.path.exists(checkpoint):
+            self.load_snapshot(checkpoint)
+        elif config.get("snapshot"):
+            self.load_snapshot(config["snapshot"])
+        if config.get("wal_path"):
+            self._replay(config["wal_path"])
+        # Concepts restored from disk are embedded on the first similarity query.
+        self._vectors_stale = self._vectors is not None and len(self._storage) > 0
+        if config.get("wal_path"):
+            self._wal = WriteAheadLog(
+                config["wal_path"],
+                group_commit_size=config.get("wal_group_commit_size", 64),
+                group_commit_interval=config.get("wal_group_commit_interval", 0.05),
+                sync=config.get("wal_sync", True),
+            )
+        logger.info("initialized", storage=type(self._storage).__name__)
 
     def store(self, concept: str, data: dict, connections: list = None):
         """
@@ -35,13 +120,157 @@ class DRSEngine:
             concept (str): The unique identifier for the concept (e.g., "AI_Ethics").
             data (dict): The information associated with the concept.
             connections (list, optional): A list of related concepts and the
-                                          nature of their connection.
+                                          nature of their connection, e.g.
+                                          {"target": "DRS", "relation": "depends_on"}.
+                                          An optional "weight" (default 1.0) sets the
+                                          cost of traversing the connection.
+
+        Raises:
+            ValueError: If a connection has no target or a negative weight, or
+                        the data's "embedding" does not match the vector index's
+                        dimension. Nothing is logged or stored.
+        """
+        logger.debug("store", concept=concept)
+        edges = normalize_connections(connections)
+        self._check_embedding(concept, data)
+        with self._lock.write():
+            self._log("store", concept=concept, data=data, connections=connections or [])
+            self._invalidate(concept, [target for target, _relation, _weight in edges])
+            if concept not in self._storage:
+                self._added.append(concept)
+            # Storing a concept again replaces its connections, old edges included.
+            self._storage.put(concept, data, connections, edges)
+            self._version += 1
+            self._index_vector(concept, data)
+            self._maybe_checkpoint()
+
+    def connect(self, source: str, target: str, relation: str, weight: float = DEFAULT_WEIGHT):
+        """
+        Adds a connection to an already stored concept, keeping its data.
+
+        Connecting the same pair with the same relation again only updates the
+        weight, so the operation is safe to repeat.
+
+        Args:
+            source (str): The stored concept the connection leaves from.
+            target (str): The concept it points to.
+            relation (str): The nature of the connection.
+            weight (float, optional): The traversal cost (default 1.0).
+
+        Raises:
+            KeyError: If `source` has not been stored.
+            ValueError: If the weight is negative.
+        """
+        logger.debug("connect", source=source, relation=relation, target=target)
+        normalize_connections([{"target": target, "weight": weight}])  # Validates the weight.
+        with self._lock.write():
+            if source not in self._storage:
+                raise KeyError(f"Cannot connect unknown concept '{source}'.")
+            self._log("connect", source=source, target=target, relation=relation, weight=weight)
+            self._invalidate(source, [target])
+            self._apply_connect(source, target, relation, weight)
+            self._version += 1
+            self._maybe_checkpoint()
+
+    def disconnect(self, source: str, target: str, relation: str = None) -> bool:
+        """
+        Removes the connections from `source` to `target`.
+
+        Args:
+            source (str): The stored concept the connections leave from.
+            target (str): The concept they point to.
+            relation (str, optional): Only remove connections with this relation.
+
+        Returns:
+            bool: True if any connection was removed.
+        """
+        logger.debug("disconnect", source=source, target=target)
+        with self._lock.write():
+            if source not in self._storage:
+                return False
+            self._log("disconnect", source=source, target=target, relation=relation)
+            self._invalidate(source, [target])
+            removed = self._apply_disconnect(source, target, relation)
+            if removed:
+                self._version += 1
+            self._maybe_checkpoint()
+        return removed
+
+    def store_many(self, records, batch_size: int = 10000) -> dict:
+        """
+        Stores a stream of concepts in batches, for loading large knowledge bases.
+
+        Records for the same concept within one call are merged and repeated
+        edges are dropped; see `core_engine.drs_engine.ingest.ingest`. Records can
+        be streamed from files with `ingest.read_jsonl` or `ingest.read_csv`.
+
+        Args:
+            records: An iterable of (concept, data, connections) tuples or of dicts
+                     with "concept", "data" and "connections" keys.
+            batch_size (int): How many concepts to index per batch.
+
+        Returns:
+            dict: Throughput statistics (records, concepts, edges, duplicate_edges,
+                  seconds, records_per_second, edges_per_second).
+        """
+        added = []  # The concepts of the batch being stored that are new to the DRS.
+
+        def journal(batch):
+            # The whole batch is encoded before any of it is logged, and nothing
+            # is counted as stored until the backend has stored it.
+            if self._wal is not None:
+                self._wal.append_many(("store", {"concept": concept, "data": data, "connections": connections})
+                                      for concept, data, connections, _edges in batch)
+            added[:] = [concept for concept, _data, _connections, _edges in batch if concept not in self._storage]
+            for concept, _data, _connections, edges in batch:
+                self._invalidate(concept, [target for target, _relation, _weight in edges])
+
+        def stored(batch):
+            self._added.extend(added)
+            self._version += len(batch)
+            for concept, data, _connections, _edges in batch:
+                self._index_vector(concept, data)
+
+        stats = ingest(self._storage, records, batch_size=batch_size, journal=journal, lock=self._lock.write,
+                       validate=self._check_embedding, stored=stored)
+        with self._lock.write():
+            self._maybe_checkpoint()
+        logger.info("store_many", concepts=stats["concepts"], edges=stats["edges"],
+                    duplicate_edges=stats["duplicate_edges"], records_per_second=round(stats["records_per_second"]))
+        return stats
+
+    @property
+    def version(self) -> int:
         """
-        print(f"DRS: Storing concept '{concept}'...")
-        self._storage[concept] = {
-            "data": data,
-            "connections": connections or []
-        }
+        A counter that changes with every mutation, so callers can tell when
+        something they derived from the DRS (an index of its concept names, a
+        cached plan) has gone stale.
+        """
+        return self._version
+
+    def concept_names(self) -> list:
+        """Returns the IDs of every stored concept."""
+        with self._lock.read():
+            return list(self._storage)
+
+    def added_concepts(self, cursor: tuple = None) -> tuple:
+        """
+        Returns the concepts first stored since `cursor`, so an index of the
+        concept names can be extended instead of rebuilt from `concept_names()`.
+
+        Args:
+            cursor (tuple, optional): The cursor returned by the previous call.
+
+        Returns:
+            tuple: (cursor, names). `names` is None if no cursor was given or the
+                   contents have been replaced since (`load_snapshot`); the
+                   caller then rereads `concept_names()`.
+        """
+        with self._lock.read():
+            current = (self._storage_epoch, len(self._added))
+            if cursor is None or cursor[0] != self._storage_epoch:
+                return current, None
+            return current, self._added[cursor[1]:]
 
     def query(self, concept: str) -> dict | None:
         """
@@ -53,36 +282,378 @@ class DRSEngine:
         Returns:
             A dictionary containing the concept's data, or None if not found.
         """
-        print(f"DRS: Querying for concept '{concept}'...")
-        return self._storage.get(concept)
+        logger.debug("query", concept=concept)
+        with self._lock.read():
+            if self._cache is None:
+                return self._storage.get(concept)
+            key = ("query", concept)
+            hit, record = self._cache.get(key)
+            if not hit:
+                record = self._storage.get(concept)
+                self._cache.put(key, record, (concept,))
+            return record
 
-    def find_connections(self, start_concept: str, end_concept: str) -> list:
+    def query_similar(self, text_or_vector, k: int = 5, exact: bool = False) -> list:
+        """
+        Finds the stored concepts most similar in meaning to a text or embedding.
+
+        Args:
+            text_or_vector: Free text (e.g. a phrase from a user's intent) or an
+                            embedding vector of the index's dimension.
+            k (int): How many concepts to return.
+            exact (bool): Score every concept even when an approximate index exists.
+
+        Returns:
+            list: Up to `k` (concept, similarity) pairs, most similar first.
+
+        Raises:
+            RuntimeError: If the vector index is not enabled.
+        """
+        return self.query_similar_many([text_or_vector], k=k, exact=exact)[0]
+
+    def query_similar_many(self, texts_or_vectors: list, k: int = 5, exact: bool = False) -> list:
+        """
+        Batched `query_similar`: embeds all queries and searches them in one pass.
+
+        Args:
+            texts_or_vectors (list): Texts and/or embedding vectors.
+            k (int): How many concepts to return per query.
+            exact (bool): Score every concept even when an approximate index exists.
+
+        Returns:
+            list: One list of (concept, similarity) pairs per query.
+        """
+        logger.debug("query_similar", queries=len(texts_or_vectors))
+        if self._vectors is None:
+            raise RuntimeError("The DRS vector index is not enabled (set config['vector_index']).")
+        if self._vectors_stale:
+            with self._lock.write():
+                if self._vectors_stale:
+                    self._vectors = self._new_vector_index()
+                    self._vectors_stale = False
+                    for concept in self._storage:
+                        self._index_vector(concept, self._storage[concept]["data"])
+        queries = [self._embedder.embed(item) if isinstance(item, str) else item for item in texts_or_vectors]
+        if not exact and self._vectors.needs_training():
+            # Training rebuilds the clusters that concurrent searches read.
+            with self._lock.write():
+                if self._vectors.needs_training():
+                    self._vectors.train()
+        with self._lock.read():
+            return self._vectors.search(queries, k=k, exact=exact, train=False) if queries else []
+
+    def find_connections(self, start_concept: str, end_concept: str, strategy: str = None,
+                         max_depth: int = None, max_cost: float = None, heuristic=None) -> list:
         """
         Finds and returns the logical path between two concepts.
 
         This is a key function that differentiates the DRS from a simple
         database. It traverses the relationship graph to find how two ideas
-        are connected.
+        are connected, using the adjacency index rather than scanning storage.
 
         Args:
             start_concept (str): The starting concept.
             end_concept (str): The target concept.
+            strategy (str, optional): "bfs" for the path with the fewest hops,
+                                      "dijkstra" for the cheapest path by weight, or
+                                      "astar" for a cheapest path guided by `heuristic`.
+                                      Defaults to the "path_strategy" config setting.
+            max_depth (int, optional): The maximum number of hops. Defaults to the
+                                       "max_path_depth" config setting.
+            max_cost (float, optional): The maximum total weight of the path.
+            heuristic (callable, optional): `heuristic(concept, end_concept) -> float`
+                                            for the "astar" strategy.
 
         Returns:
-            A list representing the path of connections, or an empty list
-            if no path is found.
-        """
-        print(f"DRS: Finding connection from '{start_concept}' to '{end_concept}'...")
-
-        # --- Placeholder for future graph traversal logic ---
-        # A real implementation would use an algorithm like A* or Dijkstra's
-        # to find the shortest or most meaningful path in the knowledge graph.
-        if start_concept in self._storage and end_concept in self._storage:
-            # Simulate finding a simple, direct connection.
-            for connection in self._storage[start_concept].get("connections", []):
-                if connection.get("target") == end_concept:
-                    return [start_concept, connection.get("relation"), end_concept]
-            return [start_concept, "--> (indirect path) -->", end_concept] # Placeholder for a multi-hop path
-        
-        return [] # No path found
-        # --- End of placeholder logic ---
+            A list alternating concepts and relations, e.g.
+            ["UNE", "depends_on", "DRS", "part_of", "NeuralBlitz"], or an empty
+            list if no path is found.
+        """
+        logger.debug("find_connections", start=start_concept, end=end_concept)
+
+        strategy = strategy or self.config.get("path_strategy", "bfs")
+        max_depth = max_depth if max_depth is not None else self.config.get("max_path_depth")
+        with self._lock.read():
+            if self._cache is not None:
+                key = ("path", start_concept, end_concept, strategy, max_depth, max_cost, heuristic)
+                hit, path = self._cache.get(key)
+                if hit:
+                    return list(path)
+
+            explored = {start_concept, end_concept}
+            path = []  # No path found
+            if start_concept in self._storage and end_concept in self._storage:
+                path = find_path(self._storage, start_concept, end_concept, strategy=strategy,
+                                 max_depth=max_depth, max_cost=max_cost, heuristic=heuristic,
+                                 explored=explored) or []
+
+            if self._cache is not None:
+                self._cache.put(key, tuple(path), explored.union(path[::2]))
+        return path
+
+    def neighbourhood(self, concepts: list, hops: int = 1, limit: int = None) -> dict:
+        """
+        Returns the concepts within `hops` connections of each given concept.
+
+        All concepts are expanded together in one breadth-first pass per hop, so
+        a concept reached from several of them is read only once per hop.
+
+        Args:
+            concepts (list): The concepts to expand, e.g. an intent's key concepts.
+            hops (int): The maximum number of connections to follow.
+            limit (int, optional): The maximum number of neighbours per concept;
+                                   the nearest are kept.
+
+        Returns:
+            dict: Maps each concept to a list of (neighbour, hops) pairs, nearest
+                  first. Unknown concepts map to an empty list.
+        """
+        logger.debug("neighbourhood", concepts=len(concepts), hops=hops)
+        concepts = list(dict.fromkeys(concepts))
+        with self._lock.read():
+            sources = [concept for concept in concepts if concept in self._storage]
+            found = neighbourhoods(self._storage, sources, hops=hops, limit=limit)
+        result = {concept: [] for concept in concepts}
+        result.update(zip(sources, found))
+        return result
+
+    def focus_region(self, concepts: list, hops: int = 2, limit: int = None) -> dict:
+        """
+        Returns the concepts within `hops` connections of any of the given ones,
+        with what a relevance scorer needs to rank them.
+
+        All concepts are expanded as one region in a single breadth-first pass;
+        see `core_engine.drs_engine.pathfinding.focus_region`.
+
+        Args:
+            concepts (list): The concepts to expand from, e.g. an intent's key concepts.
+            hops (int): The maximum number of connections to follow.
+            limit (int, optional): The maximum number of concepts returned; the
+                                   nearest are kept.
+
+        Returns:
+            dict: Maps each reached concept, the given ones included, to a dict
+                  of "hops", "cost" (the summed weight of its path), "path"
+                  (from the nearest given concept, in `find_connections` format)
+                  and "data" (None for a connection target never stored).
+                  Unknown given concepts are left out.
+        """
+        logger.debug("focus_region", concepts=len(concepts), hops=hops)
+        return self._focus_regions([concepts], hops, limit)[0]
+
+    def focus_regions(self, concept_groups: list, hops: int = 2, limit: int = None) -> list:
+        """
+        Batched `focus_region`: returns the region around each group of concepts.
+
+        The groups are expanded together, one breadth-first pass per hop under a
+        single read lock (see `pathfinding.focus_regions`), e.g. for the key
+        concepts of a batch of intents.
+
+        Args:
+            concept_groups (list): Lists of concepts, one per region.
+            hops, limit: As for `focus_region`, per region.
+
+        Returns:
+            list: One `focus_region` result per group, in order.
+        """
+        logger.debug("focus_regions", groups=len(concept_groups), hops=hops)
+        return self._focus_regions(concept_groups, hops, limit)
+
+    def _focus_regions(self, concept_groups: list, hops: int, limit: int) -> list:
+        """Searches the regions of `focus_regions` and attaches paths and data."""
+        with self._lock.read():
+            groups = [[concept for concept in dict.fromkeys(concepts) if concept in self._storage]
+                      for concepts in concept_groups]
+            regions = focus_regions(self._storage, groups, hops=hops, limit=limit)
+            records = {concept: self._storage.get(concept) for region in regions for concept in region}
+        return [{concept: {"hops": distance, "cost": cost, "path": region_path(reached, concept),
+                           "data": records[concept]["data"] if records[concept] is not None else None}
+                 for concept, (distance, cost, _parent, _relation) in reached.items()}
+                for reached in regions]
+
+    def connections_many(self, pairs: list, strategy: str = None, max_depth: int = None,
+                         max_cost: float = None, heuristic=None) -> list:
+        """
+        Batched `find_connections`: finds the path for every (start, end) pair.
+
+        For fewest-hop searches, pairs sharing a start share one search tree, and
+        the searches from all starts advance together (see
+        `pathfinding.shortest_paths_many`). Weighted strategies search each pair
+        in turn, under a single read lock.
+
+        Args:
+            pairs (list): (start_concept, end_concept) pairs.
+            strategy, max_depth, max_cost, heuristic: As for `find_connections`.
+
+        Returns:
+            list: One path per pair, in the format of `find_connections` (an
+                  empty list where no path is found). Among several fewest-hop
+                  paths, the one chosen may differ from `find_connections`.
+        """
+        logger.debug("connections_many", pairs=len(pairs))
+        strategy = strategy or self.config.get("path_strategy", "bfs")
+        max_depth = max_depth if max_depth is not None else self.config.get("max_path_depth")
+        with self._lock.read():
+            known = [(start, end) for start, end in pairs
+                     if start in self._storage and end in self._storage]
+            if strategy == "bfs" and max_cost is None:
+                paths = shortest_paths_many(self._storage, known, max_depth=max_depth)
+            else:
+                paths = [find_path(self._storage, start, end, strategy=strategy, max_depth=max_depth,
+                                   max_cost=max_cost, heuristic=heuristic) for start, end in known]
+        found = dict(zip(known, paths))
+        return [list(found.get(pair) or []) for pair in map(tuple, pairs)]
+
+    def save_snapshot(self, path: str):
+        """
+        Persists the whole substrate to a versioned snapshot file.
+
+        Args:
+            path (str): The destination file. It is replaced atomically.
+        """
+        logger.info("save_snapshot", path=path)
+        # Exclusive, because writing a compact backend first compacts it.
+        with self._lock.write():
+            write_snapshot(self._storage, path)
+
+    def load_snapshot(self, path: str):
+        """
+        Replaces the current contents with a memory-mapped snapshot.
+
+        The snapshot is opened read-only and shared with any other process mapping
+        the same file; concepts stored afterwards are kept in memory on top of it.
+
+        Args:
+            path (str): A file written by `save_snapshot`.
+        """
+        logger.info("load_snapshot", path=path)
+        storage = open_snapshot(path, compaction_ratio=self.config.get("compaction_ratio", 0.25))
+        with self._lock.write():
+            self._storage = storage
+            self._version += 1
+            self._added = []
+            self._storage_epoch += 1
+            self._vectors_stale = self._vectors is not None
+            if self._cache is not None:
+                self._cache.clear()
+
+    def cache_stats(self) -> dict | None:
+        """
+        Returns the lookup cache's counters (hits, misses, evictions, expirations,
+        invalidations, size and hit_ratio), or None if caching is disabled.
+        """
+        return self._cache.stats() if self._cache is not None else None
+
+    def checkpoint(self):
+        """
+        Compacts the write-ahead log into a checkpoint snapshot.
+
+        The snapshot is written (atomically) before the log is emptied, so a crash
+        at any point leaves either the old checkpoint plus the full log, or the
+        new checkpoint; replaying logged mutations over a checkpoint that already
+        contains them is harmless.
+
+        Raises:
+            ValueError: If no "checkpoint_path" is configured.
+        """
+        with self._lock.write():
+            self._checkpoint()
+
+    def close(self):
+        """
+        Commits any buffered log records and closes the write-ahead log.
+        """
+        with self._lock.write():
+            if self._wal is not None:
+                self._wal.close()
+                self._wal = None
+
+    def _checkpoint(self):
+        """Writes the checkpoint; the caller must hold the write lock."""
+        path = self.config.get("checkpoint_path")
+        if not path:
+            raise ValueError("No checkpoint_path is configured for this DRS.")
+        logger.info("checkpoint", path=path)
+        if self._wal is not None:
+            self._wal.commit()
+        write_snapshot(self._storage, path)
+        if self._wal is not None:
+            self._wal.reset()
+
+    def _log(self, op: str, **fields):
+        """Writes a mutation ahead to the log, before it is applied."""
+        if self._wal is not None:
+            self._wal.append(op, **fields)
+
+    def _maybe_checkpoint(self):
+        """Checkpoints once enough mutations have been logged; called after applying them."""
+        if (self._wal is not None and self.config.get("checkpoint_path")
+                and self._wal.records_since_reset >= self.config.get("checkpoint_every", 100000)):
+            self._checkpoint()
+
+    def _invalidate(self, concept: str, new_targets: list):
+        """
+        Drops cached answers affected by a change to `concept`'s record or edges:
+        those depending on the concept itself, or on any of its old or new
+        targets (whose incoming edges change). Call before applying the change.
+        """
+        if self._cache is None:
+            return
+        affected = {concept, *new_targets}
+        affected.update(target for target, _relation, _weight in self._storage.successors(concept))
+        self._cache.invalidate(affected)
+
+    def _new_vector_index(self) -> VectorIndex:
+        options = self.config["vector_index"] if isinstance(self.config["vector_index"], dict) else {}
+        return VectorIndex(self._embedder.dim, ivf_threshold=options.get("ivf_threshold", 50000),
+                           nlist=options.get("nlist"), nprobe=options.get("nprobe", 8))
+
+    def _check_embedding(self, concept: str, data):
+        """Rejects an explicit embedding of the wrong dimension before anything is logged."""
+        if self._vectors is not None and isinstance(data, dict) and data.get("embedding") is not None:
+            self._vectors.validate(concept, data["embedding"])
+
+    def _index_vector(self, concept: str, data):
+        """Adds a concept's embedding to the vector index, if one is enabled."""
+        if self._vectors is None or self._vectors_stale:
+            return
+        embedding = data.get("embedding") if isinstance(data, dict) else None
+        if embedding is None:
+            embedding = self._embedder.embed(concept_text(concept, data))
+        self._vectors.add(concept, embedding)
+
+    def _replay(self, path: str):
+        """Re-applies the mutations recorded in a write-ahead log, without logging them again."""
+        for record in read_wal(path):
+            op = record["op"]
+            if op == "store":
+                connections = record["connections"]
+                self._storage.put(record["concept"], record["data"], connections,
+                                  normalize_connections(connections))
+            elif op == "connect":
+                self._apply_connect(record["source"], record["target"], record["relation"], record["weight"])
+            elif op == "disconnect":
+                self._apply_disconnect(record["source"], record["target"], record["relation"])
+            else:
+                raise ValueError(f"Unknown operation '{op}' in write-ahead log '{path}'.")
+
+    def _apply_connect(self, source: str, target: str, relation: str, weight: float):
+        record = self._storage[source]
+        connections = [c for c in record["connections"]
+                       if not (c.get("target") == target and c.get("relation") == relation)]
+        connection = {"target": target, "relation": relation}
+        if weight != DEFAULT_WEIGHT:
+            connection["weight"] = weight
+        connections.append(connection)
+        self._storage.put(source, record["data"], connections, normalize_connections(connections))
+
+    def _apply_disconnect(self, source: str, target: str, relation: str = None) -> bool:
+        record = self._storage.get(source)
+        if record is None:
+            return False
+        connections = [c for c in record["connections"]
+                       if not (c.get("target") == target and (relation is None or c.get("relation") == relation))]
+        if len(connections) == len(record["connections"]):
+            return False
+        self._storage.put(source, record["data"], connections, normalize_connections(connections))
+        return True
@@ -0,0 +1,125 @@
+"""
+Adjacency index for the Dynamic Representational Substrate (DRS).
+
+The DRS stores each concept's connections as a list of small dictionaries.
+That is convenient for callers, but it cannot be traversed efficiently: walking
+backwards from a concept would mean scanning every stored concept. The
+AdjacencyIndex keeps a forward and a reverse view of the relationship graph,
+updated incrementally every time a concept is stored, so path searches only
+ever touch the neighbourhoods they actually explore.
+"""
+
+DEFAULT_WEIGHT = 1.0
+
+
+def normalize_connections(connections: list) -> list:
+    """
+    Converts a list of connection dictionaries into (target, relation, weight) edges.
+
+    Args:
+        connections (list): Connection dictionaries as accepted by DRSEngine.store,
+                            e.g. {"target": "DRS", "relation": "depends_on", "weight": 0.5}.
+                            The weight is optional and defaults to 1.0.
+
+    Returns:
+        list: A list of (target, relation, weight) tuples.
+
+    Raises:
+        ValueError: If a connection has no target or a negative weight.
+    """
+    edges = []
+    for connection in connections or []:
+        target = connection.get("target")
+        if target is None:
+            raise ValueError(f"Connection {connection!r} does not name a target.")
+        weight = float(connection.get("weight", DEFAULT_WEIGHT))
+        if weight < 0:
+            raise ValueError(f"Connection to '{target}' has a negative weight ({weight}).")
+        edges.append((target, connection.get("relation"), weight))
+    return edges
+
+
+def to_connections(edges) -> list:
+    """
+    Converts (target, relation, weight) edges back into connection dictionaries.
+
+    The "weight" key is only included when it differs from the default, so
+    unweighted connections round-trip unchanged.
+
+    Args:
+        edges: An iterable of (target, relation, weight) tuples.
+
+    Returns:
+        list: Connection dictionaries as accepted by DRSEngine.store.
+    """
+    connections = []
+    for target, relation, weight in edges:
+        connection = {"target": target, "relation": relation}
+        if weight != DEFAULT_WEIGHT:
+            connection["weight"] = weight
+        connections.append(connection)
+    return connections
+
+
+class AdjacencyIndex:
+    """
+    Forward and reverse adjacency maps for a directed, weighted, labelled graph.
+
+    Each map is a dictionary of dictionaries: `node -> {neighbour: (relation, weight)}`.
+    When several connections link the same pair of concepts, the cheapest one is kept,
+    since it is the only one a shortest-path search would ever use.
+    """
+
+    def __init__(self):
+        self._forward = {}
+        self._reverse = {}
+
+    def set_edges(self, source: str, edges: list):
+        """
+        Replaces all outgoing edges of `source`, keeping the reverse map in sync.
+
+        Args:
+            source (str): The concept whose connections are being (re)defined.
+            edges (list): A list of (target, relation, weight) tuples.
+        """
+        if source in self._forward:
+            self.remove_edges(source)
+        outgoing = {}
+        for target, relation, weight in edges:
+            current = outgoing.get(target)
+            if current is None or weight < current[1]:
+                outgoing[target] = (relation, weight)
+        self._forward[source] = outgoing
+        for target, edge in outgoing.items():
+            self._reverse.setdefault(target, {})[source] = edge
+
+    def remove_edges(self, source: str):
+        """
+        Removes every outgoing edge of `source` from both maps.
+
+        Args:
+            source (str): The concept whose connections should be dropped.
+        """
+        outgoing = self._forward.pop(source, None)
+        if not outgoing:
+            return
+        for target in outgoing:
+            incoming = self._reverse.get(target)
+            if incoming is not None:
+                incoming.pop(source, None)
+                if not incoming:
+                    del self._reverse[target]
+
+    def successors(self, node: str):
+        """Yields (target, relation, weight) for every edge leaving `node`."""
+        for target, (relation, weight) in self._forward.get(node, {}).items():
+            yield target, relation, weight
+
+    def predecessors(self, node: str):
+        """Yields (source, relation, weight) for every edge entering `node`."""
+        for source, (relation, weight) in self._reverse.get(node, {}).items():
+            yield source, relation, weight
+
+    def edge_count(self) -> int:
+        """Returns the number of distinct directed edges in the index."""
+        return sum(len(outgoing) for outgoing in self._forward.values())
@@ -0,0 +1,216 @@
+"""
+Bulk ingestion for the Dynamic Representational Substrate (DRS).
+
+Loading a large knowledge base through `DRSEngine.store` pays validation,
+indexing and logging costs once per concept. The helpers here stream records
+from an iterable (or a JSONL / CSV file), deduplicate edges, and hand them to the
+storage backend in batches so it can build its indexes in one pass per batch.
+
+The cyclic garbage collector is paused while a load runs: ingestion allocates
+millions of small, acyclic containers, and the collector would otherwise rescan
+the whole growing graph over and over for nothing.
+"""
+
+import contextlib
+import csv
+import gc
+import json
+import time
+
+from core_engine.drs_engine.graph_index import normalize_connections, to_connections
+
+CSV_FIELDS = ("concept", "target", "relation", "weight")
+
+
+def read_jsonl(path: str):
+    """
+    Streams records from a JSON Lines file.
+
+    Each line is an object such as
+    {"concept": "UNE", "data": {...}, "connections": [{"target": "DRS", "relation": "depends_on"}]};
+    "data" and "connections" are optional. Blank lines are skipped.
+
+    Args:
+        path (str): The file to read.
+
+    Yields:
+        tuple: (concept, data, connections) records.
+    """
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            if line.strip():
+                record = json.loads(line)
+                yield record["concept"], record.get("data") or {}, record.get("connections") or []
+
+
+def read_csv(path: str):
+    """
+    Streams records from a CSV edge list with a header row.
+
+    The columns "concept", "target", "relation" and the optional "weight" describe
+    one connection per row; a row with an empty target declares a concept with no
+    connection. Any other non-empty column is stored in the concept's data. Rows
+    for the same concept are merged by `ingest`.
+
+    Args:
+        path (str): The file to read.
+
+    Yields:
+        tuple: (concept, data, connections) records, one per row.
+    """
+    with open(path, newline="", encoding="utf-8") as handle:
+        for row in csv.DictReader(handle):
+            data = {key: value for key, value in row.items() if key not in CSV_FIELDS and value}
+            connections = []
+            if row.get("target"):
+                connection = {"target": row["target"], "relation": row.get("relation") or None}
+                if row.get("weight"):
+                    connection["weight"] = float(row["weight"])
+                connections.append(connection)
+            yield row["concept"], data, connections
+
+
+def ingest(backend, records, batch_size: int = 10000, journal=None, lock=None, validate=None,
+           stored=None) -> dict:
+    """
+    Stores a stream of records in a backend, one batch at a time.
+
+    Within a single call, several records for the same concept are merged: their
+    data dictionaries are combined (later keys win) and their connections are
+    unioned, dropping repeated (target, relation) edges. A concept that already
+    existed before the call is replaced, exactly as `DRSEngine.store` would.
+
+    Args:
+        backend: The StorageBackend to load into.
+        records: An iterable of (concept, data, connections) tuples or of dicts
+                 with those keys.
+        batch_size (int): How many distinct concepts to buffer before flushing.
+        journal (callable, optional): Called as `journal(batch)` just before a
+                                      batch is stored, with its merged records as
+                                      (concept, data, connections, edges) tuples,
+                                      e.g. to write them ahead to a log. If it
+                                      raises, nothing of the batch is stored.
+        lock (callable, optional): Returns a context manager held while each batch
+                                  is written, e.g. a ReadWriteLock's `write`, so
+                                  readers can run between batches.
+        validate (callable, optional): Called as `validate(concept, data)` for
+                                       every record as it is read; it raises to
+                                       reject the record before anything of its
+                                       batch is journaled or stored.
+        stored (callable, optional): Called as `stored(batch)`, with the same
+                                     tuples as `journal`, once the backend has
+                                     stored the batch.
+
+    Returns:
+        dict: Throughput statistics: records, concepts, edges, duplicate_edges,
+              seconds, records_per_second and edges_per_second.
+
+    Raises:
+        ValueError: If a connection has no target or a negative weight, or
+                    `validate` rejects a record. Batches flushed before the bad
+                    record remain stored.
+    """
+    started = time.perf_counter()
+    loaded = set()  # Concepts flushed earlier in this call, merged with rather than replaced.
+    batch = {}      # concept -> [data, edges, {(target, relation)} or None, connections or None]
+    record_count = edge_count = duplicate_count = 0
+    writing = lock or contextlib.nullcontext
+
+    def flush():
+        # Concepts given no data at all are stored with an empty dict, as with store().
+        flushed = [(concept, data if data is not None else {},
+                    connections if connections is not None else to_connections(edges), edges)
+                   for concept, (data, edges, _keys, connections) in batch.items()]
+        with writing():
+            if journal is not None:
+                journal(flushed)
+            backend.put_many(flushed)
+            if stored is not None:
+                stored(flushed)
+        loaded.update(batch)
+        batch.clear()
+
+    collecting = gc.isenabled()
+    gc.disable()
+    try:
+        for record in records:
+            concept, data, connections = _unpack_record(record)
+            record_count += 1
+            if validate is not None:
+                validate(concept, data)
+            added, duplicates = _merge_record(batch, loaded, backend, concept, data, connections)
+            edge_count += added
+            duplicate_count += duplicates
+
+            if len(batch) >= batch_size:
+                flush()
+
+        flush()
+        with writing():
+            backend.compact()
+    finally:
+        if collecting:
+            gc.enable()
+
+    seconds = time.perf_counter() - started
+    return {
+        "records": record_count,
+        "concepts": len(loaded),
+        "edges": edge_count,
+        "duplicate_edges": duplicate_count,
+        "seconds": seconds,
+        "records_per_second": record_count / seconds if seconds else float("inf"),
+        "edges_per_second": edge_count / seconds if seconds else float("inf"),
+    }
+
+
+def _unpack_record(record) -> tuple:
+    """Returns a record, given as a tuple or a dict, as (concept, data, connections)."""
+    if isinstance(record, dict):
+        return record["concept"], record.get("data"), record.get("connections")
+    return record
+
+
+def _merge_record(batch: dict, loaded: set, backend, concept: str, data, connections) -> tuple:
+    """
+    Adds one record to the pending batch of `ingest`, merging it with an earlier
+    record for the same concept.
+
+    Returns:
+        tuple: (edges added, duplicate edges dropped).
+    """
+    edges = normalize_connections(connections)
+    entry = batch.get(concept)
+    if entry is None and concept not in loaded:
+        # Fast path: the first record for a concept is kept as given, and its
+        # connection list is only rebuilt if it repeats an edge.
+        connections = connections or []
+        duplicates = 0
+        if len(edges) > 1 and len({(t, r) for t, r, _w in edges}) < len(edges):
+            unique = _unique_edges(edges, set())
+            duplicates = len(edges) - len(unique)
+            edges, connections = unique, None
+        batch[concept] = [data, edges, None, connections]
+        return len(edges), duplicates
+
+    if entry is None:
+        previous = backend[concept]
+        entry = batch[concept] = [previous["data"], normalize_connections(previous["connections"]), None, None]
+    if entry[2] is None:
+        entry[2] = {(t, r) for t, r, _w in entry[1]}
+    if data:
+        entry[0] = {**entry[0], **data} if entry[0] else data
+    unique = _unique_edges(edges, entry[2])
+    entry[1] = entry[1] + unique
+    entry[3] = None  # The merged connections are rebuilt from the edges.
+    return len(unique), len(edges) - len(unique)
+
+
+def _unique_edges(edges: list, seen: set) -> list:
+    """Returns the edges whose (target, relation) is not in `seen`, adding them to it."""
+    unique = []
+    for target, relation, weight in edges:
+        if (target, relation) not in seen:
+            seen.add((target, relation))
+            unique.append((target, relation, weight))
+    return unique
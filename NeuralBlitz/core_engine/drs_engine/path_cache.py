@@ -0,0 +1,129 @@
+"""
+Bounded memoization for repeated DRS lookups.
+
+Interaction traffic asks the DRS the same questions over and over: the same
+`query(concept)` and the same `find_connections(start, end)` pairs. The
+DependencyCache remembers answers with LRU and TTL eviction, and, unlike a plain
+LRU, records which concepts each answer depends on. When a concept's record or
+edges change, exactly the entries that depend on it are dropped; everything
+else stays warm.
+
+For a path search, the dependencies are the nodes the search actually expanded
+(plus both endpoints): a different answer would require a change to the edges
+of one of those nodes.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class DependencyCache:
+    """
+    A thread-safe LRU/TTL cache whose entries are invalidated by dependency.
+    """
+
+    def __init__(self, maxsize: int = 10000, ttl: float = None, clock=time.monotonic):
+        """
+        Initializes an empty cache.
+
+        Args:
+            maxsize (int): The maximum number of entries; the least recently used
+                           entry is evicted beyond it.
+            ttl (float, optional): Seconds after which an entry expires. None keeps
+                                   entries until they are evicted or invalidated.
+            clock (callable): Returns the current time in seconds.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()  # key -> (value, expiry, dependencies)
+        self._dependents = {}          # dependency -> {keys}
+        self._mutex = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+
+    def get(self, key) -> tuple:
+        """
+        Looks up a key.
+
+        Returns:
+            tuple: (True, value) on a hit, or (False, None) on a miss.
+        """
+        with self._mutex:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._counters["misses"] += 1
+                return False, None
+            if entry[1] is not None and entry[1] <= self._clock():
+                self._remove(key)
+                self._counters["expirations"] += 1
+                self._counters["misses"] += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self._counters["hits"] += 1
+            return True, entry[0]
+
+    def put(self, key, value, dependencies=()):
+        """
+        Stores a value, recording the concepts it depends on.
+
+        Args:
+            key: A hashable cache key.
+            value: The value to remember.
+            dependencies: The concepts whose change must invalidate this entry.
+        """
+        expiry = self._clock() + self.ttl if self.ttl is not None else None
+        dependencies = frozenset(dependencies)
+        with self._mutex:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, expiry, dependencies)
+            for dependency in dependencies:
+                self._dependents.setdefault(dependency, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+                self._counters["evictions"] += 1
+
+    def invalidate(self, concepts) -> int:
+        """
+        Drops every entry that depends on any of the given concepts.
+
+        Returns:
+            int: The number of entries dropped.
+        """
+        dropped = 0
+        with self._mutex:
+            for concept in concepts:
+                for key in list(self._dependents.get(concept, ())):
+                    self._remove(key)
+                    dropped += 1
+            self._counters["invalidations"] += dropped
+        return dropped
+
+    def clear(self):
+        """Drops every entry, keeping the counters."""
+        with self._mutex:
+            self._counters["invalidations"] += len(self._entries)
+            self._entries.clear()
+            self._dependents.clear()
+
+    def stats(self) -> dict:
+        """
+        Returns the hit, miss, eviction, expiration and invalidation counters,
+        the current size and the hit ratio.
+        """
+        with self._mutex:
+            stats = dict(self._counters, size=len(self._entries))
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+    def _remove(self, key):
+        """Removes an entry and its dependency links; the caller holds the mutex."""
+        _value, _expiry, dependencies = self._entries.pop(key)
+        for dependency in dependencies:
+            keys = self._dependents.get(dependency)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._dependents[dependency]
@@ -0,0 +1,531 @@
+"""
+Path search algorithms for the Dynamic Representational Substrate (DRS).
+
+All searches operate on any graph object that exposes `successors(node)` and
+`predecessors(node)`, each yielding (neighbour, relation, weight) tuples, such as
+the AdjacencyIndex. A graph may also offer `expand_frontier(nodes, forward)`,
+returning (node, neighbours) pairs for a whole BFS level at once; the
+bidirectional search then asks for each level in one call, which is what lets a
+partitioned graph answer it with one round trip per shard.
+
+Paths are returned in the DRS's native format: an alternating list of concepts
+and relations, e.g. ["UNE", "depends_on", "DRS"].
+"""
+
+import heapq
+import itertools
+
+STRATEGIES = ("bfs", "dijkstra", "astar")
+
+
+def bidirectional_bfs(graph, start: str, end: str, max_depth: int = None, explored: set = None) -> list | None:
+    """
+    Finds a path with the fewest hops by searching from both ends at once.
+
+    The frontier that is currently smaller is always the one expanded, so the
+    search touches roughly the square root of the nodes a one-sided BFS would.
+
+    Args:
+        graph: The graph to search.
+        start (str): The starting concept.
+        end (str): The target concept.
+        max_depth (int, optional): The maximum number of hops a path may have.
+        explored (set, optional): If given, receives every node whose neighbours
+                                  were read; the result can only change if one of
+                                  their edges changes.
+
+    Returns:
+        The path as an alternating concept/relation list, or None if no path exists
+        within `max_depth`.
+    """
+    if start == end:
+        return [start]
+
+    # Each side maps a node to (neighbour towards its root, relation, depth).
+    forward = {start: (None, None, 0)}
+    backward = {end: (None, None, 0)}
+    forward_frontier, backward_frontier = [start], [end]
+    forward_depth = backward_depth = 0
+
+    while forward_frontier and backward_frontier:
+        if max_depth is not None and forward_depth + backward_depth >= max_depth:
+            return None
+
+        expand_forward = len(forward_frontier) <= len(backward_frontier)
+        if expand_forward:
+            frontier, visited, other = forward_frontier, forward, backward
+            depth = forward_depth + 1
+        else:
+            frontier, visited, other = backward_frontier, backward, forward
+            depth = backward_depth + 1
+
+        if explored is not None:
+            explored.update(frontier)
+        next_frontier, best_meeting = _expand_level(graph, frontier, expand_forward, visited, other, depth)
+
+        if expand_forward:
+            forward_frontier, forward_depth = next_frontier, depth
+        else:
+            backward_frontier, backward_depth = next_frontier, depth
+
+        if best_meeting is not None:
+            return _join_paths(forward, backward, best_meeting)
+
+    return None
+
+
+def _expand_level(graph, frontier: list, forward: bool, visited: dict, other: dict, depth: int) -> tuple:
+    """
+    Expands one level of `bidirectional_bfs`, recording parents in `visited`.
+
+    The whole level is finished before answering, so the meeting point chosen is
+    the one giving the shortest overall path.
+
+    Returns:
+        tuple: (the next frontier, the best node reached by the other side or None).
+    """
+    best_meeting, best_length = None, None
+    next_frontier = []
+    for node, neighbours in _expand(graph, frontier, forward):
+        for neighbour, relation, _weight in neighbours:
+            if neighbour in visited:
+                continue
+            visited[neighbour] = (node, relation, depth)
+            if neighbour in other:
+                length = depth + other[neighbour][2]
+                if best_length is None or length < best_length:
+                    best_meeting, best_length = neighbour, length
+            next_frontier.append(neighbour)
+    return next_frontier, best_meeting
+
+
+def dijkstra(graph, start: str, end: str, max_depth: int = None,
+             max_cost: float = None, heuristic=None, explored: set = None) -> list | None:
+    """
+    Finds the cheapest path by total edge weight, optionally guided by a heuristic.
+
+    Given a `heuristic`, this is A*; the heuristic must never overestimate the
+    remaining cost to `end`, nor drop by more than an edge's weight along it,
+    otherwise the path found may not be the cheapest.
+
+    Args:
+        graph: The graph to search.
+        start (str): The starting concept.
+        end (str): The target concept.
+        max_depth (int, optional): The maximum number of hops a path may have.
+        max_cost (float, optional): The maximum total weight a path may have.
+        heuristic (callable, optional): `heuristic(node, end) -> float`, an
+                                        admissible estimate of the remaining cost.
+        explored (set, optional): If given, receives every node whose neighbours
+                                  were read.
+
+    Returns:
+        The path as an alternating concept/relation list, or None if no path exists
+        within the given limits.
+    """
+    estimate = heuristic or (lambda node, target: 0.0)
+    counter = itertools.count()
+    # Labels are (node, relation, parent label index). Under a hop limit a node
+    # may be settled more than once, when a later, costlier label reaches it in
+    # fewer hops, which keeps the search exact; without one, once is enough.
+    labels = [(start, None, None)]
+    heap = [(estimate(start, end), 0.0, 0, next(counter), 0)]
+    settled_hops = {}
+
+    while heap:
+        _priority, cost, hops, _tie, label_index = heapq.heappop(heap)
+        node = labels[label_index][0]
+        if _is_settled(settled_hops, node, hops, max_depth):
+            continue
+        settled_hops[node] = hops
+        if explored is not None:
+            explored.add(node)
+
+        if node == end:
+            return _unwind_labels(labels, label_index)
+        if max_depth is not None and hops >= max_depth:
+            continue
+
+        for neighbour, relation, weight in graph.successors(node):
+            new_cost = cost + weight
+            if max_cost is not None and new_cost > max_cost:
+                continue
+            if _is_settled(settled_hops, neighbour, hops + 1, max_depth):
+                continue
+            labels.append((neighbour, relation, label_index))
+            heapq.heappush(heap, (new_cost + estimate(neighbour, end), new_cost, hops + 1,
+                                  next(counter), len(labels) - 1))
+
+    return None
+
+
+def _is_settled(settled_hops: dict, node: str, hops: int, max_depth: int | None) -> bool:
+    """Whether `node` was already settled at no more than `hops` hops; any settling counts without a hop limit."""
+    if node not in settled_hops:
+        return False
+    return max_depth is None or settled_hops[node] <= hops
+
+
+def find_path(graph, start: str, end: str, strategy: str = "bfs", max_depth: int = None,
+              max_cost: float = None, heuristic=None, explored: set = None) -> list | None:
+    """
+    Dispatches a path search to the requested strategy.
+
+    Args:
+        graph: The graph to search.
+        start (str): The starting concept.
+        end (str): The target concept.
+        strategy (str): One of "bfs" (fewest hops), "dijkstra" (cheapest path)
+                        or "astar" (cheapest path guided by `heuristic`).
+        max_depth (int, optional): The maximum number of hops a path may have.
+        max_cost (float, optional): The maximum total weight a path may have.
+                                    Forces a weighted search when given with "bfs".
+        heuristic (callable, optional): The A* heuristic, see `dijkstra`.
+        explored (set, optional): Receives every node whose neighbours were read.
+
+    Returns:
+        The path as an alternating concept/relation list, or None if none was found.
+
+    Raises:
+        ValueError: If the strategy is unknown.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown path strategy '{strategy}'. Expected one of {STRATEGIES}.")
+    if strategy == "bfs" and max_cost is None:
+        return bidirectional_bfs(graph, start, end, max_depth=max_depth, explored=explored)
+    return dijkstra(graph, start, end, max_depth=max_depth, max_cost=max_cost,
+                    heuristic=heuristic if strategy == "astar" else None, explored=explored)
+
+
+def multi_source_bfs(graph, sources: list, max_depth: int = None, visit=None):
+    """
+    Runs a breadth-first search from every source at once.
+
+    Each reached node carries a bitmask of the sources that have reached it, so
+    one pass over a level reads every frontier node's successors once, however
+    many sources share it; the sources' searches advance together with a few
+    integer operations per edge instead of one traversal each.
+
+    Args:
+        graph: The graph to search.
+        sources (list): The distinct starting concepts.
+        max_depth (int, optional): How many hops to expand.
+        visit (callable, optional): `visit(index, node, depth)`, called when
+                                    `sources[index]` first reaches `node` (the
+                                    source itself at depth 0). Returning True
+                                    stops that source's search.
+    """
+    seen, frontier, active = {}, {}, 0
+    for index, source in enumerate(sources):
+        bit = 1 << index
+        seen[source] = frontier[source] = seen.get(source, 0) | bit
+        if visit is None or not visit(index, source, 0):
+            active |= bit
+
+    depth = 0
+    while frontier and active and (max_depth is None or depth < max_depth):
+        depth += 1
+        next_frontier = {}
+        level = [node for node, bits in frontier.items() if bits & active]
+        for node, neighbours in _expand(graph, level, True):
+            bits = frontier[node]
+            for neighbour, _relation, _weight in neighbours:
+                new = bits & active & ~seen.get(neighbour, 0)
+                if not new:
+                    continue
+                seen[neighbour] = seen.get(neighbour, 0) | new
+                next_frontier[neighbour] = next_frontier.get(neighbour, 0) | new
+                if visit is not None:
+                    for index in _bit_indices(new):
+                        if visit(index, neighbour, depth):
+                            active &= ~(1 << index)
+        frontier = next_frontier
+
+
+def neighbourhoods(graph, sources: list, hops: int = 1, limit: int = None) -> list:
+    """
+    Collects the concepts within `hops` of each source, in one shared search.
+
+    Args:
+        graph: The graph to search.
+        sources (list): The distinct starting concepts.
+        hops (int): The maximum distance.
+        limit (int, optional): The maximum number of concepts per source; the
+                               nearest are kept.
+
+    Returns:
+        list: For each source, (concept, hops) pairs in order of distance,
+              excluding the source itself.
+    """
+    found = [[] for _ in sources]
+
+    def visit(index, node, depth):
+        if depth:
+            found[index].append((node, depth))
+        return limit is not None and len(found[index]) >= limit
+
+    multi_source_bfs(graph, sources, max_depth=hops, visit=visit)
+    return found
+
+
+def focus_region(graph, sources: list, hops: int = 2, limit: int = None) -> dict:
+    """
+    Collects the concepts within `hops` of any source, in one merged search.
+
+    Unlike `neighbourhoods`, the sources are searched as one region: each
+    concept is reached once, from its nearest source. Among the nodes of a
+    level that reach it, the one giving the cheapest path is kept.
+
+    Args:
+        graph: The graph to search.
+        sources (list): The distinct starting concepts.
+        hops (int): The maximum distance.
+        limit (int, optional): The maximum number of concepts collected,
+                               sources included; the nearest are kept.
+
+    Returns:
+        dict: Maps each reached concept to (hops, cost, parent, relation), the
+              parent and relation being None for the sources. See `region_path`.
+    """
+    return focus_regions(graph, [sources], hops=hops, limit=limit)[0]
+
+
+def focus_regions(graph, groups: list, hops: int = 2, limit: int = None) -> list:
+    """
+    Runs `focus_region` for several groups of sources, in one shared search.
+
+    As in `multi_source_bfs`, each frontier node carries a bitmask of the
+    groups whose region it is on, so a level reads every node's successors
+    once for all groups; each group's region then grows exactly as it would
+    alone.
+
+    Args:
+        graph: The graph to search.
+        groups (list): Lists of distinct starting concepts, one per region.
+        hops (int): The maximum distance.
+        limit (int, optional): The maximum number of concepts per region.
+
+    Returns:
+        list: One `focus_region` result per group, in order.
+    """
+    regions = [{source: (0, 0.0, None, None) for source in sources} for sources in groups]
+    frontier = {}
+    for index, region in enumerate(regions):
+        for source in region:
+            frontier[source] = frontier.get(source, 0) | 1 << index
+    depth = 0
+    while frontier and depth < hops:
+        # A region that is full when its level starts stops growing.
+        active = sum(1 << index for index, region in enumerate(regions) if limit is None or len(region) < limit)
+        level = [node for node, bits in frontier.items() if bits & active]
+        if not level:
+            break
+        depth += 1
+        frontier = _grow_regions(graph, regions, level, frontier, active, depth, limit)
+    return regions
+
+
+def _grow_regions(graph, regions: list, level: list, frontier: dict, active: int, depth: int, limit: int) -> dict:
+    """
+    Expands one level of `focus_regions` for every active region on it.
+
+    Returns:
+        dict: The next frontier, with bitmasks of the regions on each node.
+    """
+    next_frontier = {}
+    for node, neighbours in _expand(graph, level, True):
+        bits = frontier[node] & active
+        for neighbour, relation, weight in neighbours:
+            for index in _bit_indices(bits):
+                region = regions[index]
+                cost = region[node][1] + weight
+                entry = region.get(neighbour)
+                if entry is None:
+                    if limit is not None and len(region) >= limit:
+                        continue  # Full: only cheaper paths to reached concepts still count.
+                    region[neighbour] = (depth, cost, node, relation)
+                    next_frontier[neighbour] = next_frontier.get(neighbour, 0) | 1 << index
+                elif entry[0] == depth and cost < entry[1]:
+                    region[neighbour] = (depth, cost, node, relation)
+    return next_frontier
+
+
+def region_path(reached: dict, concept: str) -> list:
+    """Returns the path from a concept's source to it, from a `focus_region` result."""
+    path = [concept]
+    _hops, _cost, parent, relation = reached[concept]
+    while parent is not None:
+        path[:0] = [parent, relation]
+        _hops, _cost, parent, relation = reached[parent]
+    return path
+
+
+def shortest_paths_many(graph, pairs: list, max_depth: int = None) -> list:
+    """
+    Finds a fewest-hop path for every (start, end) pair, in one shared search.
+
+    This is `bidirectional_bfs` run for all pairs at once: every distinct start
+    grows a forward tree and every distinct end a backward tree, each node
+    carrying bitmasks of the trees that reached it, so a level is expanded once
+    for all searches that share it. A pair is answered when its two trees meet,
+    and a tree stops growing once none of its pairs is still open.
+
+    Args:
+        graph: The graph to search.
+        pairs (list): (start, end) concept pairs.
+        max_depth (int, optional): The maximum number of hops a path may have.
+
+    Returns:
+        list: One path (an alternating concept/relation list) or None per pair.
+    """
+    starts, ends, ends_of, starts_of = _index_pairs(pairs)
+
+    # Each side: per-tree parent maps as in bidirectional_bfs, plus bitmasks of
+    # the trees that have reached each node and of those on the current level.
+    sides = []
+    for roots in (starts, ends):
+        trees = [{root: (None, None, 0)} for root in roots]
+        seen = {root: 1 << index for root, index in roots.items()}
+        sides.append([trees, seen, dict(seen), 0])
+    found = {}
+
+    def close(start_index, end_index, meeting):
+        found[start_index, end_index] = _join_paths(sides[0][0][start_index], sides[1][0][end_index], meeting)
+        ends_of[start_index] &= ~(1 << end_index)
+        starts_of[end_index] &= ~(1 << start_index)
+
+    for root, start_index in starts.items():
+        if root in ends and ends_of[start_index] >> ends[root] & 1:
+            close(start_index, ends[root], root)
+
+    while True:
+        active = [sum(1 << index for index, open_ in enumerate(opens) if open_) for opens in (ends_of, starts_of)]
+        for side, mask in zip(sides, active):
+            side[2] = {node: bits & mask for node, bits in side[2].items() if bits & mask}
+        if not (sides[0][2] and sides[1][2]):
+            break
+        if max_depth is not None and sides[0][3] + sides[1][3] >= max_depth:
+            break
+
+        forward = len(sides[0][2]) <= len(sides[1][2])
+        (trees, seen, frontier, depth), (other_trees, other_seen, _frontier, _depth) = \
+            sides if forward else sides[::-1]
+        wanted = ends_of if forward else starts_of
+        depth += 1
+        next_frontier, best = _expand_level_many(graph, frontier, forward, (trees, seen),
+                                                 (other_trees, other_seen), wanted, depth)
+        side = sides[0] if forward else sides[1]
+        side[2], side[3] = next_frontier, depth
+        for (start_index, end_index), (_length, meeting) in best.items():
+            close(start_index, end_index, meeting)
+
+    return [found.get((starts[start], ends[end])) for start, end in pairs]
+
+
+def _index_pairs(pairs: list) -> tuple:
+    """
+    Numbers the distinct starts and ends of `pairs`.
+
+    Returns:
+        tuple: (start -> index, end -> index, and the open pairs as bitmasks of
+               ends per start and of starts per end).
+    """
+    starts, ends = {}, {}
+    for start, end in pairs:
+        starts.setdefault(start, len(starts))
+        ends.setdefault(end, len(ends))
+    ends_of = [0] * len(starts)
+    starts_of = [0] * len(ends)
+    for start, end in pairs:
+        ends_of[starts[start]] |= 1 << ends[end]
+        starts_of[ends[end]] |= 1 << starts[start]
+    return starts, ends, ends_of, starts_of
+
+
+def _expand_level_many(graph, frontier: dict, forward: bool, side: tuple, other_side: tuple,
+                       wanted: list, depth: int) -> tuple:
+    """
+    Expands one level of `shortest_paths_many` for every tree on it at once.
+
+    Args:
+        frontier (dict): The level's nodes, with bitmasks of the trees on them.
+        side (tuple): (trees, seen) of the side being expanded, updated in place.
+        other_side (tuple): (trees, seen) of the opposite side.
+        wanted (list): Per tree of this side, a bitmask of its open pairs' trees
+                       on the other side.
+
+    Returns:
+        tuple: (the next frontier, {(start index, end index): (length, meeting)}
+               for the pairs whose trees met on this level). As in
+               bidirectional_bfs, the whole level is finished before answering.
+    """
+    (trees, seen), (other_trees, other_seen) = side, other_side
+    best = {}
+    next_frontier = {}
+    for node, neighbours in _expand(graph, list(frontier), forward):
+        bits = frontier[node]
+        for neighbour, relation, _weight in neighbours:
+            new = bits & ~seen.get(neighbour, 0)
+            if not new:
+                continue
+            seen[neighbour] = seen.get(neighbour, 0) | new
+            next_frontier[neighbour] = next_frontier.get(neighbour, 0) | new
+            reached = other_seen.get(neighbour, 0)
+            for index in _bit_indices(new):
+                trees[index][neighbour] = (node, relation, depth)
+                for other in _bit_indices(wanted[index] & reached):
+                    length = depth + other_trees[other][neighbour][2]
+                    pair = (index, other) if forward else (other, index)
+                    if pair not in best or length < best[pair][0]:
+                        best[pair] = (length, neighbour)
+    return next_frontier, best
+
+
+def _bit_indices(mask: int):
+    """Yields the positions of the set bits of `mask`, lowest first."""
+    while mask:
+        bit = mask & -mask
+        yield bit.bit_length() - 1
+        mask ^= bit
+
+
+def _expand(graph, frontier: list, forward: bool):
+    """Yields (node, neighbours) for every node of a BFS level."""
+    expand_frontier = getattr(graph, "expand_frontier", None)
+    if expand_frontier is not None:
+        return expand_frontier(frontier, forward)
+    neighbours = graph.successors if forward else graph.predecessors
+    return ((node, neighbours(node)) for node in frontier)
+
+
+def _join_paths(forward: dict, backward: dict, meeting: str) -> list:
+    """Stitches the two half-paths of a bidirectional search at `meeting`."""
+    head = []
+    node = meeting
+    while node is not None:
+        parent, relation, _depth = forward[node]
+        head.append(node)
+        if parent is not None:
+            head.append(relation)
+        node = parent
+    head.reverse()
+
+    node = meeting
+    while backward[node][0] is not None:
+        child, relation, _depth = backward[node]
+        head.extend((relation, child))
+        node = child
+    return head
+
+
+def _unwind_labels(labels: list, label_index: int) -> list:
+    """Rebuilds the path ending at `label_index` from its parent labels."""
+    path = []
+    while label_index is not None:
+        node, relation, parent = labels[label_index]
+        path.append(node)
+        if parent is not None:
+            path.append(relation)
+        label_index = parent
+    path.reverse()
+    return path
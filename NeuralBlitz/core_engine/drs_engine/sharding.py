@@ -0,0 +1,363 @@
+"""
+Partitioned Dynamic Representational Substrate (DRS) across worker processes.
+
+One DRSEngine is limited to the memory and the single core of its process. The
+ShardedDRSEngine splits the concepts over several worker processes, each running
+its own DRSEngine, and talks to them over multiprocessing pipes:
+
+- Every concept has one owning shard, chosen by a stable hash of its name or by
+  sorted range boundaries. A concept's record and its outgoing edges live on
+  its owner; its incoming edges live on the owners of their sources.
+- `query`, `store`, `connect` and `disconnect` are routed to the owning shard.
+- `store_many` streams each shard its part of the records, so all shards ingest
+  at the same time.
+- `find_connections` runs the bidirectional BFS of `pathfinding` over the whole
+  partitioned graph, one level at a time: a forward level is split by owner and
+  sent to the shards in parallel, and a backward level is broadcast, since any
+  shard may hold edges into it. Each level costs one round trip per shard.
+  Weighted strategies work too, but fetch one node's edges per round trip.
+
+Calls on one ShardedDRSEngine are serialized; the shards themselves run in
+parallel within each call.
+"""
+
+import bisect
+import multiprocessing
+import threading
+import time
+import zlib
+
+from core_engine.drs_engine.drs_manager import DRSEngine
+from core_engine.drs_engine.graph_index import DEFAULT_WEIGHT
+from core_engine.drs_engine.pathfinding import find_path
+from core_engine.structured_logging import get_logger
+
+logger = get_logger("drs")
+
+# Configuration keys that name files; each shard gets its own copy of the file.
+_PATH_KEYS = ("snapshot", "wal_path", "checkpoint_path")
+_SHARDING_KEYS = ("shards", "shard_boundaries", "start_method")
+
+
+def shard_path(path: str, shard: int) -> str:
+    """Returns the per-shard file name for `path`, e.g. "drs.wal.shard0"."""
+    return f"{path}.shard{shard}"
+
+
+class ShardedDRSEngine:
+    """
+    A DRS whose concepts are partitioned over several worker processes.
+    """
+
+    def __init__(self, config: dict):
+        """
+        Starts one worker process per shard.
+
+        Every shard is a DRSEngine built from the same config, except that the
+        file-valued settings ("snapshot", "wal_path", "checkpoint_path") get a
+        per-shard suffix (see `shard_path`), so durability and snapshots work per
+        shard.
+
+        Args:
+            config (dict): The DRSEngine configuration, plus "shards" (the number of
+                           worker processes, default 2), "shard_boundaries" (a
+                           sorted list of concept names splitting the key space
+                           into ranges; overrides "shards" and hash partitioning),
+                           and "start_method" (how shard processes are started,
+                           default "forkserver" where the platform has it, else
+                           "spawn"; "fork" can copy a lock held by another of
+                           this process's threads, such as the WAL flusher or
+                           a logging listener, and deadlock the shard).
+
+        Raises:
+            ValueError: If "shard_boundaries" is not sorted or fewer than one
+                        shard is requested.
+        """
+        self.config = config
+        self._boundaries = config.get("shard_boundaries")
+        if self._boundaries is not None:
+            if list(self._boundaries) != sorted(self._boundaries):
+                raise ValueError("shard_boundaries must be sorted.")
+            shards = len(self._boundaries) + 1
+        else:
+            shards = config.get("shards", 2)
+        if shards < 1:
+            raise ValueError(f"A sharded DRS needs at least one shard, got {shards}.")
+
+        start_method = config.get("start_method")
+        if start_method is None:
+            start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        context = multiprocessing.get_context(start_method)
+        self._mutex = threading.Lock()
+        self._version = 0
+        self._connections = []
+        self._processes = []
+        for shard in range(shards):
+            parent, child = context.Pipe()
+            process = context.Process(target=_serve, args=(child, _shard_config(config, shard)),
+                                      name=f"drs-shard-{shard}", daemon=True)
+            process.start()
+            child.close()
+            self._connections.append(parent)
+            self._processes.append(process)
+        logger.info("initialized", shards=shards)
+
+    @property
+    def shards(self) -> int:
+        """The number of shards."""
+        return len(self._connections)
+
+    def shard_for(self, concept: str) -> int:
+        """Returns the index of the shard that owns a concept."""
+        if self._boundaries is not None:
+            return bisect.bisect_right(self._boundaries, concept)
+        return zlib.crc32(concept.encode("utf-8")) % len(self._connections)
+
+    def store(self, concept: str, data: dict, connections: list = None):
+        """Stores a concept on its owning shard; see `DRSEngine.store`."""
+        logger.debug("store", concept=concept, shard=self.shard_for(concept))
+        with self._mutex:
+            self._call(self.shard_for(concept), "store", concept, data, connections)
+            self._version += 1
+
+    def connect(self, source: str, target: str, relation: str, weight: float = DEFAULT_WEIGHT):
+        """Adds a connection on the source's shard; see `DRSEngine.connect`."""
+        with self._mutex:
+            self._call(self.shard_for(source), "connect", source, target, relation, weight)
+            self._version += 1
+
+    def disconnect(self, source: str, target: str, relation: str = None) -> bool:
+        """Removes connections on the source's shard; see `DRSEngine.disconnect`."""
+        with self._mutex:
+            removed = self._call(self.shard_for(source), "disconnect", source, target, relation)
+            if removed:
+                self._version += 1
+            return removed
+
+    def store_many(self, records, batch_size: int = 10000) -> dict:
+        """
+        Streams records to their owning shards, which ingest them in parallel.
+
+        Each shard runs one `DRSEngine.store_many` over its part of the stream,
+        so records for the same concept are merged exactly as on a single DRS.
+
+        Args:
+            records: An iterable of (concept, data, connections) tuples or of dicts
+                     with "concept", "data" and "connections" keys.
+            batch_size (int): How many records to send a shard per message, and
+                              the shards' own ingestion batch size.
+
+        Returns:
+            dict: The shards' statistics summed, with throughput over the whole call.
+        """
+        started = time.perf_counter()
+        with self._mutex:
+            for connection in self._connections:
+                connection.send(("store_many", (batch_size,)))
+            buffers = [[] for _ in self._connections]
+            try:
+                for record in records:
+                    concept = record["concept"] if isinstance(record, dict) else record[0]
+                    shard = self.shard_for(concept)
+                    buffers[shard].append(record)
+                    if len(buffers[shard]) >= batch_size:
+                        self._connections[shard].send(buffers[shard])
+                        buffers[shard] = []
+            finally:
+                # Always end every stream, so the shards stay in step if the input fails.
+                for connection, buffer in zip(self._connections, buffers):
+                    if buffer:
+                        connection.send(buffer)
+                    connection.send(None)
+                self._version += 1
+                results = self._gather(range(len(self._connections)))
+
+        stats = {key: sum(result[key] for result in results)
+                 for key in ("records", "concepts", "edges", "duplicate_edges")}
+        seconds = time.perf_counter() - started
+        stats["seconds"] = seconds
+        stats["records_per_second"] = stats["records"] / seconds if seconds else float("inf")
+        stats["edges_per_second"] = stats["edges"] / seconds if seconds else float("inf")
+        logger.info("store_many", concepts=stats["concepts"], edges=stats["edges"], shards=self.shards,
+                    records_per_second=round(stats["records_per_second"]))
+        return stats
+
+    @property
+    def version(self) -> int:
+        """A counter that changes with every mutation; see `DRSEngine.version`."""
+        return self._version
+
+    def concept_names(self) -> list:
+        """Returns the IDs of every concept, from all shards."""
+        with self._mutex:
+            for connection in self._connections:
+                connection.send(("concept_names", ()))
+            return [concept for names in self._gather(range(len(self._connections))) for concept in names]
+
+    def query(self, concept: str) -> dict | None:
+        """Retrieves a concept from its owning shard; see `DRSEngine.query`."""
+        with self._mutex:
+            return self._call(self.shard_for(concept), "query", concept)
+
+    def find_connections(self, start_concept: str, end_concept: str, strategy: str = None,
+                         max_depth: int = None, max_cost: float = None, heuristic=None) -> list:
+        """
+        Finds the path between two concepts across all shards.
+
+        Takes the same arguments and returns the same format as
+        `DRSEngine.find_connections`.
+        """
+        logger.debug("find_connections", start=start_concept, end=end_concept)
+        with self._mutex:
+            if not (self._call(self.shard_for(start_concept), "contains", start_concept)
+                    and self._call(self.shard_for(end_concept), "contains", end_concept)):
+                return []  # No path found
+            path = find_path(
+                _ShardedGraph(self),
+                start_concept,
+                end_concept,
+                strategy=strategy or self.config.get("path_strategy", "bfs"),
+                max_depth=max_depth if max_depth is not None else self.config.get("max_path_depth"),
+                max_cost=max_cost,
+                heuristic=heuristic,
+            )
+        return path or []
+
+    def save_snapshot(self, path: str):
+        """Saves every shard to its own snapshot file (see `shard_path`)."""
+        with self._mutex:
+            for shard, connection in enumerate(self._connections):
+                connection.send(("save_snapshot", (shard_path(path, shard),)))
+            self._gather(range(len(self._connections)))
+
+    def load_snapshot(self, path: str):
+        """Loads every shard from the files written by `save_snapshot`."""
+        with self._mutex:
+            for shard, connection in enumerate(self._connections):
+                connection.send(("load_snapshot", (shard_path(path, shard),)))
+            self._version += 1
+            self._gather(range(len(self._connections)))
+
+    def __len__(self) -> int:
+        with self._mutex:
+            for connection in self._connections:
+                connection.send(("count", ()))
+            return sum(self._gather(range(len(self._connections))))
+
+    def close(self):
+        """Closes every shard's DRS and stops the worker processes."""
+        with self._mutex:
+            for connection in self._connections:
+                connection.send(("close", ()))
+            self._gather(range(len(self._connections)))
+            for connection, process in zip(self._connections, self._processes):
+                connection.close()
+                process.join()
+            self._connections, self._processes = [], []
+
+    def _call(self, shard: int, op: str, *args):
+        """Runs one operation on one shard; the caller holds the mutex."""
+        self._connections[shard].send((op, args))
+        return self._gather([shard])[0]
+
+    def _gather(self, shards) -> list:
+        """
+        Receives one reply from each of `shards`, in order, re-raising the first
+        error only after every reply has been read so the pipes stay in step.
+        """
+        results, error = [], None
+        for shard in shards:
+            status, value = self._connections[shard].recv()
+            if status == "error" and error is None:
+                error = value
+            results.append(value)
+        if error is not None:
+            raise error
+        return results
+
+
+class _ShardedGraph:
+    """The `pathfinding` graph protocol over a ShardedDRSEngine's shards."""
+
+    def __init__(self, engine: ShardedDRSEngine):
+        self._engine = engine
+
+    def successors(self, concept: str) -> list:
+        return self._engine._call(self._engine.shard_for(concept), "expand", [concept], True)[0][1]
+
+    def predecessors(self, concept: str) -> list:
+        return self.expand_frontier([concept], False)[0][1]
+
+    def expand_frontier(self, nodes: list, forward: bool) -> list:
+        """Fetches the neighbours of a whole BFS level, one message per shard."""
+        engine = self._engine
+        if forward:
+            owned = [[] for _ in range(engine.shards)]
+            for node in nodes:
+                owned[engine.shard_for(node)].append(node)
+            asked = [shard for shard in range(engine.shards) if owned[shard]]
+            for shard in asked:
+                engine._connections[shard].send(("expand", (owned[shard], True)))
+            return [item for part in engine._gather(asked) for item in part]
+
+        # Incoming edges may be held by any shard.
+        for connection in engine._connections:
+            connection.send(("expand", (nodes, False)))
+        merged = {node: [] for node in nodes}
+        for part in engine._gather(range(engine.shards)):
+            for node, neighbours in part:
+                merged[node].extend(neighbours)
+        return list(merged.items())
+
+
+def _shard_config(config: dict, shard: int) -> dict:
+    """Builds one shard's DRSEngine config from the sharded config."""
+    shard_config = {key: value for key, value in config.items() if key not in _SHARDING_KEYS}
+    for key in _PATH_KEYS:
+        if shard_config.get(key):
+            shard_config[key] = shard_path(shard_config[key], shard)
+    return shard_config
+
+
+def _serve(connection, config: dict):
+    """The worker process: runs one DRSEngine and answers requests until closed."""
+    engine = DRSEngine(config)
+    while True:
+        op, args = connection.recv()
+        try:
+            if op == "store_many":
+                stream = _receive_records(connection)
+                try:
+                    reply = ("ok", engine.store_many(stream, *args))
+                finally:
+                    for _rest in stream:  # Keep the pipe in step after an error.
+                        pass
+            elif op == "expand":
+                reply = ("ok", _expand(engine, *args))
+            elif op == "contains":
+                reply = ("ok", args[0] in engine._storage)
+            elif op == "count":
+                reply = ("ok", len(engine._storage))
+            else:
+                reply = ("ok", getattr(engine, op)(*args))
+        except Exception as error:
+            reply = ("error", error)
+        connection.send(reply)
+        if op == "close":
+            return
+
+
+def _receive_records(connection):
+    """Yields the records streamed by `store_many`, up to its end marker."""
+    while True:
+        chunk = connection.recv()
+        if chunk is None:
+            return
+        yield from chunk
+
+
+def _expand(engine: DRSEngine, nodes: list, forward: bool) -> list:
+    """Returns (node, neighbours) for each node, from this shard's edges only."""
+    with engine._lock.read():
+        neighbours = engine._storage.successors if forward else engine._storage.predecessors
+        return [(node, list(neighbours(node))) for node in nodes]
@@ -0,0 +1,301 @@
+"""
+Versioned, memory-mappable snapshot format for the Dynamic Representational Substrate.
+
+A snapshot is a single binary file holding the compact backend's tables: the
+forward and reverse CSR edge arrays, the concept name table (with a sorted
+permutation for name -> ID lookups), the relation labels, each concept's data
+as JSON, and as JSON the connection lists its edges cannot rebuild exactly (see
+CompactBackend). Every table is 8-byte aligned, so `open_snapshot` can map the file and
+view the tables in place with `memoryview.cast` instead of parsing them. Cold
+start is therefore independent of graph size, and several worker processes
+mapping the same file share one copy of it in the page cache.
+
+Layout (native byte order, recorded in the header):
+
+    magic     8 bytes   b"NBDRSNAP"
+    version   uint32
+    byteorder uint32    1 = little endian, 2 = big endian
+    counts    4 x int64 nodes, edges, relations, stored concepts
+    sections  N x (int64 offset, int64 length) in SECTIONS order
+    ...section payloads...
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from core_engine.drs_engine.graph_index import normalize_connections
+from core_engine.drs_engine.storage import CompactBackend, StorageBackend
+
+MAGIC = b"NBDRSNAP"
+SNAPSHOT_VERSION = 2
+SECTIONS = (
+    ("offsets", "q"), ("targets", "i"), ("edge_relations", "I"), ("weights", "d"),
+    ("rev_offsets", "q"), ("rev_sources", "i"), ("rev_relations", "I"), ("rev_weights", "d"),
+    ("name_offsets", "q"), ("name_blob", "B"), ("sorted_ids", "i"), ("stored", "B"),
+    ("data_offsets", "q"), ("data_blob", "B"), ("relations", "B"),
+    ("connection_offsets", "q"), ("connection_blob", "B"),
+)
+_HEADER = struct.Struct("=8sII4q")
+_SECTION = struct.Struct("=qq")
+_BYTEORDER = {"little": 1, "big": 2}
+_ALIGNMENT = 8
+
+
+def write_snapshot(backend: StorageBackend, path: str):
+    """
+    Writes the contents of any storage backend to a snapshot file.
+
+    The file is written next to `path` and renamed into place, so readers never
+    observe a half-written snapshot.
+
+    Args:
+        backend (StorageBackend): The backend to persist. A CompactBackend is
+                                  compacted first; any other backend is converted.
+        path (str): The destination file.
+
+    Raises:
+        TypeError: If a concept's data or connections are not JSON-serializable.
+    """
+    compact = backend if isinstance(backend, CompactBackend) else _to_compact(backend)
+    compact.compact()
+
+    node_count = len(compact._names)
+    names = [compact._names[node].encode("utf-8") for node in range(node_count)]
+    name_offsets, name_blob = _pack_blobs(names)
+    sorted_ids = array("i", sorted(range(node_count), key=names.__getitem__))
+    data_offsets, data_blob = _pack_blobs(
+        json.dumps(compact._data[node], separators=(",", ":")).encode("utf-8") if compact._stored[node] else b""
+        for node in range(node_count))
+    connection_offsets, connection_blob = _pack_blobs(
+        _encode_connections(compact._connections.get(node)) for node in range(node_count))
+
+    payloads = {
+        "offsets": compact._offsets, "targets": compact._targets,
+        "edge_relations": compact._edge_relations, "weights": compact._weights,
+        "rev_offsets": compact._rev_offsets, "rev_sources": compact._rev_sources,
+        "rev_relations": compact._rev_relations, "rev_weights": compact._rev_weights,
+        "name_offsets": name_offsets, "name_blob": name_blob, "sorted_ids": sorted_ids,
+        "stored": bytes(compact._stored), "data_offsets": data_offsets, "data_blob": data_blob,
+        "relations": json.dumps(list(compact._relations)).encode("utf-8"),
+        "connection_offsets": connection_offsets, "connection_blob": connection_blob,
+    }
+
+    position = _HEADER.size + _SECTION.size * len(SECTIONS)
+    table = []
+    for name, _typecode in SECTIONS:
+        position = _align(position)
+        length = len(memoryview(payloads[name]).cast("B"))
+        table.append((position, length))
+        position += length
+
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as handle:
+        handle.write(_HEADER.pack(MAGIC, SNAPSHOT_VERSION, _BYTEORDER[sys.byteorder],
+                                  node_count, len(compact._targets), len(compact._relations),
+                                  len(compact)))
+        for offset, length in table:
+            handle.write(_SECTION.pack(offset, length))
+        for (name, _typecode), (offset, _length) in zip(SECTIONS, table):
+            handle.write(b"\0" * (offset - handle.tell()))
+            handle.write(memoryview(payloads[name]).cast("B"))
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(temporary, path)
+
+
+def open_snapshot(path: str, compaction_ratio: float = 0.25) -> CompactBackend:
+    """
+    Maps a snapshot file read-only and returns a CompactBackend viewing it in place.
+
+    Nothing is copied up front: edges are read straight from the mapping, names
+    are decoded and looked up (by binary search) on demand, and data is parsed
+    from JSON only when a concept is queried. Concepts stored afterwards go into
+    the backend's in-memory overlay and never touch the file.
+
+    Args:
+        path (str): The snapshot file.
+        compaction_ratio (float): Passed on to the CompactBackend.
+
+    Returns:
+        CompactBackend: A backend backed by the mapped file.
+
+    Raises:
+        ValueError: If the file is not a snapshot, or has an unsupported version
+                    or byte order.
+    """
+    with open(path, "rb") as handle:
+        mapping = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+    header = _HEADER.unpack_from(mapping, 0)
+    magic, version, byteorder, node_count, _edges, _relations, stored_count = header
+    if magic != MAGIC:
+        raise ValueError(f"'{path}' is not a DRS snapshot.")
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported DRS snapshot version {version} (expected {SNAPSHOT_VERSION}).")
+    if byteorder != _BYTEORDER[sys.byteorder]:
+        raise ValueError(f"DRS snapshot '{path}' was written on a machine with a different byte order.")
+
+    view = memoryview(mapping)
+    tables = {}
+    for index, (name, typecode) in enumerate(SECTIONS):
+        offset, length = _SECTION.unpack_from(mapping, _HEADER.size + index * _SECTION.size)
+        tables[name] = view[offset:offset + length].cast(typecode)
+
+    backend = CompactBackend(compaction_ratio=compaction_ratio)
+    backend._mapping = mapping  # Keeps the mapping alive as long as the backend.
+    backend._names = _NameTable(tables["name_offsets"], tables["name_blob"])
+    backend._ids = _IdTable(backend._names, tables["sorted_ids"])
+    backend._data = _DataTable(tables["data_offsets"], tables["data_blob"])
+    backend._connections = _ConnectionTable(tables["connection_offsets"], tables["connection_blob"])
+    backend._stored = bytearray(tables["stored"])
+    backend._stored_count = stored_count
+    backend._relations = json.loads(bytes(tables["relations"]))
+    backend._relation_ids = {relation: index for index, relation in enumerate(backend._relations)}
+    for name in ("offsets", "targets", "edge_relations", "weights",
+                 "rev_offsets", "rev_sources", "rev_relations", "rev_weights"):
+        setattr(backend, f"_{name}", tables[name])
+    if len(backend._names) != node_count:
+        raise ValueError(f"DRS snapshot '{path}' is corrupt (name table size mismatch).")
+    return backend
+
+
+class _NameTable:
+    """ID -> concept name, decoded lazily from the mapped name blob."""
+
+    def __init__(self, offsets, blob):
+        self._offsets = offsets
+        self._blob = blob
+        self._base = len(offsets) - 1
+        self._added = []
+
+    def __getitem__(self, node: int) -> str:
+        if node >= self._base:
+            return self._added[node - self._base]
+        return self.encoded(node).decode("utf-8")
+
+    def encoded(self, node: int) -> bytes:
+        return bytes(self._blob[self._offsets[node]:self._offsets[node + 1]])
+
+    def append(self, name: str):
+        self._added.append(name)
+
+    def __len__(self) -> int:
+        return self._base + len(self._added)
+
+
+class _IdTable:
+    """Concept name -> ID, by binary search over the snapshot's sorted permutation."""
+
+    def __init__(self, names: _NameTable, sorted_ids):
+        self._names = names
+        self._sorted = sorted_ids
+        self._added = {}
+
+    def get(self, name: str, default=None):
+        node = self._added.get(name)
+        if node is not None:
+            return node
+        key = name.encode("utf-8")
+        low, high = 0, len(self._sorted)
+        while low < high:
+            middle = (low + high) // 2
+            if self._names.encoded(self._sorted[middle]) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(self._sorted) and self._names.encoded(self._sorted[low]) == key:
+            return self._sorted[low]
+        return default
+
+    def __setitem__(self, name: str, node: int):
+        self._added[name] = node
+
+
+class _DataTable:
+    """ID -> concept data, parsed lazily from the mapped JSON blob."""
+
+    def __init__(self, offsets, blob):
+        self._offsets = offsets
+        self._blob = blob
+        self._base = len(offsets) - 1
+        self._overrides = {}
+        self._added = 0
+
+    def __getitem__(self, node: int):
+        if node in self._overrides:
+            return self._overrides[node]
+        if node >= self._base:
+            return None
+        start, end = self._offsets[node], self._offsets[node + 1]
+        return json.loads(bytes(self._blob[start:end])) if end > start else None
+
+    def __setitem__(self, node: int, data):
+        self._overrides[node] = data
+
+    def append(self, data):
+        self._overrides[self._base + self._added] = data
+        self._added += 1
+
+    def __len__(self) -> int:
+        return self._base + self._added
+
+
+class _ConnectionTable:
+    """ID -> kept connection list, parsed lazily from the mapped JSON blob."""
+
+    def __init__(self, offsets, blob):
+        self._offsets = offsets
+        self._blob = blob
+        self._base = len(offsets) - 1
+        self._overrides = {}
+
+    def get(self, node: int, default=None):
+        if node in self._overrides:
+            connections = self._overrides[node]
+            return default if connections is None else connections
+        if node >= self._base:
+            return default
+        start, end = self._offsets[node], self._offsets[node + 1]
+        return json.loads(bytes(self._blob[start:end])) if end > start else default
+
+    def __setitem__(self, node: int, connections: list):
+        self._overrides[node] = connections
+
+    def pop(self, node: int, default=None):
+        connections = self.get(node, default)
+        self._overrides[node] = None
+        return connections
+
+
+def _encode_connections(connections) -> bytes:
+    """Encodes a kept connection list for the snapshot; b"" when there is none."""
+    return b"" if connections is None else json.dumps(connections, separators=(",", ":")).encode("utf-8")
+
+
+def _to_compact(backend: StorageBackend) -> CompactBackend:
+    """Copies any backend's concepts and edges into a new CompactBackend."""
+    compact = CompactBackend()
+    for concept in backend:
+        # Edges come from the stored connections: an adjacency index may keep
+        # only the cheapest of several connections to the same target.
+        record = backend[concept]
+        compact.put(concept, record["data"], record["connections"], normalize_connections(record["connections"]))
+    return compact
+
+
+def _pack_blobs(blobs) -> tuple:
+    """Concatenates byte strings, returning (offsets, blob)."""
+    offsets = array("q", [0])
+    blob = bytearray()
+    for item in blobs:
+        blob += item
+        offsets.append(len(blob))
+    return offsets, blob
+
+
+def _align(position: int) -> int:
+    return (position + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
@@ -0,0 +1,440 @@
+"""
+Storage backends for the Dynamic Representational Substrate (DRS).
+
+A backend holds the concept records and the relationship graph between them.
+Every backend behaves as a read-only mapping of `concept -> {"data", "connections"}`
+records, and exposes `successors`/`predecessors` so the path searches can walk it.
+
+Two backends are provided:
+- DictBackend: plain dictionaries plus an AdjacencyIndex. Simple and fast to
+  update, but every edge costs several Python objects.
+- CompactBackend: concept names and relation labels are interned to integer IDs,
+  and edges live in CSR (compressed sparse row) `array` buffers, costing a few
+  bytes per edge instead of a few hundred.
+"""
+
+from array import array
+from collections.abc import Mapping
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; it only speeds up compaction.
+    np = None
+
+from core_engine.drs_engine.graph_index import DEFAULT_WEIGHT, AdjacencyIndex, to_connections
+
+
+class StorageBackend(Mapping):
+    """
+    The interface every DRS storage backend implements.
+    """
+
+    def put(self, concept: str, data: dict, connections: list, edges: list):
+        """
+        Stores a concept, replacing any previous record and its edges.
+
+        Args:
+            concept (str): The unique identifier for the concept.
+            data (dict): The information associated with the concept.
+            connections (list): The connection dictionaries as given by the caller.
+            edges (list): The same connections, normalized to (target, relation, weight).
+        """
+        raise NotImplementedError
+
+    def put_many(self, records):
+        """
+        Stores many concepts at once. Backends override this when a batch can be
+        indexed more cheaply than the same concepts one at a time.
+
+        Args:
+            records: An iterable of (concept, data, connections, edges) tuples,
+                     with the same meaning as the arguments of `put`.
+        """
+        for concept, data, connections, edges in records:
+            self.put(concept, data, connections, edges)
+
+    def compact(self):
+        """
+        Brings the backend's indexes into their most efficient layout. Called after
+        bulk loads; backends that are always compact need not override it.
+        """
+
+    def successors(self, concept: str):
+        """Yields (target, relation, weight) for every edge leaving `concept`."""
+        raise NotImplementedError
+
+    def predecessors(self, concept: str):
+        """Yields (source, relation, weight) for every edge entering `concept`."""
+        raise NotImplementedError
+
+
+class DictBackend(StorageBackend):
+    """
+    Stores records in a dictionary and relationships in an AdjacencyIndex.
+    """
+
+    def __init__(self):
+        self._records = {}
+        self._index = AdjacencyIndex()
+
+    def put(self, concept: str, data: dict, connections: list, edges: list):
+        self._records[concept] = {
+            "data": data,
+            "connections": connections or []
+        }
+        # Storing a concept again replaces its connections, old edges included.
+        self._index.set_edges(concept, edges)
+
+    def put_many(self, records):
+        records_by_concept, index = self._records, self._index
+        for concept, data, connections, edges in records:
+            records_by_concept[concept] = {"data": data, "connections": connections or []}
+            index.set_edges(concept, edges)
+
+    def successors(self, concept: str):
+        return self._index.successors(concept)
+
+    def predecessors(self, concept: str):
+        return self._index.predecessors(concept)
+
+    def __getitem__(self, concept: str) -> dict:
+        return self._records[concept]
+
+    def __contains__(self, concept) -> bool:
+        return concept in self._records
+
+    def __iter__(self):
+        return iter(self._records)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+
+class CompactBackend(StorageBackend):
+    """
+    Stores concepts under interned integer IDs with edges in CSR arrays.
+
+    The CSR arrays are immutable once built. Concepts stored afterwards keep their
+    outgoing edges in a small `_pending` overlay that shadows their CSR row, and
+    the overlay is folded back into fresh arrays by `compact()`, which also runs
+    automatically once the overlay grows past `compaction_ratio` of the graph.
+
+    Records are rebuilt from the edges when queried. Connection lists that would
+    not come back unchanged (a missing relation, an explicit default weight, or
+    extra keys) are kept as given, so records read the same as from a DictBackend.
+    """
+
+    def __init__(self, compaction_ratio: float = 0.25, min_compaction: int = 1024):
+        """
+        Initializes an empty compact backend.
+
+        Args:
+            compaction_ratio (float): Rebuild the CSR arrays once this fraction of
+                                      concepts has pending (uncompacted) edges.
+            min_compaction (int): Never rebuild for fewer pending concepts than this.
+        """
+        self.compaction_ratio = compaction_ratio
+        self.min_compaction = min_compaction
+
+        self._ids = {}           # concept name -> integer ID
+        self._names = []         # integer ID -> concept name
+        self._data = []          # integer ID -> data dict (None for unstored IDs)
+        self._stored = bytearray()  # integer ID -> 1 if the concept was stored
+        self._stored_count = 0
+        self._relation_ids = {}  # relation label -> integer ID
+        self._relations = []     # integer ID -> relation label
+        self._connections = {}   # integer ID -> connections the edges cannot rebuild
+
+        # Forward and reverse CSR: the edges of node i are entries
+        # offsets[i]:offsets[i + 1] of the parallel edge arrays.
+        self._offsets = array("q", [0])
+        self._targets = array("i")
+        self._edge_relations = array("I")
+        self._weights = array("d")
+        self._rev_offsets = array("q", [0])
+        self._rev_sources = array("i")
+        self._rev_relations = array("I")
+        self._rev_weights = array("d")
+
+        self._pending = {}          # source ID -> [(target ID, relation ID, weight)]
+        self._pending_reverse = {}  # target ID -> {source IDs with a pending edge to it}
+
+    # --- Interning ---
+
+    def _intern(self, concept: str) -> int:
+        concept_id = self._ids.get(concept)
+        if concept_id is None:
+            concept_id = len(self._names)
+            self._ids[concept] = concept_id
+            self._names.append(concept)
+            self._data.append(None)
+            self._stored.append(0)
+        return concept_id
+
+    def _intern_relation(self, relation) -> int:
+        relation_id = self._relation_ids.get(relation)
+        if relation_id is None:
+            relation_id = len(self._relations)
+            self._relation_ids[relation] = relation_id
+            self._relations.append(relation)
+        return relation_id
+
+    # --- Mutation ---
+
+    def put(self, concept: str, data: dict, connections: list, edges: list):
+        self._put_row(concept, data, connections, edges)
+        if len(self._pending) > max(self.min_compaction, self.compaction_ratio * len(self._names)):
+            self.compact()
+
+    def put_many(self, records):
+        """
+        Stores a batch of concepts, checking whether to rebuild the CSR arrays once
+        for the whole batch rather than after every concept.
+        """
+        for concept, data, connections, edges in records:
+            self._put_row(concept, data, connections, edges)
+        if len(self._pending) > max(self.min_compaction, self.compaction_ratio * len(self._names)):
+            self.compact()
+
+    def _put_row(self, concept: str, data: dict, connections: list, edges: list):
+        """Stores a concept's data and edges in the overlay, without compacting."""
+        source = self._intern(concept)
+        if not self._stored[source]:
+            self._stored[source] = 1
+            self._stored_count += 1
+        self._data[source] = data
+        if connections is None or _rebuilds(connections, edges):
+            self._connections.pop(source, None)
+        else:
+            self._connections[source] = connections
+        ids, relation_ids = self._ids, self._relation_ids
+        row = []
+        for target, relation, weight in edges:
+            target_id = ids.get(target)
+            if target_id is None:
+                target_id = self._intern(target)
+            relation_id = relation_ids.get(relation)
+            if relation_id is None:
+                relation_id = self._intern_relation(relation)
+            row.append((target_id, relation_id, weight))
+        self._set_row(source, row)
+
+    def _set_row(self, source: int, row: list):
+        """Makes `row` the outgoing edges of `source` through the pending overlay."""
+        for target, _relation, _weight in self._pending.get(source, ()):
+            sources = self._pending_reverse.get(target)
+            if sources is not None:
+                sources.discard(source)
+        self._pending[source] = row
+        for target, _relation, _weight in row:
+            self._pending_reverse.setdefault(target, set()).add(source)
+
+    def compact(self):
+        """
+        Folds all pending edges into freshly built forward and reverse CSR arrays.
+        """
+        rows = (self._row(node) for node in range(len(self._names)))
+        self._offsets, self._targets, self._edge_relations, self._weights = build_csr(
+            rows, len(self._names))
+
+        (self._rev_offsets, self._rev_sources, self._rev_relations,
+         self._rev_weights) = transpose_csr(self._offsets, self._targets, self._edge_relations, self._weights)
+
+        self._pending = {}
+        self._pending_reverse = {}
+
+    # --- Graph access ---
+
+    def _row(self, node: int):
+        """Returns the current outgoing (target ID, relation ID, weight) edges of `node`."""
+        row = self._pending.get(node)
+        if row is not None:
+            return row
+        if node + 1 >= len(self._offsets):
+            return ()
+        return zip(self._targets[self._offsets[node]:self._offsets[node + 1]],
+                   self._edge_relations[self._offsets[node]:self._offsets[node + 1]],
+                   self._weights[self._offsets[node]:self._offsets[node + 1]])
+
+    def _reverse_row(self, node: int):
+        """Returns the current incoming (source ID, relation ID, weight) edges of `node`."""
+        if node + 1 < len(self._rev_offsets):
+            start, end = self._rev_offsets[node], self._rev_offsets[node + 1]
+            for position in range(start, end):
+                source = self._rev_sources[position]
+                # Sources with pending edges are answered from the overlay below.
+                if source not in self._pending:
+                    yield source, self._rev_relations[position], self._rev_weights[position]
+        for source in self._pending_reverse.get(node, ()):
+            for target, relation, weight in self._pending[source]:
+                if target == node:
+                    yield source, relation, weight
+
+    def successors(self, concept: str):
+        node = self._ids.get(concept)
+        if node is None:
+            return
+        names, relations = self._names, self._relations
+        for target, relation, weight in self._row(node):
+            yield names[target], relations[relation], weight
+
+    def predecessors(self, concept: str):
+        node = self._ids.get(concept)
+        if node is None:
+            return
+        names, relations = self._names, self._relations
+        for source, relation, weight in self._reverse_row(node):
+            yield names[source], relations[relation], weight
+
+    def edge_count(self) -> int:
+        """Returns the number of directed edges currently stored."""
+        return len(self._targets) + sum(
+            len(row) - (self._offsets[node + 1] - self._offsets[node] if node + 1 < len(self._offsets) else 0)
+            for node, row in self._pending.items())
+
+    # --- Mapping interface ---
+
+    def __getitem__(self, concept: str) -> dict:
+        node = self._ids.get(concept)
+        if node is None or not self._stored[node]:
+            raise KeyError(concept)
+        connections = self._connections.get(node)
+        if connections is None:
+            names, relations = self._names, self._relations
+            connections = to_connections(
+                (names[target], relations[relation], weight) for target, relation, weight in self._row(node))
+        return {"data": self._data[node], "connections": connections}
+
+    def __contains__(self, concept) -> bool:
+        node = self._ids.get(concept)
+        return node is not None and bool(self._stored[node])
+
+    def __iter__(self):
+        for node, stored in enumerate(self._stored):
+            if stored:
+                yield self._names[node]
+
+    def __len__(self) -> int:
+        return self._stored_count
+
+
+def _rebuilds(connections: list, edges: list) -> bool:
+    """Tells whether `to_connections(edges)` gives back exactly `connections`."""
+    if len(connections) != len(edges):
+        return False
+    for connection, (_target, _relation, weight) in zip(connections, edges):
+        weighted = weight != DEFAULT_WEIGHT
+        if ("relation" not in connection or ("weight" in connection) != weighted
+                or len(connection) != 2 + weighted):
+            return False
+    return True
+
+
+def build_csr(rows, node_count: int) -> tuple:
+    """
+    Packs per-node edge rows into CSR arrays.
+
+    Args:
+        rows: An iterable yielding, for node IDs 0..node_count-1 in order, an
+              iterable of (neighbour ID, relation ID, weight) tuples.
+        node_count (int): The number of nodes.
+
+    Returns:
+        tuple: (offsets, neighbours, relations, weights) arrays.
+    """
+    offsets = array("q", [0])
+    neighbours = array("i")
+    relations = array("I")
+    weights = array("d")
+    for row in rows:
+        row = tuple(zip(*row))
+        if row:
+            neighbours.extend(row[0])
+            relations.extend(row[1])
+            weights.extend(row[2])
+        offsets.append(len(neighbours))
+    if len(offsets) != node_count + 1:
+        raise ValueError(f"Expected {node_count} rows, got {len(offsets) - 1}.")
+    return offsets, neighbours, relations, weights
+
+
+def transpose_csr(offsets, neighbours, relations, weights) -> tuple:
+    """
+    Builds the reverse CSR of a graph with a counting sort, without per-node lists.
+
+    Args:
+        offsets, neighbours, relations, weights: The forward CSR arrays.
+
+    Returns:
+        tuple: (offsets, sources, relations, weights) arrays of the reverse graph.
+    """
+    node_count = len(offsets) - 1
+    if np is not None:
+        return _transpose_csr_numpy(offsets, neighbours, relations, weights)
+
+    reverse_offsets = array("q", [0]) * (node_count + 1)
+    for target in neighbours:
+        reverse_offsets[target + 1] += 1
+    for node in range(node_count):
+        reverse_offsets[node + 1] += reverse_offsets[node]
+
+    cursor = array("q", reverse_offsets)
+    sources = array("i", [0]) * len(neighbours)
+    reverse_relations = array("I", [0]) * len(neighbours)
+    reverse_weights = array("d", [0.0]) * len(neighbours)
+    for source in range(node_count):
+        for position in range(offsets[source], offsets[source + 1]):
+            target = neighbours[position]
+            slot = cursor[target]
+            cursor[target] = slot + 1
+            sources[slot] = source
+            reverse_relations[slot] = relations[position]
+            reverse_weights[slot] = weights[position]
+    return reverse_offsets, sources, reverse_relations, reverse_weights
+
+
+def _transpose_csr_numpy(offsets, neighbours, relations, weights) -> tuple:
+    """The NumPy version of `transpose_csr`: a stable argsort instead of Python loops."""
+    node_count = len(offsets) - 1
+    forward_offsets = np.frombuffer(offsets, dtype=np.int64)
+    targets = np.frombuffer(neighbours, dtype=np.int32)
+    order = np.argsort(targets, kind="stable")
+    sources = np.repeat(np.arange(node_count, dtype=np.int32), np.diff(forward_offsets))[order]
+    reverse_offsets = np.zeros(node_count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(targets, minlength=node_count), out=reverse_offsets[1:])
+    return (
+        array("q", reverse_offsets.tobytes()),
+        array("i", sources.tobytes()),
+        array("I", np.frombuffer(relations, dtype=np.uint32)[order].tobytes()),
+        array("d", np.frombuffer(weights, dtype=np.float64)[order].tobytes()),
+    )
+
+
+BACKENDS = {
+    "in-memory": DictBackend,
+    "dict": DictBackend,
+    "compact": CompactBackend,
+}
+
+
+def create_backend(config: dict) -> StorageBackend:
+    """
+    Instantiates the storage backend named by the "backend" config setting.
+
+    Args:
+        config (dict): The DRS configuration. "backend" may be "in-memory"/"dict"
+                       (the default) or "compact"; "compaction_ratio" tunes the
+                       compact backend.
+
+    Returns:
+        StorageBackend: A new, empty backend.
+
+    Raises:
+        ValueError: If the backend name is unknown.
+    """
+    name = config.get("backend", "in-memory")
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown DRS backend '{name}'. Expected one of {sorted(BACKENDS)}.")
+    if BACKENDS[name] is CompactBackend and "compaction_ratio" in config:
+        return CompactBackend(compaction_ratio=config["compaction_ratio"])
+    return BACKENDS[name]()
@@ -0,0 +1,292 @@
+"""
+Vector embedding index for semantic concept lookup in the DRS.
+
+`DRSEngine.query` only answers exact concept keys, but the concepts the UNE
+pulls out of free text rarely match a stored key exactly. The VectorIndex keeps
+one unit-length embedding per concept and answers "which concepts are closest
+to this text or vector" by cosine similarity:
+
+- Below `ivf_threshold` concepts, search is exact: one matrix product of the
+  queries against every stored embedding.
+- Above it, an inverted-file (IVF) index is trained: embeddings are clustered
+  with k-means, and each query only scores the members of its `nprobe`
+  closest clusters. This trades a little recall for far less work per query.
+
+Concepts without an explicit embedding are embedded by HashingEmbedder, a
+deterministic bag of hashed words and character trigrams; no model is needed.
+
+This module requires NumPy, installed with the "vector" extra.
+"""
+
+import re
+import threading
+import zlib
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is an optional dependency, only needed for vector search.
+    np = None
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def concept_text(concept: str, data) -> str:
+    """Returns the text a concept is embedded from: its name and any string data."""
+    parts = [concept.replace("_", " ")]
+    if isinstance(data, dict):
+        parts.extend(value for value in data.values() if isinstance(value, str))
+    return " ".join(parts)
+
+
+class HashingEmbedder:
+    """
+    Embeds text by hashing its words and character trigrams into a fixed-size vector.
+    """
+
+    def __init__(self, dim: int = 256):
+        _require_numpy()
+        self.dim = dim
+
+    def embed(self, text: str):
+        """Returns the unit-length float32 embedding of `text`."""
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for token in _TOKEN.findall(text.lower()):
+            self._add(vector, token.encode("utf-8"), 2.0)
+            padded = f"#{token}#".encode("utf-8")
+            for start in range(len(padded) - 2):
+                self._add(vector, padded[start:start + 3], 1.0)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def embed_many(self, texts) -> "np.ndarray":
+        """Returns a (len(texts), dim) matrix of embeddings."""
+        return np.stack([self.embed(text) for text in texts]) if texts else np.zeros((0, self.dim), np.float32)
+
+    def _add(self, vector, feature: bytes, weight: float):
+        digest = zlib.crc32(feature)
+        vector[digest % self.dim] += weight if digest & 0x80000000 else -weight
+
+
+class VectorIndex:
+    """
+    Cosine-similarity top-k search over one embedding per concept.
+    """
+
+    def __init__(self, dim: int, ivf_threshold: int = 50000, nlist: int = None, nprobe: int = 8,
+                 seed: int = 0):
+        """
+        Initializes an empty index.
+
+        Args:
+            dim (int): The embedding dimension.
+            ivf_threshold (int): Switch from exact to IVF search at this many concepts.
+            nlist (int, optional): The number of IVF clusters (default ~sqrt(size)).
+            nprobe (int): How many clusters each IVF query scores.
+            seed (int): Seed for the k-means initialization.
+        """
+        _require_numpy()
+        self.dim = dim
+        self.ivf_threshold = ivf_threshold
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self._rng = np.random.default_rng(seed)
+
+        self._vectors = np.zeros((1024, dim), dtype=np.float32)
+        self._rows = {}       # concept -> row in _vectors
+        self._concepts = []   # row -> concept (None for a freed row)
+        self._free = []       # freed rows, reused before growing
+
+        self._centroids = None
+        self._assignment = {}  # row -> cluster
+        self._clusters = []    # cluster -> set of rows
+        self._cluster_arrays = {}  # cluster -> cached np.ndarray of its rows
+        self._cluster_arrays_mutex = threading.Lock()  # Concurrent searches fill the cache.
+        self._trained_size = 0
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def add(self, concept: str, vector):
+        """
+        Adds or replaces the embedding of a concept.
+
+        Raises:
+            ValueError: If the vector does not have the index's dimension.
+        """
+        vector = self.validate(concept, vector)
+        norm = np.linalg.norm(vector)
+        row = self._rows.get(concept)
+        if row is None:
+            row = self._allocate(concept)
+        self._vectors[row] = vector / norm if norm else vector
+        if self._centroids is not None:
+            self._assign(row, int(np.argmax(self._centroids @ self._vectors[row])))
+
+    def validate(self, concept: str, vector) -> "np.ndarray":
+        """
+        Checks that a vector can be added, without changing the index.
+
+        Returns:
+            np.ndarray: The vector, flattened to float32.
+
+        Raises:
+            ValueError: If the vector does not have the index's dimension.
+        """
+        vector = np.asarray(vector, dtype=np.float32).reshape(-1)
+        if vector.shape[0] != self.dim:
+            raise ValueError(f"Embedding for '{concept}' has dimension {vector.shape[0]}, expected {self.dim}.")
+        return vector
+
+    def remove(self, concept: str):
+        """Removes a concept's embedding, if present."""
+        row = self._rows.pop(concept, None)
+        if row is None:
+            return
+        self._concepts[row] = None
+        self._vectors[row] = 0.0
+        self._free.append(row)
+        self._unassign(row)
+
+    def needs_training(self) -> bool:
+        """
+        Tells whether the next IVF search would (re)train the index: it has
+        reached `ivf_threshold` and was never trained, or has doubled since.
+        """
+        return (len(self._rows) >= self.ivf_threshold
+                and (self._centroids is None or len(self._rows) > 2 * self._trained_size))
+
+    def search(self, queries, k: int = 5, exact: bool = False, train: bool = True) -> list:
+        """
+        Finds the `k` stored concepts most similar to each query vector.
+
+        Args:
+            queries: A single vector of shape (dim,) or a batch of shape (n, dim).
+            k (int): How many results to return per query.
+            exact (bool): Force exact search even when an IVF index is available.
+            train (bool): Train the IVF index first if it `needs_training`. With
+                          False, the search never changes the index's clusters,
+                          so it can share the index with concurrent searches; an
+                          untrained index is then searched exactly.
+
+        Returns:
+            list: For a single vector, a list of (concept, score) pairs sorted by
+                  descending similarity; for a batch, one such list per query.
+        """
+        matrix = np.asarray(queries, dtype=np.float32)
+        single = matrix.ndim == 1
+        matrix = np.atleast_2d(matrix)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix = matrix / np.where(norms == 0, 1, norms)
+
+        if not self._rows or k <= 0:
+            results = [[] for _ in matrix]
+        elif exact or len(self._rows) < self.ivf_threshold:
+            results = self._search_exact(matrix, k)
+        else:
+            if train and self.needs_training():
+                self.train()
+            results = self._search_ivf(matrix, k) if self._centroids is not None else self._search_exact(matrix, k)
+        return results[0] if single else results
+
+    def train(self, iterations: int = 10):
+        """
+        Clusters the stored embeddings with spherical k-means and builds the IVF lists.
+        """
+        live = np.fromiter(self._rows.values(), dtype=np.int64, count=len(self._rows))
+        nlist = self.nlist or max(1, int(np.sqrt(len(live))))
+        nlist = min(nlist, len(live))
+        sample = live if len(live) <= nlist * 64 else self._rng.choice(live, nlist * 64, replace=False)
+        points = self._vectors[sample]
+        centroids = points[self._rng.choice(len(points), nlist, replace=False)].copy()
+        for _ in range(iterations):
+            labels = np.argmax(points @ centroids.T, axis=1)
+            for cluster in range(nlist):
+                members = points[labels == cluster]
+                if len(members):
+                    centroid = members.sum(axis=0)
+                else:  # Re-seed empty clusters from a random point.
+                    centroid = points[self._rng.integers(len(points))]
+                norm = np.linalg.norm(centroid)
+                centroids[cluster] = centroid / norm if norm else centroid
+
+        self._centroids = centroids
+        self._clusters = [set() for _ in range(nlist)]
+        self._cluster_arrays = {}
+        self._assignment = {}
+        labels = np.argmax(self._vectors[live] @ centroids.T, axis=1)
+        for row, cluster in zip(live.tolist(), labels.tolist()):
+            self._assignment[row] = cluster
+            self._clusters[cluster].add(row)
+        self._trained_size = len(live)
+
+    def _search_exact(self, matrix, k: int) -> list:
+        scores = matrix @ self._vectors[:len(self._concepts)].T
+        # Freed rows are all zeros; push them below any real similarity.
+        for row in self._free:
+            scores[:, row] = -np.inf
+        return [self._top_k(row_scores, None, k) for row_scores in scores]
+
+    def _search_ivf(self, matrix, k: int) -> list:
+        nprobe = min(self.nprobe, len(self._centroids))
+        probes = np.argpartition(-(matrix @ self._centroids.T), nprobe - 1, axis=1)[:, :nprobe]
+        results = []
+        for query, clusters in zip(matrix, probes):
+            candidates = np.concatenate([self._cluster_rows(cluster) for cluster in clusters])
+            if not len(candidates):
+                results.append([])
+                continue
+            results.append(self._top_k(self._vectors[candidates] @ query, candidates, k))
+        return results
+
+    def _top_k(self, scores, rows, k: int) -> list:
+        k = min(k, len(scores))
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best])]
+        results = []
+        for position in best.tolist():
+            if scores[position] == -np.inf:
+                break
+            row = position if rows is None else int(rows[position])
+            results.append((self._concepts[row], float(scores[position])))
+        return results
+
+    def _cluster_rows(self, cluster: int):
+        rows = self._cluster_arrays.get(cluster)
+        if rows is None:
+            with self._cluster_arrays_mutex:
+                rows = self._cluster_arrays.get(cluster)
+                if rows is None:
+                    rows = self._cluster_arrays[cluster] = np.fromiter(
+                        self._clusters[cluster], dtype=np.int64, count=len(self._clusters[cluster]))
+        return rows
+
+    def _allocate(self, concept: str) -> int:
+        if self._free:
+            row = self._free.pop()
+            self._concepts[row] = concept
+        else:
+            row = len(self._concepts)
+            self._concepts.append(concept)
+            if row >= len(self._vectors):
+                grown = np.zeros((2 * len(self._vectors), self.dim), dtype=np.float32)
+                grown[:len(self._vectors)] = self._vectors
+                self._vectors = grown
+        self._rows[concept] = row
+        return row
+
+    def _assign(self, row: int, cluster: int):
+        self._unassign(row)
+        self._assignment[row] = cluster
+        self._clusters[cluster].add(row)
+        self._cluster_arrays.pop(cluster, None)
+
+    def _unassign(self, row: int):
+        cluster = self._assignment.pop(row, None)
+        if cluster is not None:
+            self._clusters[cluster].discard(row)
+            self._cluster_arrays.pop(cluster, None)
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError('The DRS vector index requires NumPy (pip install "neuralblitz[vector]").')
@@ -0,0 +1,194 @@
+"""
+Write-ahead log (WAL) for Dynamic Representational Substrate mutations.
+
+Every mutation of a durable DRSEngine is appended here before it is applied, so
+it survives a crash without rewriting the whole graph. Records are framed as
+
+    uint32 payload length | uint32 CRC32 of payload | JSON payload
+
+and buffered in memory until a group commit writes and fsyncs the whole batch
+at once. Commits happen when `group_commit_size` records are buffered, when
+`commit()` is called, and otherwise within `group_commit_interval` seconds: a
+background flusher commits whatever is buffered once per interval, so a record
+never waits for later appends to become durable. Many writes share the cost of
+a single fsync. On replay, a torn or corrupt tail (from a crash mid-write) ends
+the log; the records before it are intact.
+
+Periodically the engine writes a checkpoint (a snapshot of the whole graph)
+and `reset()`s the log, so replay at startup only covers recent writes.
+"""
+
+import json
+import os
+import struct
+import threading
+import time
+import zlib
+
+_FRAME = struct.Struct("<II")
+
+
+def read_wal(path: str):
+    """
+    Reads the intact records of a write-ahead log.
+
+    Args:
+        path (str): The log file. A missing file is an empty log.
+
+    Yields:
+        dict: The logged records, in order. Each has an "op" key naming the mutation.
+    """
+    for record, _end in _scan(path):
+        yield record
+
+
+class WriteAheadLog:
+    """
+    An append-only, group-committed log of DRS mutations.
+    """
+
+    def __init__(self, path: str, group_commit_size: int = 64,
+                 group_commit_interval: float = 0.05, sync: bool = True):
+        """
+        Opens (or creates) a log for appending, discarding any torn tail.
+
+        Args:
+            path (str): The log file.
+            group_commit_size (int): Commit once this many records are buffered.
+            group_commit_interval (float): The longest, in seconds, a buffered record
+                                           waits to be committed; a background
+                                           thread commits it if no append does.
+            sync (bool): Whether commits fsync the file. Disabling this trades crash
+                         durability for speed, e.g. in tests.
+        """
+        self.path = path
+        self.group_commit_size = group_commit_size
+        self.group_commit_interval = group_commit_interval
+        self.sync = sync
+
+        valid_end = 0
+        for _record, end in _scan(path):
+            valid_end = end
+        self._handle = open(path, "ab")
+        self._handle.truncate(valid_end)
+        self._buffer = []
+        self._last_commit = time.monotonic()
+        self._mutex = threading.Lock()  # Appends and the flusher share the buffer and file.
+        self._closing = threading.Event()
+        self.records_since_reset = 0
+        self.commits = 0
+        self._flusher = None
+        if group_commit_interval and group_commit_interval > 0:
+            self._flusher = threading.Thread(target=self._flush_periodically, name="drs-wal-flusher", daemon=True)
+            self._flusher.start()
+
+    def append(self, op: str, **fields):
+        """
+        Buffers one mutation record, committing the buffer if it is due.
+
+        Args:
+            op (str): The mutation name, e.g. "store".
+            **fields: The mutation's JSON-serializable arguments.
+
+        Raises:
+            TypeError: If a field cannot be serialized to JSON. Nothing is logged.
+        """
+        self._buffer_frames([_frame(op, fields)])
+
+    def append_many(self, records):
+        """
+        Buffers several mutation records, all or none of them.
+
+        Every record is encoded before any is buffered, so one that cannot be
+        serialized leaves the log as it was.
+
+        Args:
+            records: An iterable of (op, fields) pairs, as for `append`.
+
+        Raises:
+            TypeError: If a record cannot be serialized to JSON. Nothing is logged.
+        """
+        self._buffer_frames([_frame(op, fields) for op, fields in records])
+
+    def _buffer_frames(self, frames: list):
+        """Buffers encoded records, committing the buffer if it is due."""
+        with self._mutex:
+            self._buffer.extend(frames)
+            self.records_since_reset += len(frames)
+            if (len(self._buffer) >= self.group_commit_size
+                    or time.monotonic() - self._last_commit >= self.group_commit_interval):
+                self._commit()
+
+    def commit(self):
+        """
+        Writes all buffered records and makes them durable with a single fsync.
+        """
+        with self._mutex:
+            self._commit()
+
+    def _commit(self):
+        """Commits the buffer; the caller holds the mutex."""
+        if self._buffer:
+            self._handle.write(b"".join(self._buffer))
+            self._buffer.clear()
+            self._handle.flush()
+            if self.sync:
+                os.fsync(self._handle.fileno())
+            self.commits += 1
+        self._last_commit = time.monotonic()
+
+    def reset(self):
+        """
+        Empties the log, after its records have been captured by a checkpoint.
+        """
+        with self._mutex:
+            self._buffer.clear()
+            self._handle.truncate(0)
+            self._handle.flush()
+            if self.sync:
+                os.fsync(self._handle.fileno())
+            self.records_since_reset = 0
+
+    def close(self):
+        """Stops the flusher, commits any buffered records and closes the file."""
+        self._closing.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        with self._mutex:
+            if not self._handle.closed:
+                self._commit()
+                self._handle.close()
+
+    def _flush_periodically(self):
+        """The flusher thread: commits buffered records once per interval until closed."""
+        while not self._closing.wait(self.group_commit_interval):
+            with self._mutex:
+                if self._buffer and not self._handle.closed:
+                    self._commit()
+
+
+def _frame(op: str, fields: dict) -> bytes:
+    """Encodes one mutation record, framed for the log."""
+    payload = json.dumps({"op": op, **fields}, separators=(",", ":")).encode("utf-8")
+    return _FRAME.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def _scan(path: str):
+    """Yields (record, end offset) for each intact record, stopping at the first bad one."""
+    if not os.path.exists(path):
+        return
+    with open(path, "rb") as handle:
+        content = handle.read()
+    position = 0
+    while position + _FRAME.size <= len(content):
+        length, checksum = _FRAME.unpack_from(content, position)
+        start, end = position + _FRAME.size, position + _FRAME.size + length
+        payload = content[start:end]
+        if end > len(content) or zlib.crc32(payload) != checksum:
+            return
+        try:
+            record = json.loads(payload)
+        except ValueError:
+            return
+        yield record, end
+        position = end
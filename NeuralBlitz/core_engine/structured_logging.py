@@ -0,0 +1,179 @@
+"""
+Structured logging shared by every NeuralBlitz engine.
+
+Engines report what they do as events: a short name and some fields, e.g.
+`query concept=gravity`. They must be cheap to leave in hot paths, so:
+
+- Events go through the standard `logging` module under the "neuralblitz"
+  logger, and an event below the configured level costs one cached level check.
+  Per-call events are logged at DEBUG, so by default they cost next to nothing.
+- Noisy events can be sampled: with a rate of 0.01, about one call in a hundred
+  is logged. A sampled-out event is dropped before any record is built.
+- `configure_logging` installs a queue-based handler. Engines hand records to a
+  bounded in-memory queue, and a background thread formats and writes them. A
+  slow or contended output stream never blocks an engine. When the queue is
+  full, records are dropped and counted rather than waited on.
+
+Nothing is configured on import. Like any library, NeuralBlitz leaves handlers
+to the application, which calls `configure_logging` or sets up `logging` itself.
+"""
+
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+import threading
+import time
+
+ROOT = "neuralblitz"
+
+_sample_rates = {}  # "engine.event" or "engine" -> fraction of events kept
+_listener = None
+_handler = None
+_configure_mutex = threading.Lock()
+
+
+class EngineLogger:
+    """
+    Logs an engine's events, e.g. `get_logger("drs").debug("query", concept=name)`.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._logger = logging.getLogger(f"{ROOT}.{name}")
+
+    def debug(self, event: str, **fields):
+        self._log(logging.DEBUG, event, fields)
+
+    def info(self, event: str, **fields):
+        self._log(logging.INFO, event, fields)
+
+    def warning(self, event: str, **fields):
+        self._log(logging.WARNING, event, fields)
+
+    def error(self, event: str, **fields):
+        self._log(logging.ERROR, event, fields)
+
+    def _log(self, level: int, event: str, fields: dict):
+        if not self._logger.isEnabledFor(level):
+            return
+        if _sample_rates:
+            rate = _sample_rates.get(f"{self.name}.{event}", _sample_rates.get(self.name, 1.0))
+            if rate < 1.0 and random.random() >= rate:
+                return
+        self._logger.log(level, event, extra={"event": event, "fields": fields}, stacklevel=3)
+
+
+def get_logger(name: str) -> EngineLogger:
+    """Returns the event logger of an engine, e.g. "drs" or "sentiaguard"."""
+    return EngineLogger(name)
+
+
+class StructuredFormatter(logging.Formatter):
+    """
+    Formats event records as `time level logger event key=value ...`, or as one
+    JSON object per line.
+    """
+
+    def __init__(self, json_lines: bool = False):
+        super().__init__()
+        self.json_lines = json_lines
+
+    def format(self, record: logging.LogRecord) -> str:
+        event = getattr(record, "event", None) or record.getMessage()
+        fields = getattr(record, "fields", None) or {}
+        if self.json_lines:
+            return json.dumps({"time": record.created, "level": record.levelname, "logger": record.name,
+                               "event": event, **fields}, default=repr)
+        stamp = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(record.created))
+        pairs = " ".join(f"{key}={value!r}" for key, value in fields.items())
+        return f"{stamp}.{int(record.msecs):03d} {record.levelname} {record.name} {event} {pairs}".rstrip()
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """A QueueHandler that drops records when its queue is full instead of blocking."""
+
+    def __init__(self, queue_: queue.Queue):
+        super().__init__(queue_)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The listener formats records in this process, so they are queued as they are.
+        return record
+
+
+class _Listener(logging.handlers.QueueListener):
+    """A QueueListener whose stop waits for room in a full queue."""
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
+def configure_logging(level="INFO", sample_rates: dict = None, stream=None, json_lines: bool = False,
+                      queue_size: int = 10000) -> logging.Handler:
+    """
+    Sends NeuralBlitz events to a stream, through a non-blocking queue.
+
+    Replaces any configuration made by an earlier call.
+
+    Args:
+        level: The lowest level logged, e.g. "INFO", or "DEBUG" for per-call events.
+        sample_rates (dict, optional): Fractions of events to keep, keyed by
+                                       "engine.event" (e.g. "drs.query") or by
+                                       engine name.
+        stream: Where records are written; sys.stderr by default.
+        json_lines (bool): Write one JSON object per record.
+        queue_size (int): Records buffered for the writer thread; 0 writes
+                          synchronously on the engine's thread instead.
+
+    Returns:
+        logging.Handler: The handler attached to the "neuralblitz" logger. A
+                         DroppingQueueHandler counts dropped records in `dropped`.
+    """
+    global _listener, _handler
+    with _configure_mutex:
+        _stop()
+        output = logging.StreamHandler(stream if stream is not None else sys.stderr)
+        output.setFormatter(StructuredFormatter(json_lines))
+        if queue_size:
+            _handler = DroppingQueueHandler(queue.Queue(queue_size))
+            _listener = _Listener(_handler.queue, output)
+            _listener.start()
+        else:
+            _handler = output
+        _sample_rates.clear()
+        _sample_rates.update(sample_rates or {})
+        logger = logging.getLogger(ROOT)
+        logger.setLevel(level)
+        logger.addHandler(_handler)
+        logger.propagate = False
+        return _handler
+
+
+def stop_logging():
+    """Writes out queued records and removes the handler `configure_logging` installed."""
+    with _configure_mutex:
+        _stop()
+
+
+def _stop():
+    """Undoes `configure_logging`; the caller holds the configuration mutex."""
+    global _listener, _handler
+    if _handler is not None:
+        logger = logging.getLogger(ROOT)
+        logger.removeHandler(_handler)
+        logger.setLevel(logging.NOTSET)
+        logger.propagate = True
+        _handler = None
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    _sample_rates.clear()
@@ -0,0 +1,154 @@
+"""
+Concept extraction: finds the DRS concepts a prompt mentions.
+
+The DRS names its concepts like identifiers ("AI_Ethics", "symbiotic
+intelligence"), so a name can span several words of a prompt. A ConceptIndex
+normalises every name once into a token sequence and stores them all in a
+token trie. To extract concepts, a prompt is normalised and tokenized once
+in the same way. The trie is then walked from each token, taking the longest
+name that starts there ("leftmost-longest" matching).
+
+A walk stops after `max_ngram` tokens. So extraction costs at most
+`max_ngram` dictionary lookups per prompt token, however many concepts are
+indexed. Latency grows with the prompt's length, not with the vocabulary.
+Names can be added and removed one at a time, so the index can follow a
+changing DRS without being rebuilt.
+"""
+
+import re
+
+_TOKEN = re.compile(r"[^\W_]+")  # Runs of letters and digits; "_" separates words.
+_END = ""  # Trie key marking the end of a name; tokens are never empty.
+
+
+def tokenize(text: str) -> list:
+    """Normalises text (case-folded) and splits it into word tokens."""
+    return _TOKEN.findall(text.casefold())
+
+
+class ConceptIndex:
+    """
+    A token trie of concept names, for extracting concepts from text.
+    """
+
+    def __init__(self, concepts=(), max_ngram: int = 6):
+        """
+        Builds the index.
+
+        Args:
+            concepts: An iterable of concept IDs, e.g. a DRS's `concept_names()`.
+                      IDs that normalise to the same tokens ("AI_Ethics" and
+                      "ai ethics") are matched together.
+            max_ngram (int): The most tokens a matched name can have; longer
+                             names are not indexed.
+        """
+        if max_ngram < 1:
+            raise ValueError("max_ngram must be at least 1.")
+        self.max_ngram = max_ngram
+        self._root = {}
+        self._size = 0
+        for concept in concepts:
+            self.add(concept)
+
+    def add(self, concept: str) -> bool:
+        """
+        Indexes one concept ID.
+
+        Returns:
+            bool: False if the name has no tokens or more than `max_ngram`.
+        """
+        tokens = tokenize(concept)
+        if not tokens or len(tokens) > self.max_ngram:
+            return False
+        node = self._root
+        for token in tokens:
+            node = node.setdefault(token, {})
+        ids = node.setdefault(_END, [])
+        if concept not in ids:
+            ids.append(concept)
+            self._size += 1
+        return True
+
+    def remove(self, concept: str) -> bool:
+        """
+        Removes one concept ID from the index.
+
+        Returns:
+            bool: False if the ID was not indexed.
+        """
+        tokens = tokenize(concept)
+        path = [self._root]
+        for token in tokens:
+            node = path[-1].get(token)
+            if node is None:
+                return False
+            path.append(node)
+        ids = path[-1].get(_END)
+        if not tokens or not ids or concept not in ids:
+            return False
+        ids.remove(concept)
+        self._size -= 1
+        if not ids:
+            del path[-1][_END]
+        # Drop the nodes no other name passes through, deepest first.
+        for parent, token in zip(reversed(path[:-1]), reversed(tokens)):
+            if parent[token]:
+                break
+            del parent[token]
+        return True
+
+    def __len__(self) -> int:
+        return self._size
+
+    def matches(self, text: str) -> list:
+        """
+        Finds the concept names mentioned in a text, left to right.
+
+        Returns:
+            list: (start token, token count, concept IDs) for each match; matches
+                  do not overlap.
+        """
+        tokens = tokenize(text)
+        found = []
+        position, count = 0, len(tokens)
+        while position < count:
+            node, longest = self._root, None
+            end = min(count, position + self.max_ngram)
+            for cursor in range(position, end):
+                node = node.get(tokens[cursor])
+                if node is None:
+                    break
+                if _END in node:
+                    longest = (cursor + 1 - position, node[_END])
+            if longest is None:
+                position += 1
+                continue
+            found.append((position, *longest))
+            position += longest[0]
+        return found
+
+    def extract(self, text: str, limit: int = None) -> list:
+        """
+        Returns the concept IDs a text mentions, most salient first.
+
+        Longer names rank first, being more specific than the single words they
+        contain. Ties go to the concept mentioned more often, then to the
+        concept mentioned earlier.
+
+        Args:
+            text (str): The text, e.g. a user's intent.
+            limit (int, optional): The most IDs to return.
+
+        Returns:
+            list: Distinct concept IDs, ready for DRS lookups.
+        """
+        scores = {}  # concept -> [length, mentions, first position]
+        for position, length, concepts in self.matches(text):
+            for concept in concepts:
+                score = scores.get(concept)
+                if score is None:
+                    scores[concept] = [length, 1, position]
+                else:
+                    score[1] += 1
+        ranked = sorted(scores, key=lambda concept: (-scores[concept][0], -scores[concept][1], scores[concept][2]))
+        return ranked if limit is None else ranked[:limit]
@@ -0,0 +1,250 @@
+"""
+Focus-plan cache for the UNE.
+
+Many users send the same intent, or nearly the same ("explain symbiotic
+intelligence" and "please explain symbiotic intelligence"). A PlanCache lets
+`direct_focus` hand back the plan it already made, skipping planning and the
+Charter check. It has two tiers:
+
+- Exact: intents are normalised (case-folded, punctuation dropped, see
+  `concept_extractor.tokenize`) and hashed together with the parts of the
+  context that plans depend on.
+- Near-duplicate: each intent of at least `min_tokens` tokens also gets a
+  64-bit SimHash of its tokens. Similar token sets get fingerprints a few bits
+  apart, so a cached intent whose fingerprint is within `max_distance` bits is
+  a candidate. Fingerprints are split into `max_distance + 1` bands. Two
+  fingerprints that close must agree exactly on at least one band, so one
+  dictionary lookup per band finds every candidate.
+
+  On short intents SimHash is noisy: swapping two words can move a fingerprint
+  less than adding one. So a candidate is only reused if it names the same key
+  concepts, which the caller passes to `key`, and its tokens overlap the
+  intent's by at least `min_similarity` (Jaccard). Candidates are bucketed by
+  their key concepts, so only intents naming the same concepts are compared.
+
+A plan depends on the DRS and the Charter. Callers pass a version identifying
+both, and the first lookup under a new version drops every cached plan.
+"""
+
+import functools
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+from core_engine.une.concept_extractor import tokenize
+
+_BITS = 64
+_LANE = 32  # Bits per counter in a spread hash; see `_spread`.
+
+
+def _digest(value) -> bytes:
+    """Returns a 16-byte digest of a text or a JSON-serializable value."""
+    if not isinstance(value, str):
+        value = json.dumps(value, sort_keys=True, default=repr)
+    return hashlib.blake2b(value.encode("utf-8"), digest_size=16).digest()
+
+
+@functools.lru_cache(maxsize=65536)
+def _spread(token: str) -> int:
+    """
+    Returns a token's 64-bit hash with each bit moved into its own 32-bit lane,
+    so adding the spread hashes of many tokens counts, per bit, the tokens
+    that set it.
+    """
+    value = int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little")
+    return sum(1 << (bit * _LANE) for bit in range(_BITS) if value >> bit & 1)
+
+
+def simhash(tokens: list) -> int:
+    """
+    Returns the 64-bit SimHash of a token list: bit i is set when most tokens'
+    hashes set it.
+    """
+    counts = sum(map(_spread, tokens))
+    mask = (1 << _LANE) - 1
+    majority = len(tokens)
+    fingerprint = 0
+    for bit in range(_BITS):
+        if 2 * (counts >> (bit * _LANE) & mask) > majority:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+class PlanCache:
+    """
+    A thread-safe, size-bounded LRU cache of focus plans, with a near-duplicate tier.
+    """
+
+    def __init__(self, maxsize: int = 10000, max_distance: int = 8, min_tokens: int = 4,
+                 min_similarity: float = 0.75, context_keys: tuple = ()):
+        """
+        Args:
+            maxsize (int): The maximum number of plans kept.
+            max_distance (int): The most SimHash bits in which a near-duplicate
+                                intent may differ; 0 disables the tier.
+            min_tokens (int): The fewest tokens an intent needs for the
+                              near-duplicate tier; on shorter intents one word
+                              moves the fingerprint too far to tell.
+            min_similarity (float): The smallest Jaccard similarity between the
+                                    token sets of a near duplicate and the
+                                    intent whose plan it reuses.
+            context_keys (tuple): The context entries plans depend on; other
+                                  entries (e.g. a session ID) do not split the cache.
+        """
+        if not 0 <= max_distance < _BITS:
+            raise ValueError(f"max_distance must be between 0 and {_BITS - 1}.")
+        if not 0 < min_similarity <= 1:
+            raise ValueError("min_similarity must be above 0 and at most 1.")
+        self.maxsize = maxsize
+        self.max_distance = max_distance
+        self.min_tokens = min_tokens
+        self.min_similarity = min_similarity
+        self.context_keys = tuple(context_keys)
+        bands = max_distance + 1
+        self._bands = [(_BITS * band // bands, _BITS * (band + 1) // bands) for band in range(bands)]
+        self._entries = OrderedDict()  # (context digest, intent digest) -> (plan, near-duplicate key)
+        self._buckets = {}             # (context digest, concepts digest, band, band value) -> set of entry keys
+        self._version = None
+        self._counters = {"hits": 0, "near_hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+        self._mutex = threading.Lock()
+
+    def key(self, intent: str, context: dict = None, concepts: list = None) -> tuple:
+        """
+        Normalises an intent and its relevant context into a cache key, for
+        `get` and `put`.
+
+        Args:
+            intent (str): The intent.
+            context (dict, optional): The intent's context.
+            concepts (list, optional): The key concepts the intent's plan
+                                       focuses on; a near duplicate must
+                                       name the same ones.
+        """
+        tokens = tokenize(intent)
+        context = context or {}
+        context_digest = _digest({key: context.get(key) for key in self.context_keys})
+        near = None
+        if self.max_distance and len(tokens) >= self.min_tokens:
+            near = (simhash(tokens), _digest(concepts), frozenset(tokens))
+        return context_digest, _digest(" ".join(tokens)), near
+
+    def get(self, key: tuple, version) -> tuple:
+        """
+        Looks up the plan for an intent, exactly or as a near duplicate.
+
+        Args:
+            key (tuple): The intent's key, from `key`.
+            version: Anything hashable identifying what plans depend on.
+
+        Returns:
+            tuple: (True, a copy of the plan) on a hit, or (False, None) on a miss.
+        """
+        context_digest, intent_digest, near = key
+        with self._mutex:
+            self._switch(version)
+            entry_key = (context_digest, intent_digest)
+            entry = self._entries.get(entry_key)
+            if entry is not None:
+                self._counters["hits"] += 1
+            elif near is not None:
+                entry_key = self._nearest(context_digest, near)
+                if entry_key is not None:
+                    entry = self._entries[entry_key]
+                    self._counters["near_hits"] += 1
+            if entry is None:
+                self._counters["misses"] += 1
+                return False, None
+            self._entries.move_to_end(entry_key)
+            return True, _copy_plan(entry[0])
+
+    def put(self, key: tuple, version, plan: dict):
+        """Stores a plan; see `get` for the arguments."""
+        context_digest, intent_digest, near = key
+        entry_key = (context_digest, intent_digest)
+        with self._mutex:
+            self._switch(version)
+            if entry_key in self._entries:
+                self._remove(entry_key)
+            self._entries[entry_key] = (_copy_plan(plan), near)
+            if near is not None:
+                for bucket in self._bucket_keys(context_digest, near):
+                    self._buckets.setdefault(bucket, set()).add(entry_key)
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+                self._counters["evictions"] += 1
+
+    def invalidate(self):
+        """Drops every cached plan."""
+        with self._mutex:
+            self._drop()
+
+    def stats(self) -> dict:
+        """
+        Returns hit (exact and near-duplicate), miss, eviction and invalidation
+        counts, the size and the hit ratio.
+        """
+        with self._mutex:
+            stats = dict(self._counters, size=len(self._entries))
+        lookups = stats["hits"] + stats["near_hits"] + stats["misses"]
+        stats["hit_ratio"] = (stats["hits"] + stats["near_hits"]) / lookups if lookups else 0.0
+        return stats
+
+    def _nearest(self, context_digest: bytes, near: tuple) -> tuple | None:
+        """
+        Returns the closest cached entry within `max_distance` bits that names
+        the same key concepts and shares enough tokens, if any.
+        """
+        fingerprint, _concepts_digest, tokens = near
+        best, best_distance = None, self.max_distance + 1
+        for bucket in self._bucket_keys(context_digest, near):
+            for entry_key in self._buckets.get(bucket, ()):
+                candidate_fingerprint, _concepts_digest, candidate_tokens = self._entries[entry_key][1]
+                distance = bin(candidate_fingerprint ^ fingerprint).count("1")
+                if distance < best_distance and _jaccard(tokens, candidate_tokens) >= self.min_similarity:
+                    best, best_distance = entry_key, distance
+        return best
+
+    def _bucket_keys(self, context_digest: bytes, near: tuple) -> list:
+        fingerprint, concepts_digest, _tokens = near
+        return [(context_digest, concepts_digest, band, fingerprint >> low & ((1 << (high - low)) - 1))
+                for band, (low, high) in enumerate(self._bands)]
+
+    def _remove(self, entry_key: tuple):
+        """Removes one entry and its bucket memberships; the caller holds the mutex."""
+        _plan, near = self._entries.pop(entry_key)
+        if near is None:
+            return
+        for bucket in self._bucket_keys(entry_key[0], near):
+            members = self._buckets[bucket]
+            members.discard(entry_key)
+            if not members:
+                del self._buckets[bucket]
+
+    def _switch(self, version):
+        """Drops every entry if the version changed; the caller holds the mutex."""
+        if version != self._version:
+            self._drop()
+            self._version = version
+
+    def _drop(self):
+        self._counters["invalidations"] += len(self._entries)
+        self._entries.clear()
+        self._buckets.clear()
+
+
+def _jaccard(tokens: frozenset, other: frozenset) -> float:
+    """Returns the Jaccard similarity of two token sets."""
+    return len(tokens & other) / len(tokens | other)
+
+
+def _copy_plan(plan):
+    """
+    Copies a plan's dicts and lists at every depth, so callers cannot alter the
+    cached one. Plans are JSON-like, so this is copy.deepcopy without its memo.
+    """
+    if isinstance(plan, dict):
+        return {key: _copy_plan(value) for key, value in plan.items()}
+    if isinstance(plan, list):
+        return [_copy_plan(value) for value in plan]
+    return plan
@@ -0,0 +1,161 @@
+"""
+Relevance-scored pruning: the UNE's "Prune Irrelevance" step.
+
+The DRS region around an intent's key concepts (see `DRSEngine.focus_region`)
+is usually far bigger than what the intent needs, and every concept passed on
+is more text for SentiaGuard to scan and Conscientia to review. A
+RelevancePruner scores each candidate concept, and the path reaching it, on
+three signals, each in [0, 1]:
+
+- proximity: 1 / (1 + hops) from the nearest key concept;
+- strength: 1 / (1 + cost), the cost being the summed weight of the path, so
+  cheap (strong) connections score higher;
+- overlap: the Jaccard similarity between the candidate's words (its name and
+  string data) and the intent's.
+
+The score is their weighted mean. The budget is a number of concepts, or a
+number of tokens of concept text. The key concepts themselves (hops 0) are
+always kept, and their size is taken from the budget first. The other
+candidates are then taken best first, skipping any that no longer fit, so one
+large candidate does not crowd out smaller ones ranked below it. The rest are
+pruned.
+
+Word overlap needs each candidate's text tokenized, which is per-candidate
+Python work and the bulk of the cost; the other signals, the weighted sum and
+the ranking are NumPy array operations when NumPy is installed, and plain
+Python otherwise. The results are the same.
+"""
+
+import operator
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; it only vectorizes scoring and ranking.
+    np = None
+
+from core_engine.drs_engine.vector_index import concept_text
+from core_engine.une.concept_extractor import tokenize
+
+BUDGET_UNITS = ("nodes", "tokens")
+
+
+class RelevancePruner:
+    """
+    Ranks candidate DRS concepts for an intent and keeps the best within a budget.
+    """
+
+    def __init__(self, budget: int = 32, budget_unit: str = "nodes", proximity_weight: float = 1.0,
+                 strength_weight: float = 1.0, overlap_weight: float = 1.0):
+        """
+        Args:
+            budget (int): How much context is kept, in `budget_unit`s; None keeps
+                          every candidate, ranked.
+            budget_unit (str): "nodes" (concepts) or "tokens" (words of concept text).
+            proximity_weight (float): The weight of graph distance in the score.
+            strength_weight (float): The weight of path cost in the score.
+            overlap_weight (float): The weight of word overlap with the intent.
+
+        Raises:
+            ValueError: If the unit is unknown or the weights are negative or all zero.
+        """
+        if budget_unit not in BUDGET_UNITS:
+            raise ValueError(f"Unknown budget unit '{budget_unit}'; expected one of {BUDGET_UNITS}.")
+        weights = (proximity_weight, strength_weight, overlap_weight)
+        if min(weights) < 0 or not sum(weights):
+            raise ValueError("Relevance weights must be non-negative and not all zero.")
+        self.budget = budget
+        self.budget_unit = budget_unit
+        self.weights = tuple(weight / sum(weights) for weight in weights)
+
+    def score(self, intent: str, candidates: dict) -> list:
+        """
+        Scores candidate concepts for an intent.
+
+        Args:
+            intent (str): The user's intent.
+            candidates (dict): Candidates as `DRSEngine.focus_region` returns them:
+                               concept -> {"hops", "cost", "path", "data"}.
+
+        Returns:
+            list: One score per candidate, in the dict's order.
+        """
+        scores, _sizes = self._score(set(tokenize(intent)), candidates)
+        return [float(score) for score in scores]
+
+    def prune(self, intent: str, candidates: dict) -> tuple:
+        """
+        Keeps the key concepts and the most relevant other candidates that fit
+        the budget.
+
+        Args:
+            intent (str): The user's intent.
+            candidates (dict): Candidates as `DRSEngine.focus_region` returns them.
+
+        Returns:
+            tuple: (kept, pruned). `kept` lists {"concept", "score", "hops",
+                   "path", "tokens"} dicts, best first; `pruned` lists the IDs
+                   of the other candidates, best first.
+        """
+        concepts = list(candidates)
+        if not concepts:
+            return [], []
+        scores, sizes = self._score(set(tokenize(intent)), candidates)
+        if np is not None:
+            order = np.argsort(-scores, kind="stable").tolist()
+        else:
+            order = sorted(range(len(concepts)), key=lambda index: -scores[index])
+        keep = self._fit(order, [candidates[concept]["hops"] == 0 for concept in concepts], self._costs(sizes))
+        kept, pruned = [], []
+        for index in order:
+            if not keep[index]:
+                pruned.append(concepts[index])
+                continue
+            candidate = candidates[concepts[index]]
+            kept.append({"concept": concepts[index], "score": float(scores[index]), "hops": candidate["hops"],
+                         "path": list(candidate["path"]), "tokens": int(sizes[index])})
+        return kept, pruned
+
+    def _fit(self, order: list, key: list, units: list) -> list:
+        """
+        Returns, per candidate, whether it is kept: every key concept, then the
+        others in ranking order while they fit what the key concepts left.
+        """
+        if self.budget is None:
+            return [True] * len(order)
+        keep = list(key)
+        used = sum(unit for unit, is_key in zip(units, key) if is_key)
+        for index in order:
+            if not keep[index] and used + units[index] <= self.budget:
+                keep[index] = True
+                used += units[index]
+        return keep
+
+    def _score(self, intent_tokens: set, candidates: dict) -> tuple:
+        """Returns (scores, token counts) for the candidates, as arrays or lists."""
+        overlaps, sizes = [], []
+        for concept, candidate in candidates.items():
+            tokens = tokenize(concept_text(concept, candidate["data"]))
+            words = set(tokens)
+            # |words | intent| is |words| + |intent| - |shared|; only the
+            # intersection, iterated over the smaller intent set, is built.
+            shared = len(intent_tokens & words)
+            union = len(words) + len(intent_tokens) - shared
+            overlaps.append(shared / union if union else 0.0)
+            sizes.append(len(tokens))
+        proximity_weight, strength_weight, overlap_weight = self.weights
+        if np is not None:
+            count = len(candidates)
+            hops = np.fromiter(map(operator.itemgetter("hops"), candidates.values()), float, count)
+            costs = np.fromiter(map(operator.itemgetter("cost"), candidates.values()), float, count)
+            scores = (proximity_weight / (1.0 + hops) + strength_weight / (1.0 + costs)
+                      + overlap_weight * np.array(overlaps))
+            return scores, np.array(sizes)
+        scores = [proximity_weight / (1.0 + candidate["hops"]) + strength_weight / (1.0 + candidate["cost"])
+                  + overlap_weight * overlap for candidate, overlap in zip(candidates.values(), overlaps)]
+        return scores, sizes
+
+    def _costs(self, sizes):
+        """What each candidate takes from the budget, as a list."""
+        if self.budget_unit == "tokens":
+            return [int(size) for size in sizes]
+        return [1] * len(sizes)
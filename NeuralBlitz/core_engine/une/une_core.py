@@ -8,6 +8,16 @@ the most efficient path to a helpful and accurate outcome. It is the architect
 of the system's attention.
 """
 
+import threading
+
+from core_engine.structured_logging import get_logger
+from core_engine.une.concept_extractor import ConceptIndex
+from core_engine.une.plan_cache import PlanCache
+from core_engine.une.pruning import RelevancePruner
+
+logger = get_logger("une")
+
+
 class UniversalNeuralEngine:
     """
     Manages the cognitive focus and logical flow of the entire system.
@@ -17,8 +27,39 @@ class UniversalNeuralEngine:
         """
         Initializes the Universal Neural Engine.
 
+        Key concepts are the DRS concepts an intent names, found with a
+        ConceptIndex of the DRS's `concept_names()`. When the DRS's `version`
+        changes, the concepts stored since are added to the index (see
+        `DRSEngine.added_concepts`); it is only rebuilt if the DRS's contents
+        were replaced, or the DRS cannot report additions. A DRS without
+        `concept_names` falls back to picking the intent's longer words.
+
+        With "pruning" enabled, irrelevance is pruned with a RelevancePruner: the
+        DRS region around the key concepts (`focus_region`) is scored, and the
+        key concepts plus the best others within the budget become the plan's
+        "relevant_context"; the rest are listed in "pruned_info". A DRS with
+        `focus_regions` serves a whole batch's regions in one call; a DRS with
+        neither that nor `focus_region` gets a placeholder, as does every plan
+        without pruning.
+
+        With "plan_cache" enabled, plans are reused for repeated and
+        near-identical intents naming the same key concepts (see
+        `core_engine.une.plan_cache`), skipping planning and the Charter check,
+        until the DRS's or the Charter's `version` changes.
+
         Args:
-            config (dict): Configuration settings for the UNE.
+            config (dict): Configuration settings for the UNE. Recognised keys:
+                           "max_key_concepts" (the most concepts a plan focuses
+                           on; default unlimited) and "max_concept_ngram" (the
+                           most words in a matched concept name, default 6),
+                           "pruning" (True, or a dict of "hops" searched around
+                           the key concepts, default 2, "candidates" scored at
+                           most, default 1000, and RelevancePruner options such
+                           as "budget" and "budget_unit"; default disabled)
+                           and "plan_cache" (True, a dict of PlanCache options
+                           "maxsize", "max_distance", "min_tokens",
+                           "min_similarity" and "context_keys", or a
+                           PlanCache to share; default disabled).
             drs_engine: An instance of the Dynamic Representational Substrate
                         for memory and context access.
             charter_layer: An instance of the CharterLayer to ensure all
@@ -27,7 +68,20 @@ class UniversalNeuralEngine:
         self.config = config
         self.drs = drs_engine
         self.charter = charter_layer
-        print("Universal Neural Engine (UNE) Initialized.")
+        self._concept_index = None  # (DRS version, DRS cursor, ConceptIndex)
+        self._concept_index_mutex = threading.Lock()
+        pruning = config.get("pruning")
+        self._pruning = None
+        if pruning:
+            options = dict(pruning) if isinstance(pruning, dict) else {}
+            self._pruning = (options.pop("hops", 2), options.pop("candidates", 1000), RelevancePruner(**options))
+        self._plan_cache = None
+        if isinstance(config.get("plan_cache"), PlanCache):
+            self._plan_cache = config["plan_cache"]
+        elif config.get("plan_cache"):
+            options = config["plan_cache"] if isinstance(config["plan_cache"], dict) else {}
+            self._plan_cache = PlanCache(**options)
+        logger.info("initialized")
 
     def direct_focus(self, intent: str, context: dict) -> dict:
         """
@@ -55,29 +109,200 @@ class UniversalNeuralEngine:
                   the chosen logical path, and any pruned information for
                   other systems to execute.
         """
-        print(f"UNE: Directing focus for intent: '{intent}'")
+        logger.debug("direct_focus", intent_length=len(intent))
 
+        if self._plan_cache is not None:
+            version = self._plan_version()
+            key = self._plan_cache.key(intent, context, self._key_concepts(intent))
+            hit, focus_plan = self._plan_cache.get(key, version)
+            if hit:
+                return focus_plan
+
+        focus_plan = self._focus_plan(intent)
+
+        # 4. Ensure the plan aligns with the Charter.
+        if not self.charter.is_compliant("focus_plan"):
+             # In a real scenario, this would trigger a re-evaluation or halt.
+             logger.warning("focus_plan_not_compliant", intent_length=len(intent))
+
+        if self._plan_cache is not None:
+            self._plan_cache.put(key, version, focus_plan)
+        return focus_plan
+
+    def direct_focus_many(self, intents: list, context: dict) -> list:
+        """
+        Directs focus for a batch of intents, e.g. from HALIC's micro-batching
+        scheduler.
+
+        The plans are those `direct_focus` makes one at a time, but the DRS
+        regions around the intents' key concepts are fetched in one
+        `focus_regions` call, and the Charter check, which does not depend on
+        the intent, is made once per batch, and not at all when every plan
+        comes from the plan cache.
+
+        Args:
+            intents (list): The goals or queries to be processed.
+            context (dict): The context shared by the batch.
+
+        Returns:
+            list: One focus plan per intent, in order.
+        """
+        logger.debug("direct_focus_many", intents=len(intents))
+
+        if self._plan_cache is None:
+            focus_plans = self._focus_plans(intents)
+            planned = len(focus_plans)
+        else:
+            focus_plans, planned = self._cached_focus_plans(intents, context)
+
+        if planned and not self.charter.is_compliant("focus_plan"):
+            logger.warning("focus_plan_not_compliant", intents=planned)
+
+        return focus_plans
+
+    def cache_stats(self) -> dict | None:
+        """
+        Returns the plan cache's counters and hit ratio, or None if plan
+        caching is disabled.
+        """
+        return self._plan_cache.stats() if self._plan_cache is not None else None
+
+    def _focus_plan(self, intent: str) -> dict:
+        """Builds the focus plan for an intent; see `direct_focus`."""
+        return self._focus_plans([intent])[0]
+
+    def _focus_plans(self, intents: list) -> list:
+        """
+        Builds the focus plans for a batch of intents; see `direct_focus`. The
+        DRS regions around all of their key concepts are fetched in one call.
+        """
+        if not intents:
+            return []
         # --- Placeholder for future logic ---
-        # 1. Identify key concepts from the intent.
-        key_concepts = [word for word in intent.split() if len(word) > 4] # Simple placeholder
+        # 1. Identify key concepts from the intents.
+        key_concepts = [self._key_concepts(intent) for intent in intents]
 
         # 2. Determine the logical path (conceptual).
         logical_path = "Start -> Query DRS for concepts -> Synthesize -> Verify with Charter -> Format Response"
 
-        # 3. Prune irrelevant information (conceptual).
-        pruned_info = [" tangential_topic_A", " historical_data_B (not relevant)"]
+        # 3. Prune irrelevant information.
+        regions = self._focus_regions(key_concepts)
 
-        # 4. Ensure the plan aligns with the Charter.
-        if not self.charter.is_compliant("focus_plan"):
-             # In a real scenario, this would trigger a re-evaluation or halt.
-             print("Warning: Focus plan might violate Charter. Proceeding with caution.")
-
-        focus_plan = {
-            "key_concepts": key_concepts,
-            "logical_path": logical_path,
-            "pruned_info": pruned_info,
-            "status": "PLAN_GENERATED"
-        }
+        focus_plans = []
+        for intent, concepts, region in zip(intents, key_concepts, regions):
+            relevant_context, pruned_info = self._prune(intent, region)
+            focus_plan = {
+                "key_concepts": concepts,
+                "logical_path": logical_path,
+                "pruned_info": pruned_info,
+                "status": "PLAN_GENERATED"
+            }
+            if self._pruning is not None:
+                focus_plan["relevant_context"] = relevant_context
+            focus_plans.append(focus_plan)
         # --- End of placeholder logic ---
 
-        return focus_plan
+        return focus_plans
+
+    def _cached_focus_plans(self, intents: list, context: dict) -> tuple:
+        """
+        Builds a batch's plans through the plan cache, planning each distinct
+        uncached intent once.
+
+        Returns:
+            tuple: (the plans, in order, the number of intents planned).
+        """
+        version = self._plan_version()
+        keys = [self._plan_cache.key(intent, context, self._key_concepts(intent)) for intent in intents]
+        focus_plans = [None] * len(intents)
+        missed, repeats, seen = [], [], set()
+        for index, key in enumerate(keys):
+            if key[:2] in seen:  # Repeated within the batch: looked up after planning.
+                repeats.append(index)
+                continue
+            seen.add(key[:2])
+            hit, focus_plan = self._plan_cache.get(key, version)
+            if hit:
+                focus_plans[index] = focus_plan
+            else:
+                missed.append(index)
+        for index, focus_plan in zip(missed, self._focus_plans([intents[index] for index in missed])):
+            focus_plans[index] = focus_plan
+            self._plan_cache.put(keys[index], version, focus_plan)
+        for index in repeats:
+            hit, focus_plan = self._plan_cache.get(keys[index], version)
+            focus_plans[index] = focus_plan if hit else self._focus_plan(intents[index])
+        return focus_plans, len(missed)
+
+    def _plan_version(self) -> tuple:
+        """Identifies everything a plan depends on, for the plan cache."""
+        return getattr(self.drs, "version", None), getattr(self.charter, "version", None)
+
+    def _key_concepts(self, intent: str) -> list:
+        """Returns the IDs of the DRS concepts an intent names, most salient first."""
+        index = self._current_concept_index()
+        if index is None:
+            return [word for word in intent.split() if len(word) > 4] # Simple placeholder
+        return index.extract(intent, limit=self.config.get("max_key_concepts"))
+
+    def _current_concept_index(self) -> ConceptIndex | None:
+        """Returns the concept index, bringing it up to date if the DRS has changed."""
+        if getattr(self.drs, "concept_names", None) is None:
+            return None
+        version = getattr(self.drs, "version", None)
+        current = self._concept_index
+        if current is not None and current[0] == version:
+            return current[2]
+        with self._concept_index_mutex:
+            current = self._concept_index
+            if current is not None and current[0] == version:
+                return current[2]
+            # The version is read before the changes, so a concurrent change
+            # makes the next call look again rather than go unnoticed.
+            cursor, index = (current[1], current[2]) if current is not None else (None, None)
+            names = None
+            if getattr(self.drs, "added_concepts", None) is not None:
+                cursor, names = self.drs.added_concepts(cursor)
+            if index is not None and names is not None:
+                # Adding in place is safe alongside lookups; names only ever appear.
+                for name in names:
+                    index.add(name)
+                logger.debug("concept_index_extended", added=len(names), drs_version=version)
+            else:
+                index = ConceptIndex(self.drs.concept_names(), max_ngram=self.config.get("max_concept_ngram", 6))
+                logger.info("concept_index_built", concepts=len(index), drs_version=version)
+            self._concept_index = (version, cursor, index)
+        return index
+
+    def _focus_regions(self, key_concepts: list) -> list:
+        """
+        Returns the DRS region to prune for each intent's key concepts, or None
+        per intent when there is nothing to prune with.
+
+        Intents with the same key concepts share a region, and the distinct
+        regions come from one `focus_regions` call where the DRS has it.
+        """
+        if self._pruning is None:
+            return [None] * len(key_concepts)
+        hops, limit, _pruner = self._pruning
+        groups = list(dict.fromkeys(tuple(concepts) for concepts in key_concepts))
+        if getattr(self.drs, "focus_regions", None) is not None:
+            regions = self.drs.focus_regions([list(group) for group in groups], hops=hops, limit=limit)
+        elif getattr(self.drs, "focus_region", None) is not None:
+            regions = [self.drs.focus_region(list(group), hops=hops, limit=limit) for group in groups]
+        else:
+            return [None] * len(key_concepts)
+        by_group = dict(zip(groups, regions))
+        return [by_group[tuple(concepts)] for concepts in key_concepts]
+
+    def _prune(self, intent: str, region: dict | None) -> tuple:
+        """
+        Scores the DRS region around the key concepts and keeps what fits the budget.
+
+        Returns:
+            tuple: (relevant context, as RelevancePruner.prune keeps it, and
+                   the IDs of the pruned concepts).
+        """
+        if region is None:
+            return [], [" tangential_topic_A", " historical_data_B (not relevant)"] # Simple placeholder
+        return self._pruning[2].prune(intent, region)
@@ -0,0 +1,84 @@
+"""
+The async engine protocol used by HALIC's asyncio pipeline.
+
+`HALICEngine.process_interaction_async` calls its engines through `run_stage`.
+An engine that can work without blocking the event loop provides a coroutine
+method named after its synchronous one with an `_async` suffix, as described by
+the Protocol classes below, and is awaited directly. Any other engine is called
+synchronously in an executor thread, so existing engines work unchanged.
+
+Every stage can be given a timeout. A stage that overruns raises
+StageTimeoutError; a synchronous call already running in an executor thread
+cannot be interrupted and finishes in the background, its result discarded.
+"""
+
+import asyncio
+import functools
+from typing import Protocol, runtime_checkable
+
+
+@runtime_checkable
+class AsyncFocusEngine(Protocol):
+    """A UNE that plans without blocking the event loop."""
+
+    async def direct_focus_async(self, intent: str, context: dict) -> dict: ...
+
+
+@runtime_checkable
+class AsyncEthicsEngine(Protocol):
+    """A Conscientia engine that reviews without blocking the event loop."""
+
+    async def evaluate_ethical_implications_async(self, proposed_action: dict) -> dict: ...
+
+
+@runtime_checkable
+class AsyncScanEngine(Protocol):
+    """A SentiaGuard engine that scans without blocking the event loop."""
+
+    async def scan_output_async(self, response_text: str) -> dict: ...
+
+
+class StageTimeoutError(TimeoutError):
+    """Raised when a pipeline stage takes longer than its timeout."""
+
+    def __init__(self, stage: str, timeout: float):
+        super().__init__(f"HALIC stage '{stage}' timed out after {timeout} s.")
+        self.stage = stage
+        self.timeout = timeout
+
+
+async def run_stage(stage: str, engine, method: str, *args, executor=None, timeout: float = None):
+    """
+    Calls `engine.<method>(*args)` from a coroutine.
+
+    Args:
+        stage (str): The stage name, reported on timeout.
+        engine: The engine; its `<method>_async` coroutine is used if it has one.
+        method (str): The synchronous method's name.
+        *args: The method's arguments.
+        executor (concurrent.futures.Executor, optional): Where a synchronous
+                                                          method runs; the
+                                                          loop's default
+                                                          executor if None.
+        timeout (float, optional): Seconds before StageTimeoutError; None waits.
+
+    Returns:
+        The method's result.
+    """
+    native = getattr(engine, f"{method}_async", None)
+    if native is not None:
+        awaitable = native(*args)
+    else:
+        loop = asyncio.get_running_loop()
+        awaitable = loop.run_in_executor(executor, functools.partial(getattr(engine, method), *args))
+    return await run_with_timeout(stage, awaitable, timeout)
+
+
+async def run_with_timeout(stage: str, awaitable, timeout: float = None):
+    """Awaits `awaitable`, raising StageTimeoutError after `timeout` seconds."""
+    if timeout is None:
+        return await awaitable
+    try:
+        return await asyncio.wait_for(awaitable, timeout)
+    except asyncio.TimeoutError:
+        raise StageTimeoutError(stage, timeout) from None
@@ -0,0 +1,455 @@
+"""
+Append-only audit ledger of HALIC's GoldenDAG seals.
+
+Every response HALIC formats is sealed by a GoldenDAG hash, with a Trace ID and
+a Codex ID. The ledger keeps each seal as a fixed 72-byte record
+
+    float64 timestamp | 32-byte GoldenDAG | 16-byte Trace ID | 16-byte Codex ID
+
+and chains all of them into a Merkle tree, laid out as in RFC 6962 (leaf hash
+SHA-256(0x00 || record), node hash SHA-256(0x01 || left || right)). The root
+commits to every seal so far and their order. It can be published, and it
+proves nothing was changed or removed afterwards. For any one seal,
+`AuditLedger.prove` returns an inclusion proof of log2(n) hashes, checked by
+`verify_inclusion` without the rest of the ledger.
+
+Records are appended to binary segment files in a directory, one file per
+`segment_entries` records:
+
+    segment-000000.nbal: b"NBAUDIT" | uint8 format | uint64 first index | records...
+
+The ledger's tree head (size and root) is written atomically to HEAD on every
+commit. Seals can be appended in batches, which costs one write per batch.
+
+The verifier streams the segments, recomputing the root with O(log n) memory,
+and compares it with HEAD and with any published head:
+
+    python -m interface_layer.halic.audit_ledger LEDGER_DIR [--size N --root HEX]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import struct
+import sys
+import threading
+
+_MAGIC = b"NBAUDIT"
+_FORMAT = 1
+_HEADER = struct.Struct("<7sBQ")
+_RECORD = struct.Struct("<d32s16s16s")
+RECORD_SIZE = _RECORD.size
+_EMPTY_ROOT = hashlib.sha256(b"").digest()
+
+
+def leaf_hash(record: bytes) -> bytes:
+    """Returns the Merkle leaf hash of a packed seal record."""
+    return hashlib.sha256(b"\x00" + record).digest()
+
+
+def _node_hash(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(b"\x01" + left + right).digest()
+
+
+def pack_seal(golden_dag: str, trace_id: str, codex_id: str, timestamp: float) -> bytes:
+    """Packs a seal, given as hex digests, into its 72-byte record."""
+    return _RECORD.pack(timestamp, bytes.fromhex(golden_dag), bytes.fromhex(trace_id), bytes.fromhex(codex_id))
+
+
+def unpack_seal(record: bytes) -> dict:
+    """Unpacks a 72-byte record into its seal's fields, as hex digests."""
+    timestamp, golden_dag, trace_id, codex_id = _RECORD.unpack(record)
+    return {"golden_dag": golden_dag.hex(), "trace_id": trace_id.hex(), "codex_id": codex_id.hex(),
+            "timestamp": timestamp}
+
+
+def verify_inclusion(record: bytes, index: int, size: int, path: list, root: bytes) -> bool:
+    """
+    Checks an inclusion proof, as returned by `AuditLedger.prove`.
+
+    Args:
+        record (bytes): The packed seal record.
+        index (int): Its position in the ledger.
+        size (int): The number of seals the root covers.
+        path (list): The proof's sibling hashes, leaf level first.
+        root (bytes): The published root for `size` seals.
+
+    Returns:
+        bool: True if the record is the ledger's entry `index` under `root`.
+    """
+    if not 0 <= index < size:
+        return False
+    # RFC 9162, section 2.1.3.2.
+    node, last, digest = index, size - 1, leaf_hash(record)
+    for sibling in path:
+        if last == 0:
+            return False
+        if node & 1 or node == last:
+            digest = _node_hash(sibling, digest)
+            while not node & 1 and node:
+                node, last = node >> 1, last >> 1
+        else:
+            digest = _node_hash(digest, sibling)
+        node, last = node >> 1, last >> 1
+    return last == 0 and digest == root
+
+
+class AuditLedger:
+    """
+    An append-only Merkle log of GoldenDAG seals, stored in segment files.
+    """
+
+    def __init__(self, directory: str, segment_entries: int = 1_000_000, sync: bool = True):
+        """
+        Opens (or creates) a ledger, discarding a torn record left by a crash.
+
+        Args:
+            directory (str): The directory holding the segment files and HEAD.
+            segment_entries (int): Records per segment file. Must match the
+                                   value the ledger was created with.
+            sync (bool): Whether commits fsync the segment. Disabling this
+                         trades crash durability for speed, e.g. in tests.
+        """
+        self.directory = directory
+        self.segment_entries = segment_entries
+        self.sync = sync
+        self._mutex = threading.Lock()
+        # Level h holds the hashes of the complete, aligned subtrees of 2**h
+        # leaves, concatenated: 64 bytes per seal in all, for O(log n) proofs.
+        self._levels = [bytearray()]
+        self._file = None
+        os.makedirs(directory, exist_ok=True)
+        for path, _first in _segments(directory):
+            with open(path, "rb") as segment:
+                segment.seek(_HEADER.size)
+                for record in _read_records(segment):
+                    self._add_leaf(leaf_hash(record))
+        self._open_segment()
+
+    def __len__(self) -> int:
+        return len(self._levels[0]) // 32
+
+    def append(self, golden_dag: str, trace_id: str, codex_id: str, timestamp: float) -> int:
+        """
+        Appends one seal; see `append_many`.
+
+        Returns:
+            int: The seal's index in the ledger.
+        """
+        return self.append_many([(golden_dag, trace_id, codex_id, timestamp)])
+
+    def append_many(self, seals) -> int:
+        """
+        Appends a batch of seals with one write per segment touched.
+
+        Args:
+            seals: (golden_dag, trace_id, codex_id, timestamp) tuples, with the
+                   digests in hex as HALIC formats them.
+
+        Returns:
+            int: The index of the batch's first seal; the rest follow in order.
+        """
+        records = [pack_seal(*seal) for seal in seals]
+        with self._mutex:
+            first = len(self)
+            start = 0
+            while start < len(records):
+                room = self.segment_entries - len(self) % self.segment_entries
+                chunk = records[start:start + room]
+                self._file.write(b"".join(chunk))
+                for record in chunk:
+                    self._add_leaf(leaf_hash(record))
+                start += len(chunk)
+                if len(self) % self.segment_entries == 0:
+                    self._roll_segment()
+            self._file.flush()
+            return first
+
+    def commit(self):
+        """Makes the appended seals durable and records the tree head in HEAD."""
+        with self._mutex:
+            self._file.flush()
+            if self.sync:
+                os.fsync(self._file.fileno())
+            self._write_head()
+
+    def close(self):
+        """Commits and closes the ledger."""
+        self.commit()
+        with self._mutex:
+            self._file.close()
+
+    def root(self, size: int = None) -> bytes:
+        """
+        Returns the Merkle root over the first `size` seals (all by default).
+        """
+        with self._mutex:
+            size = len(self) if size is None else size
+            if not 0 <= size <= len(self):
+                raise ValueError(f"The ledger has {len(self)} seals, not {size}.")
+            return self._subtree(0, size) if size else _EMPTY_ROOT
+
+    def entry(self, index: int) -> bytes:
+        """Returns the packed record of seal `index`."""
+        if not 0 <= index < len(self):
+            raise IndexError(f"Seal {index} is not in the ledger of {len(self)} seals.")
+        with self._mutex:
+            self._file.flush()
+            number, offset = divmod(index, self.segment_entries)
+            with open(_segment_path(self.directory, number), "rb") as segment:
+                segment.seek(_HEADER.size + offset * RECORD_SIZE)
+                return segment.read(RECORD_SIZE)
+
+    def prove(self, index: int, size: int = None) -> dict:
+        """
+        Returns an inclusion proof for seal `index`.
+
+        Args:
+            index (int): The seal's position.
+            size (int, optional): The ledger size the proof is against, e.g.
+                                  that of a published root; the current size
+                                  by default.
+
+        Returns:
+            dict: "index", "size", "record", "path" (sibling hashes, leaf level
+                  first) and "root", the arguments of `verify_inclusion`.
+        """
+        record = self.entry(index)
+        with self._mutex:
+            size = len(self) if size is None else size
+            if not 0 <= index < size <= len(self):
+                raise IndexError(f"Seal {index} is not among the first {size} of {len(self)} seals.")
+            path = []
+            start, end = 0, size
+            # Descend from the root, collecting the sibling of each subtree
+            # holding the seal; reversed, they run from the leaf up.
+            while end - start > 1:
+                split = start + _largest_power_below(end - start)
+                if index < split:
+                    path.append(self._subtree(split, end))
+                    end = split
+                else:
+                    path.append(self._subtree(start, split))
+                    start = split
+            path.reverse()
+            return {"index": index, "size": size, "record": record, "path": path,
+                    "root": self._subtree(0, size)}
+
+    def _add_leaf(self, digest: bytes):
+        """Adds a leaf hash and every complete subtree it finishes."""
+        levels = self._levels
+        levels[0] += digest
+        height = 0
+        while (len(levels[height]) // 32) % 2 == 0:
+            if height + 1 == len(levels):
+                levels.append(bytearray())
+            levels[height + 1] += _node_hash(bytes(levels[height][-64:-32]), bytes(levels[height][-32:]))
+            height += 1
+
+    def _subtree(self, start: int, end: int) -> bytes:
+        """Returns the Merkle hash of leaves [start, end); `start` is aligned as RFC 6962 splits are."""
+        size = end - start
+        if size & (size - 1) == 0:
+            height = size.bit_length() - 1
+            position = (start >> height) * 32
+            return bytes(self._levels[height][position:position + 32])
+        split = start + _largest_power_below(size)
+        return _node_hash(self._subtree(start, split), self._subtree(split, end))
+
+    def _open_segment(self):
+        """Opens the segment the next seal goes to, truncating any torn record."""
+        number = len(self) // self.segment_entries
+        path = _segment_path(self.directory, number)
+        if not os.path.exists(path):
+            with open(path, "wb") as segment:
+                segment.write(_HEADER.pack(_MAGIC, _FORMAT, number * self.segment_entries))
+        self._file = open(path, "r+b")
+        self._file.truncate(_HEADER.size + (len(self) % self.segment_entries) * RECORD_SIZE)
+        self._file.seek(0, os.SEEK_END)
+
+    def _roll_segment(self):
+        """Closes the full segment and starts the next one."""
+        self._file.flush()
+        if self.sync:
+            os.fsync(self._file.fileno())
+        self._file.close()
+        self._open_segment()
+
+    def _write_head(self):
+        """Writes the current tree head to HEAD atomically; the caller holds the mutex."""
+        size = len(self)
+        head = {"size": size, "root": (self._subtree(0, size) if size else _EMPTY_ROOT).hex()}
+        path = os.path.join(self.directory, "HEAD")
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "w", encoding="utf-8") as handle:
+            json.dump(head, handle)
+            handle.flush()
+            if self.sync:
+                os.fsync(handle.fileno())
+        os.replace(temporary, path)
+
+
+def verify_ledger(directory: str, size: int = None, root: bytes = None) -> dict:
+    """
+    Recomputes a ledger's root from its segment files.
+
+    Args:
+        directory (str): The ledger directory.
+        size (int, optional): A published ledger size to check `root` against.
+        root (bytes, optional): The published root for `size` seals.
+
+    Returns:
+        dict: "size" and "root" (hex) as recomputed, "head_ok" (whether HEAD
+              matches the root at its size; None without HEAD), "published_ok"
+              (likewise for `size` and `root`) and "errors", a list of problems
+              found in the segment files.
+    """
+    head = _read_head(directory)
+    checkpoints = {}  # size -> expected root
+    if head is not None:
+        checkpoints.setdefault(head["size"], []).append(("head_ok", bytes.fromhex(head["root"])))
+    if size is not None:
+        checkpoints.setdefault(size, []).append(("published_ok", root))
+
+    result = {"head_ok": None, "published_ok": None, "errors": []}
+    frontier = []  # (height, hash) of complete subtrees, left to right
+
+    def check(count):
+        for key, expected in checkpoints.get(count, ()):
+            result[key] = _fold(frontier) == expected
+
+    check(0)
+    count = _fold_segments(directory, frontier, checkpoints, check, result["errors"])
+    for wanted, key in ((head and head["size"], "head_ok"), (size, "published_ok")):
+        if wanted is not None and wanted > count:
+            result[key] = False
+            result["errors"].append(f"The ledger has {count} seals, fewer than the {wanted} claimed.")
+    result["size"] = count
+    result["root"] = _fold(frontier).hex()
+    return result
+
+
+def _fold_segments(directory: str, frontier: list, checkpoints: dict, check, errors: list) -> int:
+    """
+    Streams every segment's seals, in order, into the Merkle `frontier`, calling
+    `check(count)` whenever the seal count reaches one of `checkpoints`. Stops at
+    the first segment that is out of sequence or not a ledger segment.
+
+    Returns:
+        int: The number of seals read.
+    """
+    count = 0
+    for path, first in _segments(directory):
+        name = os.path.basename(path)
+        if first != count:
+            errors.append(f"{name} starts at seal {first}, expected {count}.")
+            break
+        with open(path, "rb") as segment:
+            if not _has_segment_header(segment):
+                errors.append(f"{name} is not a format {_FORMAT} ledger segment.")
+                break
+            for record in _read_records(segment, errors, name):
+                _add_to_frontier(frontier, leaf_hash(record))
+                count += 1
+                if count in checkpoints:
+                    check(count)
+    return count
+
+
+def _has_segment_header(segment) -> bool:
+    """Reads a segment's header; returns whether it is a current-format ledger segment."""
+    header = segment.read(_HEADER.size)
+    if len(header) != _HEADER.size:
+        return False
+    magic, version, _first = _HEADER.unpack(header)
+    return magic == _MAGIC and version == _FORMAT
+
+
+def _read_head(directory: str) -> dict | None:
+    """Returns the tree head recorded in a ledger's HEAD file, or None without one."""
+    head_path = os.path.join(directory, "HEAD")
+    if not os.path.exists(head_path):
+        return None
+    with open(head_path, encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def _add_to_frontier(frontier: list, digest: bytes):
+    """Adds a leaf to the (height, hash) frontier, merging equal-height subtrees."""
+    height = 0
+    while frontier and frontier[-1][0] == height:
+        digest = _node_hash(frontier.pop()[1], digest)
+        height += 1
+    frontier.append((height, digest))
+
+
+def _fold(frontier: list) -> bytes:
+    """Returns the root of the tree whose complete subtrees are `frontier`."""
+    if not frontier:
+        return _EMPTY_ROOT
+    digest = frontier[-1][1]
+    for _height, left in reversed(frontier[:-1]):
+        digest = _node_hash(left, digest)
+    return digest
+
+
+def _largest_power_below(size: int) -> int:
+    """Returns the largest power of two strictly below `size` (> 1)."""
+    return 1 << ((size - 1).bit_length() - 1)
+
+
+def _segment_path(directory: str, number: int) -> str:
+    return os.path.join(directory, f"segment-{number:06d}.nbal")
+
+
+def _segments(directory: str) -> list:
+    """Returns (path, first seal index) for each segment file, in order."""
+    segments = []
+    for name in sorted(os.listdir(directory)):
+        if name.startswith("segment-") and name.endswith(".nbal"):
+            path = os.path.join(directory, name)
+            with open(path, "rb") as segment:
+                header = segment.read(_HEADER.size)
+            first = _HEADER.unpack(header)[2] if len(header) == _HEADER.size else -1
+            segments.append((path, first))
+    return segments
+
+
+def _read_records(segment, errors: list = None, name: str = None, chunk_records: int = 65536):
+    """Yields the whole records of an open segment, reading in large chunks."""
+    chunk_size = chunk_records * RECORD_SIZE
+    while True:
+        chunk = segment.read(chunk_size)
+        whole = len(chunk) - len(chunk) % RECORD_SIZE
+        for offset in range(0, whole, RECORD_SIZE):
+            yield chunk[offset:offset + RECORD_SIZE]
+        if len(chunk) < chunk_size:
+            if whole != len(chunk) and errors is not None:
+                errors.append(f"{name} ends with a torn record of {len(chunk) - whole} bytes.")
+            return
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Verify a HALIC audit ledger.")
+    parser.add_argument("directory", help="The ledger directory.")
+    parser.add_argument("--size", type=int, help="A published ledger size to check.")
+    parser.add_argument("--root", help="The published root for --size, in hex.")
+    args = parser.parse_args(argv)
+    if (args.size is None) != (args.root is None):
+        parser.error("--size and --root must be given together.")
+
+    result = verify_ledger(args.directory, args.size, bytes.fromhex(args.root) if args.root else None)
+    print(f"seals: {result['size']:,}")
+    print(f"root:  {result['root']}")
+    for key, label in (("head_ok", "HEAD"), ("published_ok", "published head")):
+        if result[key] is not None:
+            print(f"{label}: {'matches' if result[key] else 'DOES NOT MATCH'}")
+    for error in result["errors"]:
+        print(f"error: {error}", file=sys.stderr)
+    ok = not result["errors"] and result["head_ok"] is not False and result["published_ok"] is not False
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,200 @@
+"""
+Micro-batching in front of HALIC.
+
+Under load, many interactions arrive at nearly the same moment, and handling
+each on its own repeats every engine call per prompt. A MicroBatchScheduler
+queues concurrent `process_interaction` calls and hands them to
+`HALICEngine.process_many` in groups, so the UNE, Conscientia and SentiaGuard
+each see one batched call per group. Every caller still gets back its own
+verdict.
+
+Three knobs trade latency for throughput. A group is dispatched when it reaches
+`max_batch_size` prompts, or `max_wait` seconds after its first prompt arrived,
+whichever comes first. `dispatchers` sets how many groups can be in flight at
+once. The queue in front of the scheduler is bounded. When it
+is full, callers wait up to `submit_timeout` for room, and past that they are
+turned away with SchedulerFullError. This back-pressure lets an overloaded
+service shed load instead of queueing without limit.
+
+If `process_many` raises, the scheduler retries each prompt of that batch with
+`HALICEngine.process_interaction`, so a prompt that fails only fails its own
+caller.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from core_engine.structured_logging import get_logger
+
+logger = get_logger("halic")
+
+_STOP = object()
+
+
+class SchedulerFullError(RuntimeError):
+    """Raised when a prompt cannot be queued because the scheduler is saturated."""
+
+
+class MicroBatchScheduler:
+    """
+    Groups concurrent interactions into batches for a HALICEngine.
+    """
+
+    def __init__(self, halic_engine, max_batch_size: int = 64, max_wait: float = 0.005,
+                 queue_size: int = 1024, submit_timeout: float = None, dispatchers: int = 1):
+        """
+        Starts the scheduler's dispatch threads.
+
+        Args:
+            halic_engine: The HALICEngine that handles each batch.
+            max_batch_size (int): The largest batch dispatched at once.
+            max_wait (float): The longest a prompt waits, in seconds, for others
+                              to join its batch. 0 dispatches whatever is queued.
+            queue_size (int): The most prompts waiting to be dispatched.
+            submit_timeout (float, optional): How long `submit` waits for room in
+                                              a full queue; None waits forever,
+                                              0 rejects at once.
+            dispatchers (int): The number of batches handled concurrently.
+        """
+        if max_batch_size < 1 or queue_size < 1 or dispatchers < 1:
+            raise ValueError("max_batch_size, queue_size and dispatchers must be at least 1.")
+        self.halic = halic_engine
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.submit_timeout = submit_timeout
+        self._queue = queue.Queue(queue_size)
+        self._closed = False
+        self._submitting = 0  # Callers between the closed check and their put.
+        self._state = threading.Condition()
+        self._stats = {"submitted": 0, "rejected": 0, "dispatched": 0, "batches": 0, "largest_batch": 0}
+        self._stats_mutex = threading.Lock()
+        self._dispatchers = [threading.Thread(target=self._run, name=f"halic-micro-batcher-{number}", daemon=True)
+                             for number in range(dispatchers)]
+        for dispatcher in self._dispatchers:
+            dispatcher.start()
+
+    def submit(self, raw_prompt: str) -> Future:
+        """
+        Queues a prompt.
+
+        Returns:
+            Future: Resolves to the prompt's final verdict.
+
+        Raises:
+            SchedulerFullError: If the queue stayed full for `submit_timeout`.
+            RuntimeError: If the scheduler is closed.
+        """
+        future = Future()
+        with self._state:
+            if self._closed:
+                raise RuntimeError("The micro-batching scheduler is closed.")
+            self._submitting += 1
+        try:
+            self._queue.put((raw_prompt, future), timeout=self.submit_timeout)
+        except queue.Full:
+            with self._stats_mutex:
+                self._stats["rejected"] += 1
+            raise SchedulerFullError(
+                f"The HALIC queue has been full for {self.submit_timeout} s; try again later.") from None
+        finally:
+            with self._state:
+                self._submitting -= 1
+                self._state.notify_all()
+        with self._stats_mutex:
+            self._stats["submitted"] += 1
+        return future
+
+    def process_interaction(self, raw_prompt: str, timeout: float = None) -> dict:
+        """
+        Handles an interaction through the scheduler, like
+        `HALICEngine.process_interaction`.
+
+        Args:
+            raw_prompt (str): The raw text input from the user.
+            timeout (float, optional): Seconds to wait for the verdict once queued.
+
+        Returns:
+            A dictionary containing the final verdict from SentiaGuard.
+        """
+        return self.submit(raw_prompt).result(timeout)
+
+    def stats(self) -> dict:
+        """
+        Returns the prompts submitted, rejected and dispatched, the batches
+        dispatched, the largest and mean batch size, and the current queue depth.
+        """
+        with self._stats_mutex:
+            stats = dict(self._stats)
+        stats["mean_batch"] = stats["dispatched"] / stats["batches"] if stats["batches"] else 0.0
+        stats["queued"] = self._queue.qsize()
+        return stats
+
+    def close(self):
+        """Dispatches every queued prompt, then stops the dispatch threads."""
+        with self._state:
+            if self._closed:
+                return
+            self._closed = True
+            # Prompts being put now must be queued ahead of the stop marker.
+            self._state.wait_for(lambda: self._submitting == 0)
+        for _dispatcher in self._dispatchers:
+            self._queue.put(_STOP)  # Each dispatcher stops at the first marker it takes.
+        for dispatcher in self._dispatchers:
+            dispatcher.join()
+
+    def __enter__(self) -> "MicroBatchScheduler":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _run(self):
+        """Collects batches from the queue and dispatches them until closed."""
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._dispatch(batch)
+
+    def _dispatch(self, batch: list):
+        """
+        Runs one batch through HALIC and resolves its callers' futures, retrying
+        the prompts one at a time if the batch fails.
+        """
+        # Callers may have cancelled their futures while they were queued.
+        batch = [(raw_prompt, future) for raw_prompt, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        with self._stats_mutex:
+            self._stats["batches"] += 1
+            self._stats["dispatched"] += len(batch)
+            self._stats["largest_batch"] = max(self._stats["largest_batch"], len(batch))
+        try:
+            final_verdicts = self.halic.process_many([raw_prompt for raw_prompt, _future in batch])
+        except Exception as error:
+            # One bad prompt must not fail the others: retry each on its own,
+            # so every caller gets its own verdict or error.
+            logger.warning("batch_failed", prompts=len(batch), error=repr(error))
+            for raw_prompt, future in batch:
+                try:
+                    future.set_result(self.halic.process_interaction(raw_prompt))
+                except Exception as error:
+                    future.set_exception(error)
+            return
+        for (_raw_prompt, future), final_verdict in zip(batch, final_verdicts):
+            future.set_result(final_verdict)
@@ -7,27 +7,80 @@ calling the core engine, and formats the final output for clarity, coherence,
 and compliance with our transparency principles.
 """
 
+import asyncio
+import functools
 import hashlib
 import time
 
+from core_engine.structured_logging import get_logger
+from interface_layer.halic.async_protocol import run_stage, run_with_timeout
+
+logger = get_logger("halic")
+
+
+@functools.lru_cache(maxsize=4096)
+def _codex_id(logical_path: str) -> str:
+    """Returns the Codex ID of a plan's logical path; plans reuse a few paths."""
+    return hashlib.sha256(logical_path.encode()).hexdigest()[:32]
+
+
+# Stages of the interaction pipeline, the keys of the "stage_timeouts" setting.
+STAGES = ("review", "plan", "format", "scan")
+
+
 class HALICEngine:
     """
     Manages the end-to-end interaction flow.
     """
 
-    def __init__(self, config: dict, une_engine, sentiaguard_engine):
+    def __init__(self, config: dict, une_engine, sentiaguard_engine, conscientia_engine=None):
         """
         Initializes the HALIC Engine.
 
         Args:
-            config (dict): Configuration settings for the interface.
+            config (dict): Configuration settings for the interface. Recognised
+                           keys, used by `process_interaction_async`:
+                           "stage_timeouts" (seconds per stage, keyed by the
+                           names in STAGES), "executor" (where synchronous
+                           engine calls run; the event loop's default thread
+                           pool if unset) and "cpu_executor" (where response
+                           formatting and hashing run; "executor" if unset).
+                           "scan_workers" may only be 1: `process_many` scans
+                           each batch in this process, as a micro-batch costs
+                           far less to scan than a process pool, started anew
+                           by every `scan_many` call, costs to start.
+                           "audit_ledger" (an AuditLedger) records every response's GoldenDAG seal;
+                           the verdict then carries its "audit_index". HALIC
+                           commits the ledger (fsync and HEAD) after a batch of
+                           seals once "audit_commit_interval" seconds have
+                           passed since the last commit; the default, 0,
+                           commits after every batch. Seals appended since the
+                           last commit are lost in a crash, so with a longer
+                           interval the owner should `close()` the ledger on
+                           shutdown.
             une_engine: An instance of the UniversalNeuralEngine to direct focus.
             sentiaguard_engine: An instance of SentiaGuard for final safety scans.
+            conscientia_engine (optional): An instance of the ConscientiaEngine to
+                                           review each prompt; its report is added
+                                           to the verdict as "ethics_report".
         """
         self.config = config
         self.une = une_engine
         self.sentiaguard = sentiaguard_engine
-        print("Human-AI Language Interface Core (HALIC) Initialized.")
+        self.conscientia = conscientia_engine
+        self.audit_ledger = config.get("audit_ledger")
+        self._audit_commit_interval = config.get("audit_commit_interval", 0)
+        self._audit_committed_at = time.monotonic()
+        timeouts = config.get("stage_timeouts") or {}
+        unknown = set(timeouts) - set(STAGES)
+        if unknown:
+            raise ValueError(f"Unknown HALIC stages {sorted(unknown)} in stage_timeouts; expected {STAGES}.")
+        self._timeouts = timeouts
+        if config.get("scan_workers", 1) != 1:
+            raise ValueError("HALIC scans each batch in this process; scan_workers must be 1, "
+                             f"got {config['scan_workers']}. Use SentiaGuardEngine.scan_many directly "
+                             "to scan large batches with a process pool.")
+        logger.info("initialized")
 
     def process_interaction(self, raw_prompt: str) -> dict:
         """
@@ -39,27 +92,177 @@ class HALICEngine:
         Returns:
             A dictionary containing the final verdict from SentiaGuard.
         """
-        print(f"HALIC: Processing new prompt: '{raw_prompt}'")
+        logger.debug("process_interaction", prompt_length=len(raw_prompt))
 
         # 1. Parse intent from the raw prompt (simple placeholder).
-        intent = raw_prompt.strip()
+        intent = self._parse_intent(raw_prompt)
 
         # 2. Engage the core engine to get a logical plan/output.
         core_output = self.une.direct_focus(intent, context={})
 
-        # 3. Format the response for the user.
-        # This includes generating the unique, verifiable audit trail.
+        # 3. Format the response for the user, sealing it in the audit ledger.
+        [formatted_response], audit_indices = self._format_and_seal([intent], [core_output])
+
+        # 4. Perform the final safety scan with SentiaGuard.
+        final_verdict = self.sentiaguard.scan_output(formatted_response)
+        if audit_indices is not None:
+            final_verdict = dict(final_verdict, audit_index=audit_indices[0])
+
+        if self.conscientia is not None:
+            ethics_report = self.conscientia.evaluate_ethical_implications(self._review_action(intent))
+            final_verdict = dict(final_verdict, ethics_report=ethics_report)
+        return final_verdict
+
+    def process_many(self, raw_prompts: list) -> list:
+        """
+        Handles a batch of interactions, e.g. grouped by a MicroBatchScheduler.
+
+        Each stage is made once for the whole batch, through the engines' batch
+        methods where they have them (`direct_focus_many`, `evaluate_many`,
+        `scan_many`), and one at a time otherwise.
+
+        Args:
+            raw_prompts (list): The raw text inputs.
+
+        Returns:
+            list: The final verdict for each prompt, in order, as
+                  `process_interaction` returns it.
+        """
+        logger.debug("process_many", prompts=len(raw_prompts))
+        intents = [self._parse_intent(raw_prompt) for raw_prompt in raw_prompts]
+
+        direct_focus_many = getattr(self.une, "direct_focus_many", None)
+        if direct_focus_many is not None:
+            core_outputs = direct_focus_many(intents, context={})
+        else:
+            core_outputs = [self.une.direct_focus(intent, context={}) for intent in intents]
+
+        formatted_responses, audit_indices = self._format_and_seal(intents, core_outputs)
+
+        scan_many = getattr(self.sentiaguard, "scan_many", None)
+        if scan_many is not None:
+            final_verdicts = list(scan_many(formatted_responses, workers=1))
+        else:
+            final_verdicts = [self.sentiaguard.scan_output(response) for response in formatted_responses]
+        if audit_indices is not None:
+            final_verdicts = [dict(final_verdict, audit_index=audit_index)
+                              for final_verdict, audit_index in zip(final_verdicts, audit_indices)]
+
+        if self.conscientia is not None:
+            actions = [self._review_action(intent) for intent in intents]
+            evaluate_many = getattr(self.conscientia, "evaluate_many", None)
+            if evaluate_many is not None:
+                ethics_reports = evaluate_many(actions)
+            else:
+                ethics_reports = [self.conscientia.evaluate_ethical_implications(action) for action in actions]
+            final_verdicts = [dict(final_verdict, ethics_report=ethics_report)
+                              for final_verdict, ethics_report in zip(final_verdicts, ethics_reports)]
+        return final_verdicts
+
+    async def process_interaction_async(self, raw_prompt: str) -> dict:
+        """
+        Handles an interaction like `process_interaction`, from a coroutine.
+
+        Independent stages overlap: the Conscientia review of the prompt runs
+        alongside UNE planning and its DRS lookups. Engines implementing the
+        async protocol (see `interface_layer.halic.async_protocol`) are awaited;
+        other engine calls and the CPU-bound formatting run in executors, so
+        one event loop can serve thousands of concurrent interactions.
+
+        Args:
+            raw_prompt (str): The raw text input from the user.
+
+        Returns:
+            A dictionary containing the final verdict from SentiaGuard.
+
+        Raises:
+            StageTimeoutError: If a stage exceeds its configured timeout.
+        """
+        logger.debug("process_interaction", prompt_length=len(raw_prompt))
+        executor = self.config.get("executor")
+        cpu_executor = self.config.get("cpu_executor", executor)
+        timeouts = self._timeouts
+
+        intent = self._parse_intent(raw_prompt)
+        review = None
+        if self.conscientia is not None:
+            review = asyncio.ensure_future(run_stage(
+                "review", self.conscientia, "evaluate_ethical_implications", self._review_action(intent),
+                executor=executor, timeout=timeouts.get("review")))
+        try:
+            core_output = await run_stage("plan", self.une, "direct_focus", intent, {},
+                                          executor=executor, timeout=timeouts.get("plan"))
+            loop = asyncio.get_running_loop()
+            [formatted_response], audit_indices = await run_with_timeout(
+                "format", loop.run_in_executor(cpu_executor, self._format_and_seal, [intent], [core_output]),
+                timeouts.get("format"))
+            final_verdict = await run_stage("scan", self.sentiaguard, "scan_output", formatted_response,
+                                            executor=executor, timeout=timeouts.get("scan"))
+            if audit_indices is not None:
+                final_verdict = dict(final_verdict, audit_index=audit_indices[0])
+            if review is not None:
+                final_verdict = dict(final_verdict, ethics_report=await review)
+        finally:
+            if review is not None and not review.done():
+                review.cancel()
+        return final_verdict
+
+    def _parse_intent(self, raw_prompt: str) -> str:
+        """Extracts the intent from a raw prompt (simple placeholder)."""
+        return raw_prompt.strip()
+
+    def _review_action(self, intent: str) -> dict:
+        """Describes a prompt as an action for the Conscientia review."""
+        return {"type": "user_prompt", "content": intent}
+
+    def _format_and_seal(self, intents: list, core_outputs: list) -> tuple:
+        """
+        Formats a batch of responses and appends their seals to the audit
+        ledger in one write, committing it when "audit_commit_interval" is due.
+
+        Returns:
+            tuple: (formatted responses, their ledger indices or None without
+                   a ledger).
+        """
+        formatted = [self._format_response(intent, core_output)
+                     for intent, core_output in zip(intents, core_outputs)]
+        responses = [response for response, _seal in formatted]
+        if self.audit_ledger is None:
+            return responses, None
+        first = self.audit_ledger.append_many([seal for _response, seal in formatted])
+        now = time.monotonic()
+        if now - self._audit_committed_at >= self._audit_commit_interval:
+            self.audit_ledger.commit()
+            self._audit_committed_at = now
+        return responses, list(range(first, first + len(formatted)))
+
+    def _format_response(self, intent: str, core_output: dict) -> tuple:
+        """
+        Formats the response for the user, including the unique, verifiable
+        audit trail.
+
+        Returns:
+            tuple: (formatted response, seal), the seal being the (golden_dag,
+                   trace_id, codex_id, timestamp) an AuditLedger records.
+        """
         # --- Placeholder for a more sophisticated response formatter ---
         response_body = f"This is a helpful response based on the concepts: {core_output.get('key_concepts')}."
         
         # --- Generate the verifiable audit trail ---
+        # The trace ID and the GoldenDAG both start with the prompt, so it is
+        # hashed once and the digest state copied, with no joined temporaries.
         timestamp = str(time.time())
-        trace_id = hashlib.sha256(f"{intent}{timestamp}".encode()).hexdigest()[:32]
-        codex_id = hashlib.sha256(f"{core_output.get('logical_path')}".encode()).hexdigest()[:32]
+        prompt_hash = hashlib.sha256(intent.encode())
+        trace_hash = prompt_hash.copy()
+        trace_hash.update(timestamp.encode())
+        trace_id = trace_hash.hexdigest()[:32]
+        codex_id = _codex_id(f"{core_output.get('logical_path')}")
         
         # The GoldenDAG seals the entire interaction: prompt -> trace -> response.
-        golden_dag_input = f"{intent}{trace_id}{response_body}".encode()
-        golden_dag = hashlib.sha256(golden_dag_input).hexdigest()
+        golden_dag_hash = prompt_hash
+        golden_dag_hash.update(trace_id.encode())
+        golden_dag_hash.update(response_body.encode())
+        golden_dag = golden_dag_hash.hexdigest()
 
         formatted_response = (
             f"{response_body}\n\n"
@@ -69,8 +272,4 @@ class HALICEngine:
             f"**Codex ID:** `C-RUNTIME-RESPONSE-{codex_id}`"
         )
         # --- End of formatting ---
-
-        # 4. Perform the final safety scan with SentiaGuard.
-        final_verdict = self.sentiaguard.scan_output(formatted_response)
-
-        return final_verdict
+        return formatted_response, (golden_dag, trace_id, codex_id, float(timestamp))
@@ -14,6 +14,9 @@ setup(
     description="The Symbiotic Intelligence Framework",
     author="[Your Name]", # Or NuralNexus, etc.
     packages=find_packages(),
+    extras_require={
+        "vector": ["numpy"],  # The DRS vector index (query_similar).
+    },
     classifiers=[
         "Programming Language :: Python :: 3",
         "Operating System :: OS Independent",
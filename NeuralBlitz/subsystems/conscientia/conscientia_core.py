@@ -7,6 +7,16 @@ response, checking for bias, fairness, and adherence to the spirit of the
 Charter, not just the letter.
 """
 
+import threading
+import time
+
+from core_engine.structured_logging import get_logger
+from subsystems.conscientia.detectors import SEVERITIES, ActionBatch, registered_detectors
+from subsystems.verdict_cache import resolve_verdict_cache
+
+logger = get_logger("conscientia")
+
+
 class ConscientiaEngine:
     """
     Provides nuanced ethical analysis and perspective balancing.
@@ -17,13 +27,33 @@ class ConscientiaEngine:
         Initializes the Conscientia Engine.
 
         Args:
-            config (dict): Configuration settings for the engine.
+            config (dict): Configuration settings for the engine. Recognised keys:
+                           "verdict_cache" (a VerdictCache, or True for the
+                           process-wide one shared with SentiaGuard; see
+                           `subsystems.verdict_cache`), "detectors" (the names
+                           of the registered risk detectors to run, or Detector
+                           objects; all registered ones by default, see
+                           `subsystems.conscientia.detectors`) and
+                           "decisive_status" ("WARN" or "FAIL", the default: once
+                           an action reaches it, costlier detectors skip it).
             charter_layer: A direct link to the CharterLayer to access the
                            foundational ethical axioms.
         """
         self.config = config
         self.charter = charter_layer
-        print("Conscientia Engine (Ethical Reasoning) Initialized.")
+        self._verdict_cache = resolve_verdict_cache(config.get("verdict_cache"))
+        self.detectors = registered_detectors(config.get("detectors"))
+        decisive = config.get("decisive_status", "FAIL")
+        if decisive not in SEVERITIES[1:]:
+            raise ValueError(f"decisive_status must be one of {SEVERITIES[1:]}, not {decisive!r}.")
+        self._decisive_rank = SEVERITIES.index(decisive)
+        # Reports depend on the detectors run, their order and where they stop,
+        # so engines configured differently never share cached reports.
+        self._report_config = (tuple(detector.name for detector in self.detectors), self._decisive_rank)
+        self._detector_stats = {detector.name: {"actions": 0, "flagged": 0, "skipped": 0, "seconds": 0.0}
+                                for detector in self.detectors}
+        self._stats_mutex = threading.Lock()
+        logger.info("initialized", detectors=[detector.name for detector in self.detectors])
 
     def evaluate_ethical_implications(self, proposed_action: dict) -> dict:
         """
@@ -50,30 +80,122 @@ class ConscientiaEngine:
             dict: An "ethics report" detailing the compliance status, risks,
                   and mitigation suggestions.
         """
-        print(f"Conscientia: Evaluating action '{proposed_action.get('type')}'...")
-
-        # --- Placeholder for future ethical reasoning logic ---
-        risks = []
-        suggestions = []
-        status = "PASS" # Default to passing
-
-        # Placeholder: Simulate finding a potential bias risk.
-        if "stereotype" in proposed_action.get("content", "").lower():
-            status = "WARN"
-            risks.append("Potential use of a common stereotype.")
-            suggestions.append("Rephrase to focus on individual characteristics, not group assumptions.")
-        
-        # Placeholder: Simulate checking for a missing perspective.
-        if proposed_action.get("num_perspectives", 1) < 2:
-            # This is a soft warning, not a failure.
-            risks.append("Response is single-perspective. Could benefit from including alternative viewpoints.")
-
-        # --- End of placeholder logic ---
-
-        ethics_report = {
-            "compliance_status": status,
-            "risks_identified": risks,
-            "mitigation_suggestions": suggestions
-        }
-
-        return ethics_report
+        logger.debug("evaluate", action_type=proposed_action.get("type"))
+
+        if self._verdict_cache is None:
+            return self._evaluate(proposed_action)
+        # Identical actions get identical reports until the Charter or the
+        # detector configuration changes.
+        version = self._cache_version()
+        hit, report = self._verdict_cache.get("conscientia", version, proposed_action)
+        if not hit:
+            report = self._evaluate(proposed_action)
+            self._verdict_cache.put("conscientia", version, proposed_action, report)
+        return {key: list(value) if isinstance(value, list) else value for key, value in report.items()}
+
+    def evaluate_many(self, proposed_actions: list) -> list:
+        """
+        Evaluates a batch of proposed actions at once.
+
+        Every detector judges the whole batch in one vectorized pass, which is
+        much cheaper than one `evaluate_ethical_implications` call per action.
+
+        Args:
+            proposed_actions (list): The action dicts to evaluate.
+
+        Returns:
+            list: One ethics report per action, in order, exactly as
+                  `evaluate_ethical_implications` would return it.
+        """
+        logger.debug("evaluate_many", actions=len(proposed_actions))
+
+        if self._verdict_cache is None:
+            return self._evaluate_many(proposed_actions)
+        version = self._cache_version()
+        reports = [None] * len(proposed_actions)
+        missed = []
+        for index, action in enumerate(proposed_actions):
+            hit, report = self._verdict_cache.get("conscientia", version, action)
+            if hit:
+                reports[index] = report
+            else:
+                missed.append(index)
+        if missed:
+            evaluated = self._evaluate_many([proposed_actions[index] for index in missed])
+            for index, report in zip(missed, evaluated):
+                self._verdict_cache.put("conscientia", version, proposed_actions[index], report)
+                reports[index] = report
+        return [{key: list(value) if isinstance(value, list) else value for key, value in report.items()}
+                for report in reports]
+
+    def _cache_version(self) -> tuple:
+        """Identifies everything a cached report depends on."""
+        return getattr(self.charter, "version", None), self._report_config
+
+    def cache_stats(self) -> dict | None:
+        """
+        Returns the verdict cache's counters and hit ratios (shared with any
+        other engine using the same cache), or None if caching is disabled.
+        """
+        return self._verdict_cache.stats() if self._verdict_cache is not None else None
+
+    def detector_stats(self) -> dict:
+        """
+        Returns, per detector in the order they run, how many actions it
+        judged, flagged and skipped, the time it took, and its mean cost per
+        judged action in microseconds.
+        """
+        with self._stats_mutex:
+            stats = {name: dict(counters) for name, counters in self._detector_stats.items()}
+        for counters in stats.values():
+            counters["mean_us"] = counters["seconds"] * 1e6 / counters["actions"] if counters["actions"] else 0.0
+        return stats
+
+    def _evaluate(self, proposed_action: dict) -> dict:
+        """Runs the ethical checks on an action; see `evaluate_ethical_implications`."""
+        return self._evaluate_many([proposed_action])[0]
+
+    def _evaluate_many(self, actions: list) -> list:
+        """
+        Runs the detectors over a batch of actions, cheapest first, and
+        assembles their reports. An action stops being passed to further
+        detectors once its status reaches the decisive status.
+        """
+        batch = ActionBatch(actions)
+        ranks = [0] * len(actions)  # Index into SEVERITIES of each action's status so far.
+        flagged = [[] for _ in actions]
+        pending = list(range(len(actions)))
+        for detector in self.detectors:
+            started = time.perf_counter()
+            flags = detector.flags(batch) if pending else ()
+            elapsed = time.perf_counter() - started
+
+            rank = SEVERITIES.index(detector.severity)
+            undecided = []
+            for index, flag in zip(pending, flags):
+                if flag:
+                    flagged[index].append(detector)
+                    ranks[index] = max(ranks[index], rank)
+                if ranks[index] < self._decisive_rank:
+                    undecided.append(index)
+            with self._stats_mutex:
+                counters = self._detector_stats[detector.name]
+                counters["actions"] += len(pending)
+                counters["flagged"] += sum(1 for flag in flags if flag)
+                counters["skipped"] += len(actions) - len(pending)
+                counters["seconds"] += elapsed
+            if len(undecided) < len(pending):
+                # The batch holds the pending actions; keep the undecided ones.
+                positions = {index: position for position, index in enumerate(pending)}
+                batch = batch.subset([positions[index] for index in undecided])
+            pending = undecided
+
+        reports = []
+        for rank, detectors in zip(ranks, flagged):
+            reports.append({
+                "compliance_status": SEVERITIES[rank] if rank else "PASS",
+                "risks_identified": [detector.risk for detector in detectors],
+                "mitigation_suggestions": [detector.suggestion for detector in detectors
+                                           if detector.suggestion is not None]
+            })
+        return reports
@@ -0,0 +1,198 @@
+"""
+Risk detectors for the Conscientia Engine.
+
+Each detector looks for one kind of ethical risk and judges a whole batch of
+proposed actions at once. The batch is held column by column (an ActionBatch):
+numeric features become one array per feature, compared in a single vectorized
+operation (NumPy when available), and text is matched against precompiled
+lexicons in one pass over all actions' content joined together.
+
+Detectors are plugins, registered by name with `register_detector`. Each one
+declares a severity, the compliance status it imposes when it flags an action
+("NOTE" only records the risk, then "WARN", then "FAIL"), and an estimated
+relative cost. The Conscientia Engine runs the cheapest detectors first and
+skips the remaining ones for actions whose outcome is already decided, so deep
+analyses can be added without slowing down actions a cheap check settles.
+"""
+
+import bisect
+import itertools
+import re
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; numeric features fall back to lists.
+    np = None
+
+# Severities from least to most serious; a flag with one of the last two sets
+# the report's compliance status to it.
+SEVERITIES = ("NOTE", "WARN", "FAIL")
+
+# Joins the actions' content for one regex pass; never part of a lexicon term.
+_SEPARATOR = "\x00"
+
+
+class ActionBatch:
+    """
+    A columnar view of a list of proposed actions.
+    """
+
+    def __init__(self, actions: list):
+        self.actions = actions
+        self._columns = {}
+
+    def __len__(self) -> int:
+        return len(self.actions)
+
+    def subset(self, indices: list) -> "ActionBatch":
+        """Returns a batch of only the actions at `indices`."""
+        return ActionBatch([self.actions[index] for index in indices])
+
+    def text(self, field: str = "content") -> tuple:
+        """
+        Returns all actions' `field` joined by a separator, and the offset at
+        which each action's text starts.
+        """
+        key = ("text", field)
+        if key not in self._columns:
+            texts = [str(action.get(field, "")) for action in self.actions]
+            starts = list(itertools.accumulate((len(text) + 1 for text in texts), initial=0))[:-1]
+            self._columns[key] = (_SEPARATOR.join(texts), starts)
+        return self._columns[key]
+
+    def numeric(self, field: str, default: float):
+        """Returns `field` for every action as one array (a list without NumPy)."""
+        key = ("numeric", field, default)
+        if key not in self._columns:
+            values = (action.get(field, default) for action in self.actions)
+            self._columns[key] = (np.fromiter(values, dtype=np.float64, count=len(self.actions))
+                                  if np is not None else [float(value) for value in values])
+        return self._columns[key]
+
+
+class Lexicon:
+    """
+    A precompiled, case-insensitive set of terms, matched as substrings.
+    """
+
+    def __init__(self, terms):
+        terms = sorted(set(terms), key=len, reverse=True)
+        if not terms or any(not term or _SEPARATOR in term for term in terms):
+            raise ValueError("A lexicon needs at least one non-empty term.")
+        self.terms = terms
+        self._pattern = re.compile("|".join(map(re.escape, terms)), re.IGNORECASE)
+
+    def contains(self, batch: ActionBatch, field: str = "content") -> list:
+        """Returns, for each action, whether its `field` contains any term."""
+        text, starts = batch.text(field)
+        found = [False] * len(batch)
+        for match in self._pattern.finditer(text):
+            found[bisect.bisect_right(starts, match.start()) - 1] = True
+        return found
+
+
+class Detector:
+    """
+    A risk detector: flags the actions of a batch that carry one risk.
+
+    Attributes:
+        name (str): The registry name.
+        risk (str): The risk reported for a flagged action.
+        suggestion (str, optional): The mitigation suggested for it.
+        severity (str): One of SEVERITIES: the compliance status a flag
+                        imposes, or "NOTE" to only record the risk.
+        cost (float): The estimated cost per action, relative to the built-in
+                      detectors' 1.0. Cheaper detectors run first.
+    """
+
+    def __init__(self, name: str, risk: str, suggestion: str = None, severity: str = "WARN",
+                 cost: float = 1.0):
+        if severity not in SEVERITIES:
+            raise ValueError(f"Detector '{name}' has severity {severity!r}; expected one of {SEVERITIES}.")
+        self.name = name
+        self.risk = risk
+        self.suggestion = suggestion
+        self.severity = severity
+        self.cost = cost
+
+    def flags(self, batch: ActionBatch) -> list:
+        """Returns one truth value per action in the batch."""
+        raise NotImplementedError
+
+
+class LexiconDetector(Detector):
+    """Flags actions whose text contains any term of a lexicon."""
+
+    def __init__(self, name: str, terms, risk: str, suggestion: str = None, severity: str = "WARN",
+                 cost: float = 1.0, field: str = "content"):
+        super().__init__(name, risk, suggestion, severity, cost)
+        self.lexicon = Lexicon(terms)
+        self.field = field
+
+    def flags(self, batch: ActionBatch) -> list:
+        return self.lexicon.contains(batch, self.field)
+
+
+class ThresholdDetector(Detector):
+    """Flags actions whose numeric feature is below a minimum."""
+
+    def __init__(self, name: str, field: str, minimum: float, default: float, risk: str,
+                 suggestion: str = None, severity: str = "WARN", cost: float = 1.0):
+        super().__init__(name, risk, suggestion, severity, cost)
+        self.field = field
+        self.minimum = minimum
+        self.default = default
+
+    def flags(self, batch: ActionBatch) -> list:
+        values = batch.numeric(self.field, self.default)
+        if np is not None:
+            return (values < self.minimum).tolist()
+        return [value < self.minimum for value in values]
+
+
+_REGISTRY = {}
+
+
+def register_detector(detector: Detector):
+    """Adds a detector to the registry, replacing any with the same name."""
+    _REGISTRY[detector.name] = detector
+
+
+def registered_detectors(names: list = None) -> list:
+    """
+    Returns registered detectors, cheapest first; detectors of equal cost keep
+    their registration order (or their order in `names`).
+
+    Args:
+        names (list, optional): Only these detectors. Entries may also be
+                                unregistered Detector objects, used as given.
+
+    Raises:
+        KeyError: If a name is not registered.
+    """
+    if names is None:
+        names = list(_REGISTRY)
+    missing = [name for name in names if not isinstance(name, Detector) and name not in _REGISTRY]
+    if missing:
+        raise KeyError(f"Unknown Conscientia detectors {missing}; registered: {list(_REGISTRY)}.")
+    detectors = [name if isinstance(name, Detector) else _REGISTRY[name] for name in names]
+    return sorted(detectors, key=lambda detector: detector.cost)
+
+
+# Placeholder: Simulate finding a potential bias risk.
+register_detector(LexiconDetector(
+    "stereotype",
+    ["stereotype"],
+    risk="Potential use of a common stereotype.",
+    suggestion="Rephrase to focus on individual characteristics, not group assumptions.",
+))
+# Placeholder: Simulate checking for a missing perspective. This is a soft
+# warning, not a failure.
+register_detector(ThresholdDetector(
+    "single_perspective",
+    field="num_perspectives",
+    minimum=2,
+    default=1,
+    risk="Response is single-perspective. Could benefit from including alternative viewpoints.",
+    severity="NOTE",
+))
@@ -0,0 +1,437 @@
+"""
+Compiled multi-pattern matching for SentiaGuard rules.
+
+Checking every rule with its own `in` test or `str.replace` costs one pass over
+the response per rule. The CompiledRuleset instead folds every forbidden phrase
+and every sensitive pattern into a single Aho-Corasick automaton, and finds all
+of their occurrences in one left-to-right pass, however many rules there are:
+
+- Scanning stops at the first forbidden phrase, since the response is blocked.
+- Sensitive patterns are redacted leftmost-longest over the original text (the
+  earliest match wins, then the longest one starting there), and the redacted
+  response is assembled once from slices, not copied once per rule.
+- Sensitive regular expressions are combined into one alternation and found in
+  one more pass; their matches compete with the literal ones under the same
+  leftmost-longest rule.
+
+Responses can also be scanned while they are generated: `CompiledRuleset.stream`
+returns a StreamScanner that is fed text chunks, carries the automaton state
+across chunk boundaries, and releases every prefix that no future text can
+turn into a match.
+
+The automaton is stored compactly: all transitions live in one dict keyed by
+`state << 21 | code point`, which needs about half the memory of one dict per
+state, so rulesets of 100,000 phrases stay practical. `CompiledRuleset.to_bytes`
+saves the tables as data only (a JSON header and packed integer arrays), so a
+compiled ruleset can be stored and loaded back without recompiling it.
+"""
+
+import json
+import re
+import sys
+from array import array
+from collections import deque
+
+_CODE_BITS = 21  # Enough for every Unicode code point.
+_MAGIC = b"NBRS"
+_GLOBAL_FLAGS = re.compile(r"\(\?([aiLmsux]+)\)")
+_RESERVED_GROUP = re.compile(r"_\d+")
+
+
+class CompiledRuleset:
+    """
+    A single automaton matching every block and redact rule at once.
+    """
+
+    def __init__(self, forbidden_phrases=(), sensitive_patterns: dict = None,
+                 sensitive_regexes: dict = None):
+        """
+        Compiles a ruleset.
+
+        Args:
+            forbidden_phrases: Phrases that block a response wherever they occur.
+            sensitive_patterns (dict, optional): Maps each pattern to redact to its
+                                                 replacement text.
+            sensitive_regexes (dict, optional): Maps regular expressions to redact
+                                                to their replacement text. They are
+                                                combined into one alternation, so
+                                                they must not use numbered
+                                                backreferences or group names
+                                                of the form "_N". Leading
+                                                global flags such as "(?i)" are
+                                                scoped to their own regex.
+
+        Raises:
+            ValueError: If a phrase or pattern is empty, or a regex is invalid
+                        or cannot be combined with the others.
+        """
+        self._goto = {}        # state << 21 | code point -> next state
+        self._fail = [0]       # state -> state of its longest proper suffix
+        self._block = [None]   # state -> a forbidden phrase ending here, if any
+        self._redact = [None]  # state -> (length, replacement) of the pattern ending exactly here
+        self._redact_next = [0]  # state -> the nearest suffix state ending a redact pattern
+        self._depth = [0]      # state -> length of the text it stands for
+        self.rule_count = 0
+        self.version = None    # Set by `rules.compile_rules` to the hash of the rules.
+
+        for phrase in forbidden_phrases:
+            self._block[self._insert(phrase)] = phrase
+        for pattern, replacement in (sensitive_patterns or {}).items():
+            self._redact[self._insert(pattern)] = (len(pattern), replacement)
+        self._link()
+        self._root = {key: state for key, state in self._goto.items() if key >> _CODE_BITS == 0}
+
+        self._regex, self._regex_replacements = None, {}
+        if sensitive_regexes:
+            alternatives = []
+            for index, (regex, replacement) in enumerate(sensitive_regexes.items()):
+                alternatives.append(f"(?P<_{index}>{_scope_flags(regex)})")
+                self._regex_replacements[f"_{index}"] = replacement
+            try:
+                self._regex = re.compile("|".join(alternatives))
+            except re.error as error:
+                raise ValueError(f"The sensitive regexes cannot be combined: {error}") from None
+            self.rule_count += len(alternatives)
+
+    @classmethod
+    def from_rules(cls, rules: dict) -> "CompiledRuleset":
+        """
+        Compiles a rules dict with "FORBIDDEN_PHRASES", "SENSITIVE_PATTERNS" and
+        "SENSITIVE_REGEXES" keys, each optional.
+        """
+        return cls(rules.get("FORBIDDEN_PHRASES", ()), rules.get("SENSITIVE_PATTERNS", {}),
+                   rules.get("SENSITIVE_REGEXES", {}))
+
+    @property
+    def state_count(self) -> int:
+        """The number of automaton states."""
+        return len(self._fail)
+
+    def to_bytes(self) -> bytes:
+        """
+        Serializes the compiled tables for `from_bytes`.
+
+        The result is a JSON header (rules, replacements, the regex source) and
+        the transition, failure and depth tables as arrays of 64-bit integers.
+        """
+        header = {
+            "version": self.version,
+            "rule_count": self.rule_count,
+            "states": self.state_count,
+            "transitions": len(self._goto),
+            "byteorder": sys.byteorder,
+            "block": [[state, phrase] for state, phrase in enumerate(self._block) if phrase is not None],
+            "redact": [[state, *entry] for state, entry in enumerate(self._redact) if entry is not None],
+            "regex": self._regex.pattern if self._regex is not None else None,
+            "regex_replacements": self._regex_replacements,
+        }
+        encoded = json.dumps(header, ensure_ascii=False).encode("utf-8")
+        tables = (self._goto.keys(), self._goto.values(), self._fail, self._redact_next, self._depth)
+        return b"".join([_MAGIC, len(encoded).to_bytes(4, "little"), encoded,
+                         *(array("q", table).tobytes() for table in tables)])
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "CompiledRuleset":
+        """
+        Loads a ruleset saved by `to_bytes`. Loading only parses data; it never
+        runs code from `data`.
+
+        Raises:
+            ValueError: If `data` is not a complete serialized ruleset.
+        """
+        if data[:len(_MAGIC)] != _MAGIC:
+            raise ValueError("Not a serialized SentiaGuard ruleset.")
+        start = len(_MAGIC) + 4
+        length = int.from_bytes(data[len(_MAGIC):start], "little")
+        try:
+            header = json.loads(data[start:start + length])
+            counts = [header["transitions"]] * 2 + [header["states"]] * 3
+            tables = _read_tables(data, start + length, counts, header["byteorder"])
+
+            ruleset = cls()
+            keys, targets, fail, redact_next, depth = tables
+            ruleset._goto = dict(zip(keys, targets))
+            ruleset._fail, ruleset._redact_next, ruleset._depth = fail.tolist(), redact_next.tolist(), depth.tolist()
+            ruleset._block = [None] * header["states"]
+            for state, phrase in header["block"]:
+                ruleset._block[state] = phrase
+            ruleset._redact = [None] * header["states"]
+            for state, pattern_length, replacement in header["redact"]:
+                ruleset._redact[state] = (pattern_length, replacement)
+            ruleset._root = {key: state for key, state in ruleset._goto.items() if key >> _CODE_BITS == 0}
+            if header["regex"] is not None:
+                ruleset._regex = re.compile(header["regex"])
+                ruleset._regex_replacements = dict(header["regex_replacements"])
+            ruleset.rule_count, ruleset.version = header["rule_count"], header["version"]
+        except (KeyError, TypeError, IndexError, re.error) as error:
+            raise ValueError(f"The serialized ruleset is malformed: {error}") from None
+        return ruleset
+
+    def scan(self, text: str) -> tuple:
+        """
+        Matches every rule against `text` in one pass.
+
+        Args:
+            text (str): The text to scan.
+
+        Returns:
+            tuple: (phrase, redacted_text, redactions). If a forbidden phrase
+                   occurs, `phrase` is the first one found and the other fields
+                   are None and 0. Otherwise `phrase` is None, `redacted_text` has
+                   every sensitive pattern replaced and `redactions` counts them.
+        """
+        matches = []
+        _state, phrase = self._advance(0, text, 0, matches)
+        if phrase is not None:
+            return phrase, None, 0
+        self._find_regexes(text, 0, len(text), matches)
+        redacted, _cursor, redactions = _apply(text, 0, matches, len(text))
+        return None, redacted, redactions
+
+    def stream(self, regex_window: int = 256) -> "StreamScanner":
+        """
+        Starts scanning a response that arrives in chunks; see StreamScanner.
+
+        Args:
+            regex_window (int): The longest match any sensitive regex can make.
+                                The last `regex_window` characters are held back
+                                until more text (or the end) shows how they match.
+        """
+        return StreamScanner(self, regex_window)
+
+    def _advance(self, state: int, text: str, offset: int, matches: list) -> tuple:
+        """
+        Runs the automaton over `text`, which starts at `offset` in the response.
+
+        Every redact match found is appended to `matches` as (start, -length,
+        replacement), with `start` relative to the response.
+
+        Returns:
+            tuple: (state, phrase): the state after the text, and the forbidden
+                   phrase that stopped the scan, if any.
+        """
+        goto, fail, root = self._goto, self._fail, self._root
+        block, redact, redact_next = self._block, self._redact, self._redact_next
+        for position, code in enumerate(map(ord, text), offset + 1):
+            while state:
+                next_state = goto.get(state << _CODE_BITS | code)
+                if next_state is not None:
+                    state = next_state
+                    break
+                state = fail[state]
+            else:
+                state = root.get(code, 0)
+            if block[state] is not None:
+                return state, block[state]
+            match = state if redact[state] is not None else redact_next[state]
+            while match:
+                length, replacement = redact[match]
+                matches.append((position - length, -length, replacement))
+                match = redact_next[match]
+        return state, None
+
+    def _find_regexes(self, text: str, offset: int, before: int, matches: list):
+        """Appends the regex matches starting before `before` (response-relative)."""
+        if self._regex is None:
+            return
+        for found in self._regex.finditer(text):
+            start, end = found.start() + offset, found.end() + offset
+            if start >= before:
+                break
+            if end > start:
+                matches.append((start, start - end, self._regex_replacements[found.lastgroup]))
+
+    def _insert(self, pattern: str) -> int:
+        """Adds a pattern to the trie and returns its final state."""
+        if not pattern:
+            raise ValueError("SentiaGuard rules cannot contain an empty pattern.")
+        self.rule_count += 1
+        goto = self._goto
+        state = 0
+        for code in map(ord, pattern):
+            key = state << _CODE_BITS | code
+            next_state = goto.get(key)
+            if next_state is None:
+                next_state = goto[key] = len(self._fail)
+                self._fail.append(0)
+                self._block.append(None)
+                self._redact.append(None)
+                self._redact_next.append(0)
+                self._depth.append(self._depth[state] + 1)
+            state = next_state
+        return state
+
+    def _link(self):
+        """Computes failure links breadth-first and propagates outputs along them."""
+        goto, fail = self._goto, self._fail
+        children = [[] for _ in fail]
+        for key, state in goto.items():
+            children[key >> _CODE_BITS].append((key & ((1 << _CODE_BITS) - 1), state))
+
+        queue = deque(state for _code, state in children[0])
+        while queue:
+            state = queue.popleft()
+            for code, child in children[state]:
+                suffix = fail[state]
+                while suffix and (suffix << _CODE_BITS | code) not in goto:
+                    suffix = fail[suffix]
+                target = goto.get(suffix << _CODE_BITS | code, 0)
+                fail[child] = target if target != child else 0
+                queue.append(child)
+            # Parents are processed before children, so the suffix is final.
+            suffix = fail[state]
+            if self._block[state] is None:
+                self._block[state] = self._block[suffix]
+            self._redact_next[state] = suffix if self._redact[suffix] is not None else self._redact_next[suffix]
+
+
+class StreamScanner:
+    """
+    Scans a response chunk by chunk, releasing text as soon as it is safe.
+
+    Only a suffix of the text seen so far is ever held back: the part the
+    automaton is still matching (a forbidden phrase or sensitive pattern may be
+    split between chunks), and, with sensitive regexes, the last `regex_window`
+    characters. Everything before it is released, redacted, by `feed`. Once a
+    forbidden phrase completes, the held-back text and everything after it is
+    withheld; text released before that point has already been sent.
+    """
+
+    def __init__(self, ruleset: CompiledRuleset, regex_window: int = 256):
+        self._ruleset = ruleset
+        self._regex_window = regex_window if ruleset._regex is not None else 0
+        self._state = 0
+        self._held = ""      # Unreleased text, starting at response offset _cursor.
+        self._cursor = 0
+        self._matches = []   # Redact matches not yet applied or passed.
+        self.phrase = None   # The forbidden phrase, once the response is blocked.
+        self.redactions = 0
+
+    @property
+    def status(self) -> str:
+        """"BLOCK", "REDACT" or "ALLOW", for the text scanned so far."""
+        if self.phrase is not None:
+            return "BLOCK"
+        return "REDACT" if self.redactions else "ALLOW"
+
+    def feed(self, chunk: str) -> str:
+        """
+        Scans the next chunk of the response.
+
+        Returns:
+            str: The text that can be sent now, redacted; empty once blocked.
+        """
+        if self.phrase is not None:
+            return ""
+        offset = self._cursor + len(self._held)
+        self._held += chunk
+        self._state, self.phrase = self._ruleset._advance(self._state, chunk, offset, self._matches)
+        if self.phrase is not None:
+            self._held, self._matches = "", []
+            return ""
+        end = offset + len(chunk)
+        # No match can start before the text the automaton is still inside.
+        horizon = min(end - self._ruleset._depth[self._state], end - self._regex_window)
+        return self._release(horizon)
+
+    def close(self) -> str:
+        """
+        Ends the response.
+
+        Returns:
+            str: The remaining text, redacted; empty if blocked.
+        """
+        if self.phrase is not None:
+            return ""
+        return self._release(self._cursor + len(self._held))
+
+    def _release(self, horizon: int) -> str:
+        """Applies every match starting before `horizon` and releases the text up to it."""
+        if horizon <= self._cursor:
+            return ""
+        matches = self._matches
+        self._ruleset._find_regexes(self._held, self._cursor, horizon, matches)
+        released, cursor, redactions = _apply(self._held, self._cursor, matches, horizon)
+        self.redactions += redactions
+        self._held = self._held[cursor - self._cursor:]
+        self._cursor = cursor
+        # Regex matches are only collected up to the horizon, so the matches left
+        # are literal ones; regexes are searched again on the next release.
+        self._matches = [match for match in matches if match[0] >= horizon]
+        return released
+
+
+def _read_tables(data: bytes, offset: int, counts: list, byteorder: str) -> list:
+    """
+    Reads the 64-bit integer tables of a serialized ruleset, which fill `data`
+    from `offset` to its end.
+
+    Raises:
+        ValueError: If `data` is truncated or has trailing bytes.
+    """
+    tables = []
+    for count in counts:
+        table = array("q")
+        end = offset + count * table.itemsize
+        if end > len(data):
+            raise ValueError("The serialized ruleset is truncated.")
+        table.frombytes(data[offset:end])
+        if byteorder != sys.byteorder:
+            table.byteswap()
+        tables.append(table)
+        offset = end
+    if offset != len(data):
+        raise ValueError("The serialized ruleset has trailing data.")
+    return tables
+
+
+def _scope_flags(regex: str) -> str:
+    """
+    Checks one sensitive regex and rewrites its leading global flags, such as
+    "(?i)", into a scoped group, "(?i:...)", which is valid inside the
+    alternation.
+
+    Raises:
+        ValueError: If the regex is invalid or uses a reserved group name.
+    """
+    try:
+        compiled = re.compile(regex)
+    except re.error as error:
+        raise ValueError(f"Invalid sensitive regex {regex!r}: {error}") from None
+    reserved = [name for name in compiled.groupindex if _RESERVED_GROUP.fullmatch(name)]
+    if reserved:
+        raise ValueError(f"Sensitive regex {regex!r} uses the reserved group name {reserved[0]!r}.")
+    flags = ""
+    while True:
+        leading = _GLOBAL_FLAGS.match(regex)
+        if leading is None:
+            break
+        flags += leading.group(1)
+        regex = regex[leading.end():]
+    return f"(?{flags}:{regex})" if flags else regex
+
+
+def _apply(text: str, offset: int, matches: list, horizon: int) -> tuple:
+    """
+    Redacts `text` (which starts at `offset`) leftmost-longest, up to `horizon`.
+
+    Matches starting at or after `horizon` are left for later. A match chosen
+    before it may end beyond it; the text is then released up to its end.
+
+    Returns:
+        tuple: (released text, response offset released up to, redactions).
+    """
+    matches.sort()
+    pieces, cursor, redactions = [], offset, 0
+    for start, negative_length, replacement in matches:
+        if start >= horizon:
+            break
+        if start >= cursor:
+            pieces.append(text[cursor - offset:start - offset])
+            pieces.append(replacement)
+            cursor = start - negative_length
+            redactions += 1
+    if cursor < horizon:
+        pieces.append(text[cursor - offset:horizon - offset])
+        cursor = horizon
+    return "".join(pieces), cursor, redactions
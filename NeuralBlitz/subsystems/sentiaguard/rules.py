@@ -0,0 +1,127 @@
+"""
+Ruleset files for SentiaGuard.
+
+A ruleset is a JSON or YAML document with up to three sections, the same keys
+SentiaGuardEngine keeps in `_rules`:
+
+    FORBIDDEN_PHRASES:              # block the response wherever they occur
+      - explicitly_forbidden_content
+    SENSITIVE_PATTERNS:             # literal text -> replacement
+      pii_placeholder: "[REDACTED PII]"
+    SENSITIVE_REGEXES:              # regular expression -> replacement
+      '\\b\\d{3}-\\d{2}-\\d{4}\\b': "[REDACTED SSN]"
+
+Compiling a large ruleset takes seconds, so `compile_rules` can keep compiled
+rulesets in a cache directory, keyed by a hash of the rules: starting up with an
+unchanged ruleset loads the automaton instead of rebuilding it. Cache files are
+written atomically and hold data only (see `CompiledRuleset.to_bytes`), never
+pickles, so a file planted in the cache cannot run code. It could still change
+what gets matched, so the directory should be writable by the operator alone.
+
+YAML files require PyYAML.
+"""
+
+import hashlib
+import json
+import os
+
+from subsystems.sentiaguard.matcher import CompiledRuleset
+
+try:
+    import yaml
+except ImportError:  # PyYAML is optional, only needed for YAML rulesets.
+    yaml = None
+
+RULE_KEYS = ("FORBIDDEN_PHRASES", "SENSITIVE_PATTERNS", "SENSITIVE_REGEXES")
+# Bump when CompiledRuleset's layout changes, so stale cache files are ignored.
+CACHE_FORMAT = 3
+
+
+def load_rules(path: str) -> dict:
+    """
+    Reads and validates a ruleset file.
+
+    Args:
+        path (str): A .json, .yaml or .yml file.
+
+    Returns:
+        dict: The rules, with every section present.
+
+    Raises:
+        ValueError: If the file is malformed or has an unknown section.
+        ImportError: If the file is YAML and PyYAML is not installed.
+    """
+    with open(path, encoding="utf-8") as handle:
+        if path.endswith((".yaml", ".yml")):
+            if yaml is None:
+                raise ImportError("Loading YAML rulesets requires PyYAML (pip install pyyaml).")
+            document = yaml.safe_load(handle)
+        else:
+            document = json.load(handle)
+
+    if not isinstance(document, dict):
+        raise ValueError(f"Ruleset '{path}' must be a mapping of sections.")
+    unknown = set(document) - set(RULE_KEYS)
+    if unknown:
+        raise ValueError(f"Ruleset '{path}' has unknown sections {sorted(unknown)}; expected {RULE_KEYS}.")
+    rules = {
+        "FORBIDDEN_PHRASES": document.get("FORBIDDEN_PHRASES") or [],
+        "SENSITIVE_PATTERNS": document.get("SENSITIVE_PATTERNS") or {},
+        "SENSITIVE_REGEXES": document.get("SENSITIVE_REGEXES") or {},
+    }
+    if not (isinstance(rules["FORBIDDEN_PHRASES"], list)
+            and all(isinstance(phrase, str) for phrase in rules["FORBIDDEN_PHRASES"])):
+        raise ValueError(f"FORBIDDEN_PHRASES in '{path}' must be a list of strings.")
+    for key in ("SENSITIVE_PATTERNS", "SENSITIVE_REGEXES"):
+        section = rules[key]
+        if not (isinstance(section, dict)
+                and all(isinstance(k, str) and isinstance(v, str) for k, v in section.items())):
+            raise ValueError(f"{key} in '{path}' must map strings to replacement strings.")
+    return rules
+
+
+def ruleset_hash(rules: dict) -> str:
+    """Returns a hex digest identifying a ruleset's contents."""
+    # Order is kept: it decides which regex alternative wins at a given position.
+    canonical = json.dumps([list(rules.get("FORBIDDEN_PHRASES") or ()),
+                            list((rules.get("SENSITIVE_PATTERNS") or {}).items()),
+                            list((rules.get("SENSITIVE_REGEXES") or {}).items())], ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def compile_rules(rules: dict, cache_dir: str = None) -> CompiledRuleset:
+    """
+    Compiles a ruleset, reusing a cached compilation when one exists.
+
+    Args:
+        rules (dict): The rules, as returned by `load_rules`.
+        cache_dir (str, optional): Where compiled rulesets are kept. None
+                                   always compiles.
+
+    Returns:
+        CompiledRuleset: The compiled ruleset, with `version` set to the
+                         rules' `ruleset_hash`.
+    """
+    digest = ruleset_hash(rules)
+    if cache_dir is None:
+        ruleset = CompiledRuleset.from_rules(rules)
+        ruleset.version = digest
+        return ruleset
+
+    path = os.path.join(cache_dir, f"{digest}-v{CACHE_FORMAT}.ruleset")
+    try:
+        with open(path, "rb") as handle:
+            ruleset = CompiledRuleset.from_bytes(handle.read())
+        if ruleset.version == digest:
+            return ruleset
+    except (OSError, ValueError):
+        pass  # Missing, unreadable or not this ruleset: compile afresh and rewrite it.
+
+    ruleset = CompiledRuleset.from_rules(rules)
+    ruleset.version = digest
+    os.makedirs(cache_dir, exist_ok=True)
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "wb") as handle:
+        handle.write(ruleset.to_bytes())
+    os.replace(temporary, path)
+    return ruleset
@@ -7,6 +7,26 @@ ensuring that no output violates the hard constraints of the Charter.
 While Conscientia advises on nuance, SentiaGuard enforces the rules.
 """
 
+import collections
+import multiprocessing
+import os
+import queue
+import threading
+
+from core_engine.structured_logging import get_logger
+from subsystems.sentiaguard.matcher import CompiledRuleset
+from subsystems.sentiaguard.rules import compile_rules, load_rules, ruleset_hash
+from subsystems.verdict_cache import resolve_verdict_cache
+
+logger = get_logger("sentiaguard")
+
+_REASONS = {
+    "BLOCK": "Output violates Charter (contains forbidden phrase).",
+    "REDACT": "Output contained sensitive patterns that have been redacted.",
+    "ALLOW": "Output is compliant with all safety checks.",
+}
+
+
 class SentiaGuardEngine:
     """
     Scans and sanitizes system outputs for Charter compliance.
@@ -17,20 +37,93 @@ class SentiaGuardEngine:
         Initializes the SentiaGuard Engine.
 
         In a real system, this would load a comprehensive set of rules and
-        machine learning models for content safety.
+        machine learning models for content safety. Rules are loaded from the
+        JSON or YAML file named by "rules_path" (see
+        `subsystems.sentiaguard.rules`); without one, a placeholder ruleset is
+        used. Either way, every rule is compiled into one automaton, so a scan
+        is a single pass over the response however many rules there are.
 
         Args:
-            config (dict): Configuration settings for the engine.
+            config (dict): Configuration settings for the engine. Recognised keys:
+                           "rules_path" (a ruleset file), "rules_cache_dir"
+                           (where compiled rulesets are cached between runs) and
+                           "stream_regex_window" (the longest match a sensitive
+                           regex can make in a streamed response, default 256),
+                           "scan_start_method" (how `scan_many` starts its
+                           worker processes, default "forkserver" where the
+                           platform has it, else "spawn")
+                           and "verdict_cache" (a VerdictCache, or True for the
+                           process-wide one shared with Conscientia; see
+                           `subsystems.verdict_cache`).
             charter_layer: A direct link to the CharterLayer to access axioms.
         """
         self.config = config
         self.charter = charter_layer
-        # Placeholder for a real ruleset, which would be loaded from a file.
-        self._rules = {
-            "FORBIDDEN_PHRASES": ["explicitly_forbidden_content"],
-            "SENSITIVE_PATTERNS": {"pii_placeholder": "[REDACTED PII]"}
-        }
-        print("SentiaGuard Engine (Safety & Enforcement) Initialized.")
+        self._reload_mutex = threading.Lock()
+        self._verdict_cache = resolve_verdict_cache(config.get("verdict_cache"))
+        if config.get("rules_path"):
+            self.reload_rules()
+        else:
+            self._rules = {
+                "FORBIDDEN_PHRASES": ["explicitly_forbidden_content"],
+                "SENSITIVE_PATTERNS": {"pii_placeholder": "[REDACTED PII]"}
+            }
+            self._ruleset = compile_rules(self._rules, config.get("rules_cache_dir"))
+        logger.info("initialized", rules=self._ruleset.rule_count)
+
+    def reload_rules(self, path: str = None) -> bool:
+        """
+        Loads a ruleset file and swaps it in atomically.
+
+        The new ruleset is read and compiled (or fetched from the cache) to the
+        side, then published with a single reference assignment: scans never
+        wait for a reload, and a scan already running finishes on the ruleset it
+        started with. If the file is invalid, the current ruleset stays active.
+
+        Args:
+            path (str, optional): The ruleset file. Defaults to the configured
+                                  "rules_path".
+
+        Returns:
+            bool: True if the rules changed, False if the file was unchanged.
+
+        Raises:
+            ValueError: If no path is given or configured, or the file is invalid.
+        """
+        path = path or self.config.get("rules_path")
+        if not path:
+            raise ValueError("No ruleset file given and no rules_path is configured.")
+        logger.info("load_rules", path=path)
+        with self._reload_mutex:
+            rules = load_rules(path)
+            current = getattr(self, "_ruleset", None)
+            if current is not None and ruleset_hash(rules) == current.version:
+                return False
+            ruleset = compile_rules(rules, self.config.get("rules_cache_dir"))
+            self._rules = rules
+            self._ruleset = ruleset  # The swap: scans read this attribute once.
+        return True
+
+    def open_stream(self):
+        """
+        Starts scanning a response that is sent to the user while it is generated.
+
+        Feed each generated chunk to the returned scanner's `feed`, send what it
+        returns, and call `close` at the end for the remainder. A forbidden
+        phrase or sensitive pattern split across chunks is still caught; only
+        the text that could still become part of a match is held back, so
+        time-to-first-byte is bounded by the chunk size, not the response length.
+        Once a forbidden phrase completes, nothing more is released and the
+        scanner's `status` is "BLOCK"; otherwise it is "REDACT" or "ALLOW".
+
+        The stream keeps the ruleset active when it was opened, even across a
+        `reload_rules`.
+
+        Returns:
+            StreamScanner: The scanner for one response.
+        """
+        logger.debug("open_stream")
+        return self._ruleset.stream(regex_window=self.config.get("stream_regex_window", 256))
 
     def scan_output(self, response_text: str) -> dict:
         """
@@ -48,37 +141,160 @@ class SentiaGuardEngine:
         Returns:
             dict: A verdict dictionary containing the status and the final text.
         """
-        print("SentiaGuard: Scanning final output...")
-
-        # --- Placeholder for future rule-based and model-based scanning ---
-        # 1. Check for forbidden phrases that warrant a hard block.
-        for phrase in self._rules["FORBIDDEN_PHRASES"]:
-            if phrase in response_text:
-                return {
-                    "status": "BLOCK",
-                    "reason": f"Output violates Charter (contains forbidden phrase).",
-                    "final_text": None
-                }
-
-        # 2. Check for sensitive patterns that need to be redacted.
-        modified_text = response_text
-        redacted = False
-        for pattern, replacement in self._rules["SENSITIVE_PATTERNS"].items():
-            if pattern in modified_text:
-                modified_text = modified_text.replace(pattern, replacement)
-                redacted = True
-
-        if redacted:
-            return {
-                "status": "REDACT",
-                "reason": "Output contained sensitive patterns that have been redacted.",
-                "final_text": modified_text
-            }
-        # --- End of placeholder logic ---
-
-        # 3. If no issues are found, allow the response.
-        return {
-            "status": "ALLOW",
-            "reason": "Output is compliant with all safety checks.",
-            "final_text": response_text
-        }
+        logger.debug("scan_output", length=len(response_text))
+
+        ruleset = self._ruleset
+        if self._verdict_cache is None:
+            return _verdict(*_scan(ruleset, response_text), response_text)
+
+        # Verdicts depend on the ruleset and the Charter; after a change to
+        # either, verdicts cached under the old versions are no longer found.
+        version = (ruleset.version, getattr(self.charter, "version", None))
+        hit, result = self._verdict_cache.get("sentiaguard", version, response_text)
+        if not hit:
+            result = _scan(ruleset, response_text)
+            self._verdict_cache.put("sentiaguard", version, response_text, result)
+        return _verdict(*result, response_text)
+
+    def cache_stats(self) -> dict | None:
+        """
+        Returns the verdict cache's counters and hit ratios (shared with any
+        other engine using the same cache), or None if caching is disabled.
+        """
+        return self._verdict_cache.stats() if self._verdict_cache is not None else None
+
+    def scan_many(self, texts, workers: int = None, ordered: bool = True, batch_size: int = 256):
+        """
+        Scans many responses in parallel, e.g. to re-audit historical outputs.
+
+        Texts are scanned in batches by a pool of worker processes, started
+        with the configured "scan_start_method". The compiled ruleset reaches
+        each worker once, when it starts, never per task: serialized once with
+        `CompiledRuleset.to_bytes` and loaded by every worker. "fork" skips
+        that by inheriting it, but forking a process that runs other threads
+        (the WAL flusher, logging handlers, a caller's thread pool) can copy a
+        lock another thread holds, and the worker then deadlocks on it; only
+        choose it for single-threaded callers. Only a bounded number of batches
+        is in flight, so an arbitrarily long stream of texts can be consumed
+        lazily.
+
+        Args:
+            texts: An iterable of response texts.
+            workers (int, optional): The number of processes (default: one per
+                                     CPU). With 1, texts are scanned in this process.
+            ordered (bool): Yield verdicts in input order. Otherwise, yield them
+                            as batches complete, as (index, verdict) pairs.
+            batch_size (int): How many texts to send a worker per task.
+
+        Yields:
+            dict: The `scan_output` verdict for each text, or (index, verdict)
+                  pairs when `ordered` is False.
+        """
+        logger.debug("scan_many", workers=workers)
+        ruleset = self._ruleset  # Pinned for the whole batch, even across a reload.
+        workers = workers or os.cpu_count() or 1
+        if workers == 1:
+            for index, text in enumerate(texts):
+                verdict = _verdict(*_scan(ruleset, text), text)
+                yield verdict if ordered else (index, verdict)
+            return
+
+        start_method = self.config.get("scan_start_method")
+        if start_method is None:
+            start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        context = multiprocessing.get_context(start_method)
+        payload = ruleset if start_method == "fork" else ruleset.to_bytes()
+        batches = _batches(texts, batch_size)
+        limit = 2 * workers  # Batches in flight: enough to keep every worker busy.
+        with context.Pool(workers, initializer=_install_ruleset, initargs=(payload,)) as pool:
+            if ordered:
+                yield from _scan_ordered(pool, batches, limit)
+            else:
+                yield from _scan_unordered(pool, batches, limit)
+
+
+# The worker processes' ruleset, installed once per process by `_install_ruleset`.
+_worker_ruleset = None
+
+
+def _install_ruleset(ruleset):
+    """Worker initializer: takes the ruleset itself (fork) or its serialized tables."""
+    global _worker_ruleset
+    _worker_ruleset = CompiledRuleset.from_bytes(ruleset) if isinstance(ruleset, bytes) else ruleset
+
+
+def _scan_ordered(pool, batches, limit: int):
+    """Yields the verdicts of `scan_many`'s batches in input order, `limit` batches in flight."""
+    pending = collections.deque()
+    for _start, batch in batches:
+        pending.append((batch, pool.apply_async(_scan_batch, (batch,))))
+        if len(pending) >= limit:
+            yield from _verdicts(*pending.popleft())
+    while pending:
+        yield from _verdicts(*pending.popleft())
+
+
+def _scan_unordered(pool, batches, limit: int):
+    """Yields (index, verdict) pairs of `scan_many`'s batches as they complete, `limit` batches in flight."""
+    completed = queue.Queue()
+    in_flight = 0
+    exhausted = False
+    while True:
+        while not exhausted and in_flight < limit:
+            item = next(batches, None)
+            if item is None:
+                exhausted = True
+                break
+            pool.apply_async(_scan_batch, (item[1],),
+                             callback=lambda results, item=item: completed.put((item, results)),
+                             error_callback=lambda error: completed.put((None, error)))
+            in_flight += 1
+        if not in_flight:
+            return
+        item, results = completed.get()
+        in_flight -= 1
+        if item is None:
+            raise results
+        start, batch = item
+        for offset, (status, final_text) in enumerate(results):
+            yield start + offset, _verdict(status, final_text, batch[offset])
+
+
+def _scan(ruleset, text: str) -> tuple:
+    """Scans a text; returns (status, redacted text or None)."""
+    # 1. Forbidden phrases warrant a hard block; 2. sensitive patterns are
+    # redacted. Both are found in the same pass over the text.
+    phrase, modified_text, redactions = ruleset.scan(text)
+    if phrase is not None:
+        return "BLOCK", None
+    if redactions:
+        return "REDACT", modified_text
+    # 3. If no issues are found, allow the response.
+    return "ALLOW", None
+
+
+def _scan_batch(texts: list) -> list:
+    """Worker task: scans a batch. Allowed texts are not sent back, only their status."""
+    return [_scan(_worker_ruleset, text) for text in texts]
+
+
+def _verdict(status: str, redacted: str | None, text: str) -> dict:
+    """Builds a verdict dictionary from a scan result and the original text."""
+    final_text = text if status == "ALLOW" else redacted
+    return {"status": status, "reason": _REASONS[status], "final_text": final_text}
+
+
+def _verdicts(batch: list, result) -> list:
+    return [_verdict(status, redacted, text) for (status, redacted), text in zip(result.get(), batch)]
+
+
+def _batches(texts, size: int):
+    """Yields (index of first text, list of texts) batches."""
+    batch, start = [], 0
+    for index, text in enumerate(texts):
+        batch.append(text)
+        if len(batch) >= size:
+            yield start, batch
+            batch, start = [], index + 1
+    if batch:
+        yield start, batch
@@ -0,0 +1,145 @@
+"""
+Shared verdict cache for the safety subsystems.
+
+Many outputs and proposed actions repeat exactly: templated answers, identical
+focus plans. SentiaGuard and Conscientia can short-circuit them through one
+VerdictCache, keyed by a hash of the content rather than the content itself,
+so long responses are not kept alive by the cache.
+
+Each engine uses its own namespace and passes the version of everything its
+verdicts depend on (its ruleset, the Charter, its configuration). The version
+is part of every entry's key, so a reloaded ruleset or an amended Charter never
+serves a stale verdict. Engines with different versions can share a namespace
+without evicting each other, and entries of versions no longer in use simply
+age out of the LRU.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+
+def content_digest(content) -> bytes:
+    """
+    Returns a 16-byte digest of a text, or of any JSON-serializable value.
+    """
+    if not isinstance(content, str):
+        content = json.dumps(content, sort_keys=True, default=repr)
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).digest()
+
+
+class VerdictCache:
+    """
+    A thread-safe, size-bounded LRU cache of verdicts, shared between engines.
+    """
+
+    def __init__(self, maxsize: int = 100000):
+        """
+        Args:
+            maxsize (int): The maximum number of verdicts kept, across namespaces.
+        """
+        self.maxsize = maxsize
+        self._entries = OrderedDict()  # (namespace, version, digest) -> verdict
+        self._counters = {}            # namespace -> {"hits", "misses", "evictions", "invalidations", "size"}
+        self._mutex = threading.Lock()
+
+    def get(self, namespace: str, version, content) -> tuple:
+        """
+        Looks up the verdict for some content.
+
+        Args:
+            namespace (str): The engine's namespace, e.g. "sentiaguard".
+            version: Anything hashable identifying what the verdict depends on;
+                     verdicts stored under other versions are not returned.
+            content: The text or JSON-serializable value that was judged.
+
+        Returns:
+            tuple: (True, verdict) on a hit, or (False, None) on a miss.
+        """
+        key = (namespace, version, content_digest(content))
+        with self._mutex:
+            counters = self._namespace(namespace)
+            verdict = self._entries.get(key)
+            if verdict is None:
+                counters["misses"] += 1
+                return False, None
+            self._entries.move_to_end(key)
+            counters["hits"] += 1
+            return True, verdict
+
+    def put(self, namespace: str, version, content, verdict):
+        """Stores a verdict; see `get` for the arguments."""
+        key = (namespace, version, content_digest(content))
+        with self._mutex:
+            counters = self._namespace(namespace)
+            if key not in self._entries:
+                counters["size"] += 1
+            self._entries[key] = verdict
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                (evicted, _version, _digest), _verdict = self._entries.popitem(last=False)
+                self._counters[evicted]["size"] -= 1
+                self._counters[evicted]["evictions"] += 1
+
+    def invalidate(self, namespace: str = None):
+        """Drops every verdict of one namespace, or of all of them."""
+        with self._mutex:
+            for name in [namespace] if namespace is not None else list(self._counters):
+                if name in self._counters:
+                    self._drop(name)
+
+    def stats(self) -> dict:
+        """
+        Returns hit, miss, eviction and invalidation counts, sizes and hit
+        ratios: overall, and per namespace under "namespaces".
+        """
+        with self._mutex:
+            namespaces = {name: dict(counters) for name, counters in self._counters.items()}
+        totals = {key: sum(counters[key] for counters in namespaces.values())
+                  for key in ("hits", "misses", "evictions", "invalidations", "size")}
+        for counters in [totals, *namespaces.values()]:
+            lookups = counters["hits"] + counters["misses"]
+            counters["hit_ratio"] = counters["hits"] / lookups if lookups else 0.0
+        totals["namespaces"] = namespaces
+        return totals
+
+    def _namespace(self, namespace: str) -> dict:
+        """Returns a namespace's counters, creating them on first use."""
+        counters = self._counters.get(namespace)
+        if counters is None:
+            counters = self._counters[namespace] = {
+                "hits": 0, "misses": 0, "evictions": 0, "invalidations": 0, "size": 0}
+        return counters
+
+    def _drop(self, namespace: str):
+        """Removes a namespace's entries; the caller holds the mutex."""
+        stale = [key for key in self._entries if key[0] == namespace]
+        for key in stale:
+            del self._entries[key]
+        counters = self._counters[namespace]
+        counters["invalidations"] += len(stale)
+        counters["size"] = 0
+
+
+_shared = None
+_shared_mutex = threading.Lock()
+
+
+def shared_verdict_cache() -> VerdictCache:
+    """Returns the process-wide VerdictCache that engines configured with True share."""
+    global _shared
+    with _shared_mutex:
+        if _shared is None:
+            _shared = VerdictCache()
+        return _shared
+
+
+def resolve_verdict_cache(setting) -> VerdictCache | None:
+    """
+    Interprets an engine's "verdict_cache" setting: a VerdictCache to use, True
+    for the shared cache, or a false value for none.
+    """
+    if isinstance(setting, VerdictCache):
+        return setting
+    return shared_verdict_cache() if setting else None
@@ -0,0 +1,120 @@
+"""
+Unit tests for the HALIC audit ledger.
+
+These tests validate that sealed interactions are chained into a verifiable
+Merkle tree, that inclusion proofs hold, and that tampering is detected.
+"""
+
+import hashlib
+import json
+
+import pytest
+from interface_layer.halic.audit_ledger import AuditLedger, main, unpack_seal, verify_inclusion, verify_ledger
+
+
+def make_seal(number: int) -> tuple:
+    digest = hashlib.sha256(str(number).encode()).hexdigest()
+    return digest, digest[:32], digest[32:], float(number)
+
+
+def test_inclusion_proofs_hold_for_every_seal_and_size(tmp_path):
+    """
+    Tests proofs for every seal against the current root and against the root
+    of an earlier, published size, across segment boundaries and a reopen.
+    """
+    ledger = AuditLedger(str(tmp_path), segment_entries=5, sync=False)
+    ledger.append_many([make_seal(number) for number in range(13)])
+    published_size, published_root = 9, ledger.root(9)
+    ledger.append(*make_seal(13))
+    ledger.close()
+
+    ledger = AuditLedger(str(tmp_path), segment_entries=5, sync=False)
+    assert len(ledger) == 14
+    for index in range(14):
+        proof = ledger.prove(index)
+        assert verify_inclusion(proof["record"], index, proof["size"], proof["path"], proof["root"])
+        assert not verify_inclusion(proof["record"], (index + 1) % 14, 14, proof["path"], proof["root"])
+    proof = ledger.prove(4, size=published_size)
+    assert proof["root"] == published_root
+    assert verify_inclusion(proof["record"], 4, published_size, proof["path"], published_root)
+    assert unpack_seal(ledger.entry(13))["golden_dag"] == make_seal(13)[0]
+    with pytest.raises(IndexError):
+        ledger.prove(14)
+    ledger.close()
+
+
+def test_verifier_detects_tampering(tmp_path, capsys):
+    """
+    Tests that the verifier accepts an intact ledger and its published head,
+    and rejects a ledger with an altered seal.
+    """
+    ledger = AuditLedger(str(tmp_path), segment_entries=4, sync=False)
+    ledger.append_many([make_seal(number) for number in range(10)])
+    root = ledger.root(6)
+    ledger.close()
+
+    result = verify_ledger(str(tmp_path), 6, root)
+    assert (result["size"], result["head_ok"], result["published_ok"], result["errors"]) == (10, True, True, [])
+    assert main([str(tmp_path), "--size", "6", "--root", root.hex()]) == 0
+
+    with open(tmp_path / "segment-000001.nbal", "r+b") as segment:
+        segment.seek(30)
+        segment.write(b"\xff")
+    assert main([str(tmp_path)]) == 1
+    assert "DOES NOT MATCH" in capsys.readouterr().out
+
+
+def test_halic_seals_responses_in_the_ledger(tmp_path):
+    """
+    Tests that HALIC records each response's GoldenDAG and reports its index.
+    """
+    from interface_layer.halic.halic_core import HALICEngine
+
+    class MockUNE:
+        def direct_focus(self, intent, context):
+            return {"key_concepts": intent.split(), "logical_path": "mocked_path"}
+
+    class MockSentiaGuard:
+        def scan_output(self, response_text):
+            return {"status": "ALLOW", "final_text": response_text}
+
+    ledger = AuditLedger(str(tmp_path), sync=False)
+    halic = HALICEngine({"audit_ledger": ledger}, MockUNE(), MockSentiaGuard())
+    verdict = halic.process_interaction("First prompt")
+    verdicts = halic.process_many(["Second prompt", "Third prompt"])
+
+    assert [verdict["audit_index"]] + [v["audit_index"] for v in verdicts] == [0, 1, 2]
+    seal = unpack_seal(ledger.entry(2))
+    assert f"**GoldenDAG:** `{seal['golden_dag']}`" in verdicts[1]["final_text"]
+    assert seal["trace_id"] in verdicts[1]["final_text"]
+
+
+def test_halic_commits_the_ledger_head(tmp_path):
+    """
+    Tests that HEAD advances after each interaction by default, and only once
+    the commit interval has passed when one is configured.
+    """
+    from interface_layer.halic.halic_core import HALICEngine
+
+    class MockUNE:
+        def direct_focus(self, intent, context):
+            return {"key_concepts": intent.split(), "logical_path": "mocked_path"}
+
+    class MockSentiaGuard:
+        def scan_output(self, response_text):
+            return {"status": "ALLOW", "final_text": response_text}
+
+    ledger = AuditLedger(str(tmp_path / "every"), sync=False)
+    halic = HALICEngine({"audit_ledger": ledger}, MockUNE(), MockSentiaGuard())
+    halic.process_interaction("First prompt")
+    assert verify_ledger(str(tmp_path / "every"))["head_ok"] is True
+    halic.process_many(["Second prompt", "Third prompt"])
+    with open(tmp_path / "every" / "HEAD", encoding="utf-8") as handle:
+        assert json.load(handle)["size"] == 3
+
+    ledger = AuditLedger(str(tmp_path / "interval"), sync=False)
+    halic = HALICEngine({"audit_ledger": ledger, "audit_commit_interval": 3600}, MockUNE(), MockSentiaGuard())
+    halic.process_interaction("First prompt")
+    assert verify_ledger(str(tmp_path / "interval"))["head_ok"] is None
+    ledger.close()
+    assert verify_ledger(str(tmp_path / "interval"))["size"] == 1
@@ -87,3 +87,105 @@ def test_evaluation_handles_complex_case(conscientia_instance):
     assert report["compliance_status"] == "WARN"
     assert len(report["risks_identified"]) == 2 # Stereotype and single perspective
     assert len(report["mitigation_suggestions"]) == 1 # Only one suggestion is generated
+
+def test_cached_reports_are_independent_copies():
+    """
+    Tests that a cached ethics report is returned for a repeated action without
+    callers being able to alter the cached copy.
+    """
+    from subsystems.verdict_cache import VerdictCache
+
+    engine = ConscientiaEngine({"verdict_cache": VerdictCache()}, MockCharterLayer())
+    action = {"type": "generate_response", "content": "A stereotype.", "num_perspectives": 1}
+    first = engine.evaluate_ethical_implications(action)
+    first["risks_identified"].append("tampered")
+
+    second = engine.evaluate_ethical_implications(dict(action))
+    assert second["compliance_status"] == "WARN"
+    assert "tampered" not in second["risks_identified"]
+    assert engine.cache_stats()["hits"] == 1
+    assert ConscientiaEngine({}, MockCharterLayer()).cache_stats() is None
+
+def test_cached_reports_follow_detector_configuration():
+    """
+    Tests that engines with different detectors or decisive statuses sharing
+    a verdict cache never get each other's reports.
+    """
+    from subsystems.verdict_cache import VerdictCache
+
+    cache = VerdictCache()
+    action = {"content": "hello"}
+    narrow = ConscientiaEngine({"verdict_cache": cache, "detectors": ["stereotype"]}, MockCharterLayer())
+    default = ConscientiaEngine({"verdict_cache": cache}, MockCharterLayer())
+    decisive = ConscientiaEngine({"verdict_cache": cache, "decisive_status": "WARN"}, MockCharterLayer())
+
+    assert narrow.evaluate_ethical_implications(action)["risks_identified"] == []
+    expected = ConscientiaEngine({}, MockCharterLayer()).evaluate_ethical_implications(action)
+    assert default.evaluate_ethical_implications(action) == expected
+    assert expected["risks_identified"]
+    assert decisive.evaluate_many([action]) == [expected]
+    assert cache.stats()["hits"] == 0
+
+def test_evaluate_many_matches_single_evaluations(conscientia_instance):
+    """
+    Tests that batch evaluation returns, in order, the same reports as
+    evaluating each action on its own.
+    """
+    actions = [
+        {"type": "generate_response", "content": "A balanced answer.", "num_perspectives": 3},
+        {"type": "generate_response", "content": "Another STEREOTYPE here.", "num_perspectives": 2},
+        {"type": "generate_response", "content": "One view only."},
+        {"type": "generate_response", "content": "stereotype", "num_perspectives": 1},
+        {"type": "generate_response"},
+    ]
+    reports = conscientia_instance.evaluate_many(actions)
+
+    assert reports == [conscientia_instance.evaluate_ethical_implications(action) for action in actions]
+    assert [report["compliance_status"] for report in reports] == ["PASS", "WARN", "PASS", "WARN", "PASS"]
+    assert conscientia_instance.evaluate_many([]) == []
+
+def test_evaluate_many_runs_selected_detectors():
+    """
+    Tests that the "detectors" setting chooses which registered detectors run,
+    and that unknown names are rejected.
+    """
+    engine = ConscientiaEngine({"detectors": ["stereotype"]}, MockCharterLayer())
+    report = engine.evaluate_many([{"content": "One view, no stereotype.", "num_perspectives": 1}])[0]
+    assert report["risks_identified"] == ["Potential use of a common stereotype."]
+
+    with pytest.raises(KeyError):
+        ConscientiaEngine({"detectors": ["no_such_detector"]}, MockCharterLayer())
+
+def test_cheap_decisive_detector_skips_costly_ones():
+    """
+    Tests that detectors run cheapest first, that actions already failed by a
+    cheap detector are not passed to costlier ones, and that timing stats are
+    kept per detector.
+    """
+    from subsystems.conscientia.detectors import Detector, LexiconDetector
+
+    class RecordingDetector(Detector):
+        def __init__(self):
+            super().__init__("deep_analysis", "Second-order risk.", severity="WARN", cost=100.0)
+            self.seen = []
+
+        def flags(self, batch):
+            self.seen.extend(action["content"] for action in batch.actions)
+            return [True] * len(batch)
+
+    deep = RecordingDetector()
+    cheap = LexiconDetector("forbidden", ["forbidden"], risk="Forbidden content.", severity="FAIL", cost=0.1)
+    engine = ConscientiaEngine({"detectors": [deep, cheap, "single_perspective"]}, MockCharterLayer())
+    assert [detector.name for detector in engine.detectors] == ["forbidden", "single_perspective", "deep_analysis"]
+
+    reports = engine.evaluate_many([{"content": "fine", "num_perspectives": 2},
+                                    {"content": "Forbidden words"},
+                                    {"content": "also fine"}])
+    assert [report["compliance_status"] for report in reports] == ["WARN", "FAIL", "WARN"]
+    assert reports[1]["risks_identified"] == ["Forbidden content."]
+    assert deep.seen == ["fine", "also fine"]
+
+    stats = engine.detector_stats()
+    assert list(stats) == ["forbidden", "single_perspective", "deep_analysis"]
+    assert stats["deep_analysis"]["actions"] == 2 and stats["deep_analysis"]["skipped"] == 1
+    assert stats["forbidden"]["flagged"] == 1 and stats["forbidden"]["mean_us"] > 0
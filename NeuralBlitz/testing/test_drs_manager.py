@@ -5,13 +5,16 @@ These tests ensure the reliability of the DRS's core functions: storing,
 retrieving, and connecting concepts.
 """
 
+import time
+
 import pytest
 from core_engine.drs_engine.drs_manager import DRSEngine
+from core_engine.drs_engine.storage import CompactBackend
 
-@pytest.fixture
-def drs_instance():
-    """Provides a clean instance of the DRSEngine for each test."""
-    config = {"backend": "in-memory"}
+@pytest.fixture(params=["in-memory", "compact"])
+def drs_instance(request):
+    """Provides a clean instance of the DRSEngine for each test, once per backend."""
+    config = {"backend": request.param}
     return DRSEngine(config)
 
 def test_drs_initialization(drs_instance):
@@ -58,9 +61,8 @@ def test_find_no_connection(drs_instance):
     drs_instance.store("CONCEPT_A", {})
     drs_instance.store("CONCEPT_B", {})
 
-    # Based on our current placeholder logic for indirect paths
     path = drs_instance.find_connections("CONCEPT_A", "CONCEPT_B")
-    assert path == ["CONCEPT_A", "--> (indirect path) -->", "CONCEPT_B"]
+    assert path == []
 
 def test_find_connection_to_nonexistent_node(drs_instance):
     """
@@ -69,3 +71,668 @@ def test_find_connection_to_nonexistent_node(drs_instance):
     drs_instance.store("CONCEPT_A", {})
     path = drs_instance.find_connections("CONCEPT_A", "NONEXISTENT_CONCEPT")
     assert path == []
+
+def test_find_multi_hop_connection(drs_instance):
+    """
+    Tests that the search follows connections through intermediate concepts.
+    """
+    drs_instance.store("HALIC", {}, connections=[{"target": "UNE", "relation": "calls"}])
+    drs_instance.store("UNE", {}, connections=[{"target": "DRS", "relation": "depends_on"}])
+    drs_instance.store("DRS", {})
+
+    path = drs_instance.find_connections("HALIC", "DRS")
+    assert path == ["HALIC", "calls", "UNE", "depends_on", "DRS"]
+
+    # Connections are directed, so there is no way back.
+    assert drs_instance.find_connections("DRS", "HALIC") == []
+
+def test_find_connection_respects_max_depth(drs_instance):
+    """
+    Tests that paths longer than the configured depth are not returned.
+    """
+    drs_instance.store("A", {}, connections=[{"target": "B", "relation": "r"}])
+    drs_instance.store("B", {}, connections=[{"target": "C", "relation": "r"}])
+    drs_instance.store("C", {})
+
+    assert drs_instance.find_connections("A", "C", max_depth=1) == []
+    assert drs_instance.find_connections("A", "C", max_depth=2) == ["A", "r", "B", "r", "C"]
+
+def test_weighted_strategies_prefer_cheapest_path(drs_instance):
+    """
+    Tests that Dijkstra and A* pick the cheapest path, while BFS picks the shortest.
+    """
+    drs_instance.store("A", {}, connections=[
+        {"target": "D", "relation": "expensive", "weight": 10.0},
+        {"target": "B", "relation": "cheap", "weight": 1.0},
+    ])
+    drs_instance.store("B", {}, connections=[{"target": "C", "relation": "cheap", "weight": 1.0}])
+    drs_instance.store("C", {}, connections=[{"target": "D", "relation": "cheap", "weight": 1.0}])
+    drs_instance.store("D", {})
+
+    assert drs_instance.find_connections("A", "D") == ["A", "expensive", "D"]
+    cheapest = ["A", "cheap", "B", "cheap", "C", "cheap", "D"]
+    assert drs_instance.find_connections("A", "D", strategy="dijkstra") == cheapest
+    assert drs_instance.find_connections("A", "D", strategy="astar",
+                                         heuristic=lambda node, end: 0.0) == cheapest
+    # A cost budget rules out the cheap path if it also has to be short.
+    assert drs_instance.find_connections("A", "D", strategy="dijkstra", max_depth=2) == ["A", "expensive", "D"]
+    assert drs_instance.find_connections("A", "D", strategy="dijkstra", max_cost=2.0) == []
+
+def test_restoring_concept_replaces_its_edges(drs_instance):
+    """
+    Tests that overwriting a concept removes its old connections from the index.
+    """
+    drs_instance.store("A", {}, connections=[{"target": "B", "relation": "old"}])
+    drs_instance.store("B", {})
+    drs_instance.store("A", {}, connections=[])
+
+    assert drs_instance.find_connections("A", "B") == []
+
+def test_store_rejects_negative_weight(drs_instance):
+    """
+    Tests that connections with a negative weight are refused.
+    """
+    with pytest.raises(ValueError):
+        drs_instance.store("A", {}, connections=[{"target": "B", "relation": "r", "weight": -1}])
+
+def test_unknown_backend_is_rejected():
+    """
+    Tests that an unknown storage backend name raises a clear error.
+    """
+    with pytest.raises(ValueError):
+        DRSEngine({"backend": "carrier-pigeon"})
+
+def test_compact_backend_survives_compaction():
+    """
+    Tests that the compact backend answers identically before and after its
+    pending edges are folded into the CSR arrays.
+    """
+    backend = CompactBackend(min_compaction=0)
+    backend.put("A", {"n": 1}, None, [("B", "r", 1.0), ("C", "s", 2.5)])
+    backend.put("B", {"n": 2}, None, [("C", "r", 1.0)])
+    backend.compact()
+    # Overwrite a compacted row; the overlay must shadow the CSR row.
+    backend.put("A", {"n": 3}, None, [("C", "t", 1.0)])
+
+    for check in range(2):
+        assert backend["A"] == {"data": {"n": 3}, "connections": [{"target": "C", "relation": "t"}]}
+        assert sorted(backend.predecessors("C")) == [("A", "t", 1.0), ("B", "r", 1.0)]
+        assert list(backend.predecessors("B")) == []
+        assert "C" not in backend  # Referenced, but never stored.
+        assert sorted(backend) == ["A", "B"]
+        assert backend.edge_count() == 2
+        backend.compact()
+
+def test_query_returns_connections_as_stored(drs_instance):
+    """
+    Tests that both backends return connection dictionaries exactly as stored,
+    whether or not they name a relation, repeat the default weight or carry
+    extra keys.
+    """
+    connections = [{"target": "B"}, {"target": "C", "relation": "r", "note": "x"},
+                   {"target": "D", "relation": "r", "weight": 1.0}, {"target": "E", "relation": "r", "weight": 2.5}]
+    drs_instance.store("A", {"n": 1}, connections)
+    drs_instance.store_many([("F", {}, [{"target": "A", "relation": "s"}]), ("G", {}, [{"target": "A"}])])
+
+    assert drs_instance.query("A") == {"data": {"n": 1}, "connections": connections}
+    assert drs_instance.query("F")["connections"] == [{"target": "A", "relation": "s"}]
+    assert drs_instance.query("G")["connections"] == [{"target": "A"}]
+    assert drs_instance.find_connections("F", "A") == ["F", "s", "A"]
+
+def test_snapshot_round_trip(drs_instance, tmp_path):
+    """
+    Tests that a saved snapshot reloads with the same concepts and paths, and
+    that the loaded substrate still accepts new concepts.
+    """
+    drs_instance.store("HALIC", {"layer": "interface"}, connections=[{"target": "UNE", "relation": "calls"}])
+    drs_instance.store("UNE", {"layer": "core"}, connections=[
+        {"target": "DRS", "relation": "depends_on", "weight": 0.5}])
+    drs_instance.store("DRS", {"layer": "core"})
+    path = str(tmp_path / "drs.snapshot")
+    drs_instance.save_snapshot(path)
+
+    restored = DRSEngine({"backend": "compact", "snapshot": path})
+    assert len(restored._storage) == 3
+    assert restored.query("HALIC")["data"] == {"layer": "interface"}
+    assert restored.query("UNE")["connections"] == [{"target": "DRS", "relation": "depends_on", "weight": 0.5}]
+    assert restored.query("MISSING") is None
+    assert restored.find_connections("HALIC", "DRS") == ["HALIC", "calls", "UNE", "depends_on", "DRS"]
+
+    restored.store("DRS", {"layer": "memory"}, connections=[{"target": "NEW", "relation": "feeds"}])
+    restored.store("NEW", {})
+    assert restored.query("DRS")["data"] == {"layer": "memory"}
+    assert restored.find_connections("HALIC", "NEW")[-2:] == ["feeds", "NEW"]
+
+def test_snapshot_returns_connections_as_stored(drs_instance, tmp_path):
+    """
+    Tests that connection dictionaries survive a snapshot, and a snapshot of a
+    loaded snapshot, exactly as stored.
+    """
+    connections = [{"target": "B"}, {"target": "C", "relation": "r", "note": "x"},
+                   {"target": "D", "relation": "r", "weight": 1.0}]
+    drs_instance.store("A", {"n": 1}, connections)
+    drs_instance.store("B", {}, [{"target": "A", "relation": "s"}])
+    expected = {concept: drs_instance.query(concept) for concept in ("A", "B")}
+
+    drs_instance.save_snapshot(str(tmp_path / "first.snapshot"))
+    restored = DRSEngine({"backend": "compact", "snapshot": str(tmp_path / "first.snapshot")})
+    assert {concept: restored.query(concept) for concept in ("A", "B")} == expected
+    restored.save_snapshot(str(tmp_path / "second.snapshot"))
+    drs_instance.load_snapshot(str(tmp_path / "second.snapshot"))
+    assert {concept: drs_instance.query(concept) for concept in ("A", "B")} == expected
+
+    drs_instance.store("A", {}, [{"target": "B", "relation": "r"}])
+    assert drs_instance.query("A")["connections"] == [{"target": "B", "relation": "r"}]
+
+    config = {"wal_path": str(tmp_path / "drs.wal"), "checkpoint_path": str(tmp_path / "drs.ckpt"),
+              "checkpoint_every": 1, "wal_sync": False}
+    checkpointed = DRSEngine(dict(config))
+    checkpointed.store("A", {"n": 1}, connections)
+    checkpointed.store("B", {}, [{"target": "A", "relation": "s"}])
+    checkpointed.close()
+    restarted = DRSEngine(dict(config))
+    assert {concept: restarted.query(concept) for concept in ("A", "B")} == expected
+    restarted.close()
+
+def test_snapshot_keeps_parallel_connections(drs_instance, tmp_path):
+    """
+    Tests that several connections to the same target survive a snapshot.
+    """
+    connections = [{"target": "B", "relation": "r1"}, {"target": "B", "relation": "r2", "weight": 2.0}]
+    drs_instance.store("A", {}, connections=connections)
+    path = str(tmp_path / "drs.snapshot")
+    drs_instance.save_snapshot(path)
+
+    drs_instance.load_snapshot(path)
+    assert drs_instance.query("A")["connections"] == connections
+
+def test_snapshot_rejects_foreign_file(tmp_path):
+    """
+    Tests that loading a file that is not a snapshot fails cleanly.
+    """
+    path = tmp_path / "not-a-snapshot"
+    path.write_bytes(b"\0" * 512)
+    with pytest.raises(ValueError):
+        DRSEngine({"snapshot": str(path)})
+
+def test_store_many_merges_and_deduplicates(drs_instance):
+    """
+    Tests that bulk ingestion merges repeated concepts and drops duplicate edges.
+    """
+    records = [
+        ("A", {"kind": "x"}, [{"target": "B", "relation": "r"}]),
+        {"concept": "B", "data": {"kind": "y"}, "connections": []},
+        ("A", {"rank": 1}, [{"target": "B", "relation": "r"}, {"target": "C", "relation": "s", "weight": 2.0}]),
+        ("C", None, None),
+    ]
+    stats = drs_instance.store_many(iter(records), batch_size=2)
+
+    assert stats["records"] == 4
+    assert stats["concepts"] == 3
+    assert stats["edges"] == 2
+    assert stats["duplicate_edges"] == 1
+    assert drs_instance.query("A")["data"] == {"kind": "x", "rank": 1}
+    assert drs_instance.query("C")["data"] == {}
+    assert drs_instance.find_connections("A", "C") == ["A", "s", "C"]
+
+def test_store_many_from_files(drs_instance, tmp_path):
+    """
+    Tests streaming records from JSONL and CSV files.
+    """
+    from core_engine.drs_engine.ingest import read_csv, read_jsonl
+
+    jsonl = tmp_path / "concepts.jsonl"
+    jsonl.write_text('{"concept": "UNE", "connections": [{"target": "DRS", "relation": "depends_on"}]}\n\n'
+                     '{"concept": "DRS", "data": {"role": "memory"}}\n')
+    drs_instance.store_many(read_jsonl(str(jsonl)))
+
+    edges = tmp_path / "edges.csv"
+    edges.write_text("concept,target,relation,weight,layer\n"
+                     "HALIC,UNE,calls,0.5,interface\n"
+                     "HALIC,DRS,reads,3,\n")
+    drs_instance.store_many(read_csv(str(edges)))
+
+    assert drs_instance.query("DRS")["data"] == {"role": "memory"}
+    assert drs_instance.query("HALIC")["data"] == {"layer": "interface"}
+    assert drs_instance.query("HALIC")["connections"] == [
+        {"target": "UNE", "relation": "calls", "weight": 0.5},
+        {"target": "DRS", "relation": "reads", "weight": 3.0},
+    ]
+    assert drs_instance.find_connections("HALIC", "DRS", strategy="dijkstra") == [
+        "HALIC", "calls", "UNE", "depends_on", "DRS"]
+
+def test_connect_and_disconnect(drs_instance):
+    """
+    Tests adding and removing single connections on a stored concept.
+    """
+    drs_instance.store("A", {"keep": True})
+    drs_instance.store("B", {})
+    drs_instance.connect("A", "B", "links", weight=2.0)
+    drs_instance.connect("A", "B", "links", weight=3.0)  # Repeating only updates the weight.
+
+    assert drs_instance.query("A") == {"data": {"keep": True},
+                                       "connections": [{"target": "B", "relation": "links", "weight": 3.0}]}
+    assert drs_instance.find_connections("A", "B") == ["A", "links", "B"]
+    assert drs_instance.disconnect("A", "B") is True
+    assert drs_instance.disconnect("A", "B") is False
+    assert drs_instance.find_connections("A", "B") == []
+    with pytest.raises(KeyError):
+        drs_instance.connect("UNKNOWN", "B", "links")
+
+def test_write_ahead_log_replays_after_crash(tmp_path):
+    """
+    Tests that committed mutations survive an engine that was never closed,
+    and that a torn record at the end of the log is ignored.
+    """
+    config = {"wal_path": str(tmp_path / "drs.wal"), "wal_group_commit_size": 1, "wal_sync": False}
+    drs = DRSEngine(dict(config))
+    drs.store("A", {"v": 1}, connections=[{"target": "B", "relation": "r"}])
+    drs.store("B", {})
+    drs.store("A", {"v": 2}, connections=[])
+    drs.connect("A", "B", "again")
+    drs.disconnect("B", "A")
+    drs.store_many([("C", {}, [{"target": "A", "relation": "s"}])])
+    # Simulate a crash halfway through writing the next record.
+    with open(config["wal_path"], "ab") as handle:
+        handle.write(b"\x40\x00\x00\x00garbage")
+
+    recovered = DRSEngine(dict(config))
+    assert recovered.query("A") == {"data": {"v": 2}, "connections": [{"target": "B", "relation": "again"}]}
+    assert recovered.find_connections("C", "B") == ["C", "s", "A", "again", "B"]
+    recovered.store("D", {})
+    recovered.close()
+    assert DRSEngine(dict(config)).query("D") == {"data": {}, "connections": []}
+
+def test_store_many_logs_nothing_of_a_batch_that_fails(tmp_path):
+    """
+    Tests that a record failing to serialize mid-batch leaves the batch's
+    earlier records out of the log, the store and the version counter.
+    """
+    config = {"wal_path": str(tmp_path / "drs.wal"), "wal_sync": False}
+    drs = DRSEngine(dict(config))
+    drs.store("base", {})
+    version, (cursor, _names) = drs.version, drs.added_concepts()
+
+    with pytest.raises(TypeError):
+        drs.store_many([("a", {"x": 1}, []), ("b", {"x": {1, 2}}, [])])
+    assert drs.query("a") is None
+    assert drs.version == version
+    assert drs.added_concepts(cursor)[1] == []
+    drs.close()
+
+    restarted = DRSEngine(dict(config))
+    assert restarted.query("a") is None and restarted.query("base") is not None
+    restarted.close()
+
+def test_write_ahead_log_commits_on_interval(tmp_path):
+    """
+    Tests that a lone mutation reaches the log on disk within the commit
+    interval, without later writes or a close.
+    """
+    from core_engine.drs_engine.wal import read_wal
+    config = {"wal_path": str(tmp_path / "drs.wal"), "wal_group_commit_size": 64,
+              "wal_group_commit_interval": 0.05, "wal_sync": False}
+    drs = DRSEngine(dict(config))
+    drs.store("A", {"v": 1})
+    time.sleep(0.3)
+
+    assert [record["concept"] for record in read_wal(config["wal_path"])] == ["A"]
+    drs.close()
+
+def test_write_ahead_log_checkpoints(tmp_path):
+    """
+    Tests that the log is compacted into a checkpoint and both are used on restart.
+    """
+    config = {"wal_path": str(tmp_path / "drs.wal"), "checkpoint_path": str(tmp_path / "drs.ckpt"),
+              "checkpoint_every": 3, "wal_sync": False}
+    drs = DRSEngine(dict(config))
+    for index in range(4):
+        drs.store(f"N{index}", {"i": index}, connections=[{"target": f"N{index + 1}", "relation": "next"}])
+    drs.close()
+
+    from core_engine.drs_engine.wal import read_wal
+    assert [record["concept"] for record in read_wal(config["wal_path"])] == ["N3"]
+
+    restarted = DRSEngine(dict(config))
+    assert len(restarted._storage) == 4
+    assert restarted.find_connections("N0", "N3") == ["N0", "next", "N1", "next", "N2", "next", "N3"]
+
+def test_read_write_lock_shares_reads_and_excludes_writes():
+    """
+    Tests that readers hold the lock together while a writer waits for them.
+    """
+    import threading
+    from core_engine.drs_engine.concurrency import ReadWriteLock
+
+    lock = ReadWriteLock()
+    both_reading = threading.Barrier(2, timeout=5)
+    events = []
+
+    def reader():
+        with lock.read():
+            both_reading.wait()  # Only passes if both readers are inside at once.
+            events.append("read")
+
+    def writer():
+        with lock.write():
+            events.append("write")
+
+    with lock.read():
+        readers = [threading.Thread(target=reader) for _ in range(2)]
+        for thread in readers:
+            thread.start()
+        for thread in readers:
+            thread.join(timeout=5)
+        writing = threading.Thread(target=writer)
+        writing.start()
+        writing.join(timeout=0.1)
+        assert events == ["read", "read"]  # The writer is still blocked by us.
+    writing.join(timeout=5)
+    assert events == ["read", "read", "write"]
+
+def test_concurrent_queries_during_ingestion():
+    """
+    Tests that readers always see complete records while a writer ingests.
+    """
+    import threading
+
+    drs = DRSEngine({"backend": "compact", "concurrency": "rwlock"})
+    drs.store("hub", {"generation": 0}, connections=[{"target": "leaf_0", "relation": "has"}])
+    drs.store("leaf_0", {})
+    errors = []
+
+    def ingest():
+        for generation in range(1, 30):
+            drs.store_many([(f"leaf_{generation}", {}, [])] + [
+                ("hub", {"generation": generation},
+                 [{"target": f"leaf_{generation}", "relation": "has"}])], batch_size=1)
+
+    def read():
+        for _ in range(200):
+            record = drs.query("hub")
+            generation = record["data"]["generation"]
+            if record["connections"] != [{"target": f"leaf_{generation}", "relation": "has"}]:
+                errors.append(record)
+            # Leaves are ingested before the hub points at them.
+            if drs.query(f"leaf_{generation}") is None:
+                errors.append(generation)
+            drs.find_connections("leaf_0", "hub")
+
+    threads = [threading.Thread(target=ingest)] + [threading.Thread(target=read) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+
+def test_query_similar_finds_concepts_by_meaning(tmp_path):
+    """
+    Tests semantic lookup with text and explicit embeddings, including after a
+    snapshot reload.
+    """
+    pytest.importorskip("numpy")
+    drs = DRSEngine({"vector_index": {"dim": 128}})
+    drs.store("AI_Ethics", {"description": "moral principles for artificial intelligence"})
+    drs.store("Water_Cycle", {"description": "evaporation, condensation and rain"})
+    drs.store("Neural_Networks", {"description": "layers of artificial neurons"})
+    drs.store("Pinned", {"embedding": [1.0] + [0.0] * 127})
+
+    assert drs.query_similar("ethics of artificial intelligence", k=1)[0][0] == "AI_Ethics"
+    assert drs.query_similar([2.0] + [0.0] * 127, k=1) == [("Pinned", pytest.approx(1.0))]
+    batch = drs.query_similar_many(["rain and evaporation", "neurons"], k=2)
+    assert [results[0][0] for results in batch] == ["Water_Cycle", "Neural_Networks"]
+
+    path = str(tmp_path / "drs.snapshot")
+    drs.save_snapshot(path)
+    restored = DRSEngine({"snapshot": path, "vector_index": {"dim": 128}})
+    assert restored.query_similar("intelligence ethics", k=1)[0][0] == "AI_Ethics"
+
+def test_vector_index_rejects_bad_embeddings_before_logging(tmp_path):
+    """
+    Tests that a wrongly sized embedding is rejected before it is logged or
+    stored, and that the IVF index is trained by the engine, not by searches.
+    """
+    pytest.importorskip("numpy")
+    from core_engine.drs_engine.wal import read_wal
+    config = {"vector_index": {"dim": 4, "ivf_threshold": 8, "nlist": 2, "nprobe": 1},
+              "wal_path": str(tmp_path / "drs.wal"), "wal_group_commit_size": 1, "wal_sync": False}
+    drs = DRSEngine(config)
+    with pytest.raises(ValueError):
+        drs.store("Bad", {"embedding": [1.0, 0.0]})
+    with pytest.raises(ValueError):
+        drs.store_many([("Good", {}, []), ("Bad", {"embedding": [1.0]}, [])])
+    assert drs.query("Bad") is None and drs.query("Good") is None
+    assert list(read_wal(config["wal_path"])) == []
+
+    for index in range(10):
+        drs.store(f"C{index}", {"embedding": [float(index), 1.0, 0.0, 0.0]})
+    assert drs._vectors.needs_training()
+    assert drs.query_similar([9.0, 1.0, 0.0, 0.0], k=1)[0][0] == "C9"
+    assert not drs._vectors.needs_training()
+    drs.close()
+
+def test_vector_index_approximate_search_matches_exact():
+    """
+    Tests that the IVF index returns the exact nearest neighbour for queries
+    that sit right next to a stored vector.
+    """
+    np = pytest.importorskip("numpy")
+    from core_engine.drs_engine.vector_index import VectorIndex
+
+    rng = np.random.default_rng(1)
+    vectors = rng.normal(size=(500, 16)).astype(np.float32)
+    index = VectorIndex(16, ivf_threshold=100, nlist=10, nprobe=3)
+    for row, vector in enumerate(vectors):
+        index.add(f"c{row}", vector)
+    index.remove("c0")
+
+    queries = vectors[1:21] + 0.01 * rng.normal(size=(20, 16)).astype(np.float32)
+    approximate = index.search(queries, k=1)
+    exact = index.search(queries, k=1, exact=True)
+    assert [hit[0][0] for hit in exact] == [f"c{row}" for row in range(1, 21)]
+    assert sum(a[0][0] == e[0][0] for a, e in zip(approximate, exact)) >= 18
+    assert all(hit[0] != "c0" for hit in index.search(vectors[0], k=5, exact=True))
+
+def test_neighbourhood_expands_many_concepts(drs_instance):
+    """
+    Tests k-hop neighbourhoods for several concepts at once, with a limit.
+    """
+    drs_instance.store("UNE", {}, [{"target": "DRS", "relation": "depends_on"}])
+    drs_instance.store("DRS", {}, [{"target": "HALIC", "relation": "feeds"},
+                                   {"target": "Charter", "relation": "governed_by"}])
+    drs_instance.store("HALIC", {}, [{"target": "UNE", "relation": "drives"}])
+
+    result = drs_instance.neighbourhood(["UNE", "HALIC", "UNE", "Unknown"], hops=2)
+    assert set(result) == {"UNE", "HALIC", "Unknown"}
+    assert sorted(result["UNE"]) == [("Charter", 2), ("DRS", 1), ("HALIC", 2)]
+    assert sorted(result["HALIC"]) == [("DRS", 2), ("UNE", 1)]
+    assert result["Unknown"] == []
+    assert drs_instance.neighbourhood(["UNE"], hops=5, limit=2)["UNE"][0] == ("DRS", 1)
+    assert len(drs_instance.neighbourhood(["UNE"], hops=5, limit=2)["UNE"]) == 2
+
+def test_focus_region_merges_sources_and_keeps_cheapest_paths(drs_instance):
+    """
+    Tests that the region around several concepts reaches each concept once,
+    from its nearest source, along the cheapest path of that length.
+    """
+    drs_instance.store("UNE", {"role": "focus"}, [{"target": "DRS", "relation": "depends_on", "weight": 3.0},
+                                                  {"target": "HALIC", "relation": "feeds"}])
+    drs_instance.store("HALIC", {}, [{"target": "DRS", "relation": "queries"},
+                                     {"target": "Charter", "relation": "governed_by"}])
+    drs_instance.store("Charter", {}, [{"target": "Axioms", "relation": "contains"}])
+
+    region = drs_instance.focus_region(["UNE", "Charter", "Unknown"], hops=1)
+    assert set(region) == {"UNE", "Charter", "DRS", "HALIC", "Axioms"}
+    assert region["UNE"] == {"hops": 0, "cost": 0.0, "path": ["UNE"], "data": {"role": "focus"}}
+    assert region["DRS"]["path"] == ["UNE", "depends_on", "DRS"] and region["DRS"]["cost"] == 3.0
+    assert region["Axioms"]["data"] is None
+
+    region = drs_instance.focus_region(["HALIC", "UNE"], hops=2)
+    assert region["DRS"]["path"] == ["HALIC", "queries", "DRS"]
+    assert len(drs_instance.focus_region(["UNE"], hops=5, limit=2)) == 2
+
+def test_focus_regions_match_separate_focus_regions(drs_instance):
+    """
+    Tests that regions searched together equal those searched one at a time,
+    limits included.
+    """
+    for i in range(40):
+        drs_instance.store(f"c{i}", {}, [{"target": f"c{(i * 7 + 3) % 40}", "relation": "r", "weight": i % 3},
+                                         {"target": f"c{(i + 1) % 40}", "relation": "next"}])
+    groups = [["c0"], ["c5", "c17"], [], ["c0", "Unknown"], ["c30", "c31", "c2"]]
+
+    for hops, limit in [(2, None), (3, 6), (5, 1)]:
+        assert (drs_instance.focus_regions(groups, hops=hops, limit=limit)
+                == [drs_instance.focus_region(group, hops=hops, limit=limit) for group in groups])
+    assert drs_instance.focus_regions([]) == []
+
+def test_connections_many_matches_find_connections(drs_instance):
+    """
+    Tests that batched path finding agrees with one-pair-at-a-time searches.
+    """
+    for i in range(30):
+        drs_instance.store(f"c{i}", {}, [{"target": f"c{(i * 5 + 1) % 30}", "relation": "r"},
+                                         {"target": f"c{(i + 1) % 30}", "relation": "next", "weight": 4}])
+    pairs = [("c0", "c29"), ("c0", "c17"), ("c3", "c3"), ("c8", "c2"), ("c0", "missing"), ("c0", "c29")]
+
+    batched = drs_instance.connections_many(pairs)
+    assert [len(path) for path in batched] == [len(drs_instance.find_connections(*pair)) for pair in pairs]
+    assert batched[2] == ["c3"] and batched[4] == []
+    assert all(path[0] == start and path[-1] == end for path, (start, end) in zip(batched, pairs) if path)
+    assert (drs_instance.connections_many(pairs, strategy="dijkstra")
+            == [drs_instance.find_connections(*pair, strategy="dijkstra") for pair in pairs])
+    assert drs_instance.connections_many([("c0", "c29")], max_depth=1) == [[]]
+
+@pytest.mark.parametrize("backend", ["in-memory", "compact"])
+def test_cache_is_invalidated_only_by_relevant_changes(backend):
+    """
+    Tests that cached paths survive unrelated writes and are dropped by any
+    write that could change them.
+    """
+    drs = DRSEngine({"backend": backend, "cache": True})
+    drs.store("A", {}, [{"target": "B", "relation": "r"}])
+    drs.store("B", {}, [{"target": "C", "relation": "r"}])
+    drs.store("C", {})
+    drs.store("X", {})
+
+    assert drs.find_connections("A", "C") == ["A", "r", "B", "r", "C"]
+    assert drs.find_connections("A", "C") == ["A", "r", "B", "r", "C"]
+    assert drs.cache_stats()["hits"] == 1
+
+    drs.store("X", {"note": "unrelated"}, [{"target": "Y", "relation": "r"}])
+    drs.find_connections("A", "C")
+    assert drs.cache_stats()["hits"] == 2
+
+    drs.connect("A", "C", "shortcut")
+    assert drs.find_connections("A", "C") == ["A", "shortcut", "C"]
+    drs.disconnect("A", "C")
+    drs.disconnect("B", "C")
+    assert drs.find_connections("A", "C") == []
+
+    assert drs.query("A")["connections"] == [{"target": "B", "relation": "r"}]
+    drs.store_many([("A", {"v": 2}, [])])
+    assert drs.query("A") == {"data": {"v": 2}, "connections": []}
+
+def test_dependency_cache_evicts_and_expires():
+    """
+    Tests the LRU bound and TTL expiry of the DependencyCache.
+    """
+    from core_engine.drs_engine.path_cache import DependencyCache
+
+    now = [0.0]
+    cache = DependencyCache(maxsize=2, ttl=10, clock=lambda: now[0])
+    cache.put("a", 1, {"A"})
+    cache.put("b", 2, {"B"})
+    assert cache.get("a") == (True, 1)
+    cache.put("c", 3, {"A", "C"})
+    assert cache.get("b") == (False, None)
+
+    assert cache.invalidate(["C"]) == 1
+    assert cache.get("a") == (True, 1)
+    now[0] = 10.0
+    assert cache.get("a") == (False, None)
+
+    stats = cache.stats()
+    assert (stats["evictions"], stats["expirations"], stats["invalidations"], stats["size"]) == (1, 1, 1, 0)
+
+def test_sharded_drs_matches_single_process():
+    """
+    Tests that a hash-sharded DRS stores, routes and finds the same paths as a
+    single DRSEngine over the same records.
+    """
+    from core_engine.drs_engine.sharding import ShardedDRSEngine
+
+    records = [(f"c{i}", {"i": i}, [{"target": f"c{(i * 7 + 3) % 60}", "relation": "r"},
+                                    {"target": f"c{(i + 1) % 60}", "relation": "next", "weight": 5}])
+               for i in range(60)]
+    single = DRSEngine({})
+    single.store_many(records)
+    sharded = ShardedDRSEngine({"shards": 3})
+    try:
+        stats = sharded.store_many(records, batch_size=7)
+        assert (stats["concepts"], stats["edges"], len(sharded)) == (60, 120, 60)
+        assert {sharded.shard_for(f"c{i}") for i in range(60)} == {0, 1, 2}
+        assert sharded.query("c5") == single.query("c5")
+        for start, end in [("c0", "c59"), ("c13", "c2"), ("c40", "c41"), ("c7", "c7")]:
+            assert len(sharded.find_connections(start, end)) == len(single.find_connections(start, end))
+            assert (len(sharded.find_connections(start, end, strategy="dijkstra"))
+                    == len(single.find_connections(start, end, strategy="dijkstra")))
+        assert sharded.find_connections("c0", "missing") == []
+
+        sharded.store("hub", {}, [{"target": "c59", "relation": "shortcut"}])
+        sharded.connect("c0", "hub", "jump")
+        assert sharded.find_connections("c0", "c59") == ["c0", "jump", "hub", "shortcut", "c59"]
+        assert sharded.disconnect("c0", "hub")
+    finally:
+        sharded.close()
+
+def test_range_sharded_drs_routes_and_persists(tmp_path):
+    """
+    Tests range partitioning, error propagation from the shards, and per-shard
+    write-ahead logs surviving a restart.
+    """
+    from core_engine.drs_engine.sharding import ShardedDRSEngine
+
+    config = {"shard_boundaries": ["H", "P"], "wal_path": str(tmp_path / "drs.wal")}
+    sharded = ShardedDRSEngine(config)
+    try:
+        assert [sharded.shard_for(name) for name in ("AI_Ethics", "HALIC", "UNE")] == [0, 1, 2]
+        sharded.store("UNE", {}, [{"target": "DRS", "relation": "depends_on"}])
+        sharded.store("DRS", {}, [{"target": "HALIC", "relation": "feeds"}])
+        sharded.store("HALIC", {})
+        with pytest.raises(KeyError):
+            sharded.connect("Unknown", "UNE", "r")
+        with pytest.raises(ValueError):
+            sharded.store_many([("Bad", {}, [{"relation": "no target"}])])
+    finally:
+        sharded.close()
+
+    assert (tmp_path / "drs.wal.shard2").exists()
+    restored = ShardedDRSEngine(config)
+    try:
+        assert restored.find_connections("UNE", "HALIC") == ["UNE", "depends_on", "DRS", "feeds", "HALIC"]
+    finally:
+        restored.close()
+
+    with pytest.raises(ValueError):
+        ShardedDRSEngine({"shard_boundaries": ["P", "H"]})
+
+def test_sharded_drs_does_not_fork_by_default(monkeypatch):
+    """
+    Tests that shard processes are not forked from a possibly multithreaded
+    parent unless "fork" is asked for.
+    """
+    import multiprocessing
+
+    from core_engine.drs_engine.sharding import ShardedDRSEngine
+
+    methods = []
+    get_context = multiprocessing.get_context
+    monkeypatch.setattr(multiprocessing, "get_context", lambda method=None: methods.append(method) or get_context(method))
+    sharded = ShardedDRSEngine({"shards": 1})
+    try:
+        sharded.store("UNE", {})
+        assert sharded.query("UNE")["data"] == {}
+    finally:
+        sharded.close()
+    assert methods == ["forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"]
@@ -72,3 +72,183 @@ def test_process_interaction_returns_valid_verdict(halic_instance):
     assert "GoldenDAG:" in final_text
     assert "Trace ID:" in final_text
     assert "Codex ID:" in final_text
+
+def test_process_interaction_async_matches_sync(halic_instance):
+    """
+    Tests that the async pipeline, calling synchronous engines in executor
+    threads, produces the same kind of verdict as the synchronous one.
+    """
+    import asyncio
+
+    final_verdict = asyncio.run(halic_instance.process_interaction_async("  Test prompt "))
+
+    assert final_verdict["status"] == "ALLOW"
+    assert "This is a helpful response based on the concepts: ['Test', 'prompt']." in final_verdict["final_text"]
+    assert "GoldenDAG:" in final_verdict["final_text"]
+
+class AsyncMockUNE(MockUNE):
+    """A mock UNE implementing the async protocol, with a simulated DRS delay."""
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    async def direct_focus_async(self, intent: str, context: dict):
+        import asyncio
+        await asyncio.sleep(self.delay)
+        return self.direct_focus(intent, context)
+
+class AsyncMockConscientia:
+    """A mock Conscientia engine implementing the async protocol."""
+    async def evaluate_ethical_implications_async(self, proposed_action: dict):
+        import asyncio
+        await asyncio.sleep(0.05)
+        return {"compliance_status": "PASS", "risks_identified": [], "mitigation_suggestions": []}
+
+def test_process_interaction_async_overlaps_stages_and_interactions():
+    """
+    Tests that the Conscientia review overlaps UNE planning and that many
+    interactions are served concurrently from one event loop.
+    """
+    import asyncio
+    import time
+    from interface_layer.halic.async_protocol import AsyncEthicsEngine, AsyncFocusEngine
+
+    une, conscientia = AsyncMockUNE(delay=0.05), AsyncMockConscientia()
+    assert isinstance(une, AsyncFocusEngine) and isinstance(conscientia, AsyncEthicsEngine)
+    halic = HALICEngine({}, une, MockSentiaGuard(), conscientia)
+
+    async def serve(count):
+        return await asyncio.gather(*(halic.process_interaction_async(f"prompt {i}") for i in range(count)))
+
+    started = time.perf_counter()
+    verdicts = asyncio.run(serve(1000))
+    # Run one after another, the stages alone would take 1000 * 0.1 s.
+    assert time.perf_counter() - started < 10
+    assert all(verdict["ethics_report"]["compliance_status"] == "PASS" for verdict in verdicts)
+    assert "['prompt', '999']" in verdicts[999]["final_text"]
+
+def test_process_interaction_async_enforces_stage_timeouts():
+    """
+    Tests that a stage exceeding its timeout raises StageTimeoutError naming
+    the stage, and that unknown stages are rejected.
+    """
+    import asyncio
+    from interface_layer.halic.async_protocol import StageTimeoutError
+
+    halic = HALICEngine({"stage_timeouts": {"plan": 0.01}}, AsyncMockUNE(delay=1), MockSentiaGuard(),
+                        AsyncMockConscientia())
+    with pytest.raises(StageTimeoutError) as error:
+        asyncio.run(halic.process_interaction_async("Slow prompt"))
+    assert error.value.stage == "plan"
+
+    with pytest.raises(ValueError):
+        HALICEngine({"stage_timeouts": {"thinking": 1}}, MockUNE(), MockSentiaGuard())
+
+def test_process_many_scans_in_process():
+    """
+    Tests that HALIC refuses scan_workers other than 1, as every batch would
+    start a process pool of its own.
+    """
+    with pytest.raises(ValueError):
+        HALICEngine({"scan_workers": 4}, MockUNE(), MockSentiaGuard())
+    assert HALICEngine({"scan_workers": 1}, MockUNE(), MockSentiaGuard()) is not None
+
+def test_micro_batching_scheduler_groups_concurrent_calls(halic_instance):
+    """
+    Tests that concurrent interactions are grouped into batches and that each
+    caller receives the verdict for its own prompt.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from interface_layer.halic.batching import MicroBatchScheduler
+
+    with MicroBatchScheduler(halic_instance, max_batch_size=16, max_wait=0.05, dispatchers=2) as scheduler:
+        with ThreadPoolExecutor(max_workers=32) as clients:
+            verdicts = list(clients.map(scheduler.process_interaction, [f"prompt {i}" for i in range(64)]))
+        stats = scheduler.stats()
+
+    assert all(f"['prompt', '{i}']" in verdict["final_text"] for i, verdict in enumerate(verdicts))
+    assert stats["dispatched"] == 64 and stats["batches"] < 64
+    assert stats["largest_batch"] <= 16
+    with pytest.raises(RuntimeError):
+        scheduler.submit("too late")
+
+def test_micro_batching_scheduler_applies_back_pressure():
+    """
+    Tests that a full queue turns callers away with SchedulerFullError, and that
+    callers whose prompts fail on their own as well get their errors.
+    """
+    import threading
+    import time
+    from interface_layer.halic.batching import MicroBatchScheduler, SchedulerFullError
+
+    release = threading.Event()
+
+    class BlockingHALIC:
+        def process_many(self, raw_prompts):
+            release.wait()
+            raise ValueError("engine failure")
+
+        def process_interaction(self, raw_prompt):
+            raise ValueError("engine failure")
+
+    scheduler = MicroBatchScheduler(BlockingHALIC(), max_batch_size=1, max_wait=0, queue_size=1,
+                                    submit_timeout=0)
+    first = scheduler.submit("dispatched")
+    while scheduler.stats()["batches"] == 0:
+        time.sleep(0.001)  # Wait until the dispatcher holds the first prompt, leaving the queue empty.
+    second = scheduler.submit("queued")
+    with pytest.raises(SchedulerFullError):
+        scheduler.submit("rejected")
+    release.set()
+    scheduler.close()
+
+    for future in (first, second):
+        with pytest.raises(ValueError):
+            future.result(timeout=5)
+    assert scheduler.stats()["rejected"] == 1
+
+def test_micro_batching_scheduler_isolates_failing_prompts(halic_instance):
+    """
+    Tests that when one prompt makes its batch fail, only its caller gets the
+    error and the other callers in the batch still get their verdicts.
+    """
+    from interface_layer.halic.batching import MicroBatchScheduler
+
+    class FailingUNE(MockUNE):
+        def direct_focus(self, intent: str, context: dict):
+            if intent == "bad prompt":
+                raise ValueError("unplannable intent")
+            return super().direct_focus(intent, context)
+
+    halic_instance.une = FailingUNE()
+    scheduler = MicroBatchScheduler(halic_instance, max_batch_size=3, max_wait=1)
+    futures = [scheduler.submit(raw_prompt) for raw_prompt in ("good prompt", "bad prompt", "other prompt")]
+    scheduler.close()
+
+    assert scheduler.stats()["batches"] == 1
+    assert "['good', 'prompt']" in futures[0].result(timeout=5)["final_text"]
+    with pytest.raises(ValueError, match="unplannable intent"):
+        futures[1].result(timeout=5)
+    assert "['other', 'prompt']" in futures[2].result(timeout=5)["final_text"]
+
+def test_format_response_matches_reference_hashes(halic_instance, monkeypatch):
+    """
+    Tests that the incremental, memoized hashing produces exactly the trace
+    ID, Codex ID and GoldenDAG of hashing the concatenated strings.
+    """
+    import hashlib
+    from interface_layer.halic import halic_core
+
+    monkeypatch.setattr(halic_core.time, "time", lambda: 1700000000.25)
+    intent = "Explain symbiotic intelligence ✓"
+    core_output = {"key_concepts": ["symbiotic"], "logical_path": "Start -> Synthesize"}
+    response_body = "This is a helpful response based on the concepts: ['symbiotic']."
+    trace_id = hashlib.sha256(f"{intent}1700000000.25".encode()).hexdigest()[:32]
+    codex_id = hashlib.sha256(b"Start -> Synthesize").hexdigest()[:32]
+    golden_dag = hashlib.sha256(f"{intent}{trace_id}{response_body}".encode()).hexdigest()
+
+    for _ in range(2):  # The second call takes the Codex ID from the cache.
+        formatted_response, seal = halic_instance._format_response(intent, core_output)
+        assert seal == (golden_dag, trace_id, codex_id, 1700000000.25)
+        assert formatted_response == (f"{response_body}\n\n***\n\n**GoldenDAG:** `{golden_dag}`\n"
+                                      f"**Trace ID:** `T-v14.0-RUNTIME-{trace_id}`\n"
+                                      f"**Codex ID:** `C-RUNTIME-RESPONSE-{codex_id}`")
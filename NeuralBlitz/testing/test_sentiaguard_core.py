@@ -66,3 +66,210 @@ def test_scan_handles_empty_string(sentiaguard_instance):
     verdict = sentiaguard_instance.scan_output("")
     assert verdict["status"] == "ALLOW"
     assert verdict["final_text"] == ""
+
+def test_compiled_ruleset_matches_all_rules_in_one_pass():
+    """
+    Tests leftmost-longest redaction of overlapping patterns, blocking, and
+    rejection of empty rules by the compiled ruleset.
+    """
+    from subsystems.sentiaguard.matcher import CompiledRuleset
+
+    ruleset = CompiledRuleset(
+        ["forbidden"],
+        {"ssn": "[SSN]", "ssn 123": "[SSN NUMBER]", "123-45": "[DIGITS]", "mail": "[EMAIL]"},
+    )
+    assert ruleset.scan("my ssn 123-45, mail me, ssn") == (
+        None, "my [SSN NUMBER]-45, [EMAIL] me, [SSN]", 3)
+    assert ruleset.scan("a perfectly safe reply") == (None, "a perfectly safe reply", 0)
+    assert ruleset.scan("ssn then forbidden") == ("forbidden", None, 0)
+
+    many = CompiledRuleset([f"phrase number {i}." for i in range(5000)])
+    assert many.rule_count == 5000
+    assert many.scan("text with phrase number 4321. inside")[0] == "phrase number 4321."
+    assert many.scan("text with phrase number x")[0] is None
+
+    with pytest.raises(ValueError):
+        CompiledRuleset([""])
+
+def test_rules_load_from_file_with_regexes_and_hot_reload(tmp_path):
+    """
+    Tests loading a JSON ruleset with regex patterns, reloading it in place,
+    and keeping the active rules when a reload fails.
+    """
+    import json
+
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps({
+        "FORBIDDEN_PHRASES": ["launch codes"],
+        "SENSITIVE_REGEXES": {r"\b\d{3}-\d{2}-\d{4}\b": "[REDACTED SSN]"},
+    }))
+    engine = SentiaGuardEngine({"rules_path": str(path)}, MockCharterLayer())
+    assert engine.scan_output("my ssn is 123-45-6789.")["final_text"] == "my ssn is [REDACTED SSN]."
+    assert engine.scan_output("the launch codes are")["status"] == "BLOCK"
+    assert engine.reload_rules() is False  # Unchanged file.
+
+    path.write_text(json.dumps({"SENSITIVE_PATTERNS": {"launch codes": "[CLASSIFIED]"}}))
+    assert engine.reload_rules() is True
+    assert engine.scan_output("the launch codes are")["final_text"] == "the [CLASSIFIED] are"
+    assert engine._rules["FORBIDDEN_PHRASES"] == []
+
+    path.write_text(json.dumps({"SENSITIVE_REGEXES": {"(unclosed": "x"}}))
+    with pytest.raises(ValueError):
+        engine.reload_rules()
+    path.write_text(json.dumps({"UNKNOWN_SECTION": []}))
+    with pytest.raises(ValueError):
+        engine.reload_rules()
+    assert engine.scan_output("the launch codes are")["status"] == "REDACT"
+
+def test_rules_scope_leading_regex_flags(tmp_path):
+    """
+    Tests that a regex with leading global flags loads and keeps them, and that
+    regexes that cannot be combined are rejected with ValueError.
+    """
+    import json
+
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps({"SENSITIVE_REGEXES": {"(?i)secret": "[X]", r"\d{4}": "[PIN]"}}))
+    engine = SentiaGuardEngine({"rules_path": str(path)}, MockCharterLayer())
+    assert engine.scan_output("My SECRET pin is 1234.")["final_text"] == "My [X] pin is [PIN]."
+
+    path.write_text(json.dumps({"SENSITIVE_REGEXES": {"(?P<_0>x)": "y"}}))
+    with pytest.raises(ValueError):
+        engine.reload_rules()
+    path.write_text(json.dumps({"SENSITIVE_REGEXES": {r"(a)\1": "y"}}))
+    with pytest.raises(ValueError):
+        engine.reload_rules()
+    assert engine.scan_output("a Secret")["final_text"] == "a [X]"
+
+def test_compiled_rules_are_cached_on_disk(tmp_path, monkeypatch):
+    """
+    Tests that an unchanged ruleset is loaded from the compiled cache rather
+    than compiled again.
+    """
+    from subsystems.sentiaguard import rules as rules_module
+
+    rules = {"FORBIDDEN_PHRASES": ["forbidden"], "SENSITIVE_PATTERNS": {"secret": "[X]"}}
+    cache = tmp_path / "cache"
+    rules_module.compile_rules(rules, str(cache))
+    assert len(list(cache.iterdir())) == 1
+
+    def fail(_rules):
+        raise AssertionError("The cached ruleset should have been used.")
+
+    monkeypatch.setattr(rules_module.CompiledRuleset, "from_rules", fail)
+    cached = rules_module.compile_rules(rules, str(cache))
+    assert cached.scan("a secret") == (None, "a [X]", 1)
+    assert rules_module.ruleset_hash(rules) != rules_module.ruleset_hash({"FORBIDDEN_PHRASES": ["other"]})
+
+def test_compiled_rules_cache_holds_data_not_pickles(tmp_path):
+    """
+    Tests that cached rulesets round-trip through the data-only format, and that
+    a planted pickle is ignored and recompiled rather than loaded.
+    """
+    import pickle
+
+    from subsystems.sentiaguard import rules as rules_module
+
+    rules = {"FORBIDDEN_PHRASES": ["forbidden"], "SENSITIVE_PATTERNS": {"secret": "[X]", "café": "[C]"},
+             "SENSITIVE_REGEXES": {r"\b\d{3}-\d{4}\b": "[PHONE]"}}
+    cache = tmp_path / "cache"
+    compiled = rules_module.compile_rules(rules, str(cache))
+    (path,) = cache.iterdir()
+    assert not path.read_bytes().startswith(b"\x80")  # Not a pickle stream.
+
+    cached = rules_module.compile_rules(rules, str(cache))
+    text = "a secret at the café, call 555-1234"
+    assert cached.scan(text) == compiled.scan(text) == (None, "a [X] at the [C], call [PHONE]", 3)
+    assert cached.scan("so forbidden")[0] == "forbidden"
+    assert cached.rule_count == compiled.rule_count and cached.version == compiled.version
+
+    path.write_bytes(pickle.dumps({"planted": True}))
+    recompiled = rules_module.compile_rules(rules, str(cache))
+    assert recompiled.scan(text) == compiled.scan(text)
+    assert path.read_bytes() == compiled.to_bytes()
+
+def test_stream_scan_releases_safe_prefixes_and_catches_split_phrases(sentiaguard_instance):
+    """
+    Tests that a streamed response is released chunk by chunk, with patterns
+    split across chunks still redacted or blocked.
+    """
+    stream = sentiaguard_instance.open_stream()
+    assert stream.feed("Hello there, ") == "Hello there, "
+    assert stream.feed("your pii_pl") == "your "
+    # The final "e" is held back: it could begin "explicitly_forbidden_content".
+    assert stream.feed("aceholder is safe") == "[REDACTED PII] is saf"
+    assert stream.close() == "e"
+    assert stream.status == "REDACT"
+
+    stream = sentiaguard_instance.open_stream()
+    chunks = ["All good. explicitly_for", "bidden_content follows", " and more"]
+    released = [stream.feed(chunk) for chunk in chunks] + [stream.close()]
+    assert released == ["All good. ", "", "", ""]
+    assert stream.status == "BLOCK"
+
+    text = "pii_placeholder twice: pii_placeholder, then done."
+    stream = sentiaguard_instance.open_stream()
+    streamed = "".join(stream.feed(char) for char in text) + stream.close()
+    assert streamed == sentiaguard_instance.scan_output(text)["final_text"]
+
+@pytest.mark.parametrize("workers, start_method", [(1, None), (2, None), (2, "spawn")])
+def test_scan_many_matches_scan_output(sentiaguard_instance, workers, start_method):
+    """
+    Tests that batch scanning, in a process pool or inline, returns the same
+    verdicts as scanning one text at a time, in order or as completed.
+    """
+    sentiaguard_instance.config["scan_start_method"] = start_method
+    texts = [f"reply {i} " + ("pii_placeholder" if i % 3 == 0 else "")
+             + ("explicitly_forbidden_content" if i % 7 == 0 else "") for i in range(50)]
+    expected = [sentiaguard_instance.scan_output(text) for text in texts]
+
+    assert list(sentiaguard_instance.scan_many(texts, workers=workers, batch_size=8)) == expected
+    unordered = sentiaguard_instance.scan_many(iter(texts), workers=workers, ordered=False, batch_size=8)
+    assert sorted(unordered, key=lambda item: item[0]) == list(enumerate(expected))
+
+def test_verdict_cache_short_circuits_and_follows_versions(tmp_path):
+    """
+    Tests that repeated outputs are answered from a shared verdict cache, which
+    follows ruleset reloads and Charter versions, lets engines with different
+    rulesets share it, and is bounded by LRU eviction.
+    """
+    import json
+    from subsystems.conscientia.conscientia_core import ConscientiaEngine
+    from subsystems.verdict_cache import VerdictCache
+
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps({"SENSITIVE_PATTERNS": {"secret": "[X]"}}))
+    cache = VerdictCache(maxsize=3)
+    charter = MockCharterLayer()
+    guard = SentiaGuardEngine({"rules_path": str(path), "verdict_cache": cache}, charter)
+    conscientia = ConscientiaEngine({"verdict_cache": cache}, charter)
+
+    for _ in range(3):
+        assert guard.scan_output("a secret answer")["final_text"] == "a [X] answer"
+    conscientia.evaluate_ethical_implications({"type": "plan", "content": "x"})
+    conscientia.evaluate_ethical_implications({"content": "x", "type": "plan"})
+    stats = guard.cache_stats()
+    assert stats["namespaces"]["sentiaguard"]["hits"] == 2
+    assert stats["namespaces"]["conscientia"]["hits"] == 1
+    assert stats["hit_ratio"] == pytest.approx(3 / 5)
+
+    path.write_text(json.dumps({"SENSITIVE_PATTERNS": {"answer": "[Y]"}}))
+    guard.reload_rules()
+    assert guard.scan_output("a secret answer")["final_text"] == "a secret [Y]"
+    charter.version = 2
+    assert guard.scan_output("a secret answer")["status"] == "REDACT"
+    assert cache.stats()["namespaces"]["sentiaguard"]["invalidations"] == 0
+
+    # Engines with different rulesets share the namespace without wiping each other.
+    other_path = tmp_path / "other-rules.json"
+    other_path.write_text(json.dumps({"SENSITIVE_PATTERNS": {"secret": "[X]"}}))
+    other = SentiaGuardEngine({"rules_path": str(other_path), "verdict_cache": cache}, charter)
+    hits = cache.stats()["hits"]
+    for _ in range(2):
+        assert guard.scan_output("a secret answer")["final_text"] == "a secret [Y]"
+        assert other.scan_output("a secret answer")["final_text"] == "a [X] answer"
+    assert cache.stats()["hits"] == hits + 3
+
+    for index in range(4):
+        guard.scan_output(f"text {index}")
+    assert cache.stats()["size"] == 3 and cache.stats()["evictions"] >= 2
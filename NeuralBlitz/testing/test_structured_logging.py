@@ -0,0 +1,72 @@
+"""
+Unit tests for the shared structured logging layer.
+
+These tests validate that engine events are filtered by level, sampled, and
+written through the non-blocking queue handler in a structured format.
+"""
+
+import io
+import json
+import queue
+
+import pytest
+from core_engine.structured_logging import (DroppingQueueHandler, configure_logging, get_logger,
+                                            stop_logging)
+
+
+@pytest.fixture
+def stream():
+    """Provides a stream for log output, removing the configuration afterwards."""
+    output = io.StringIO()
+    yield output
+    stop_logging()
+
+
+def test_events_are_filtered_by_level_and_structured(stream):
+    """
+    Tests that events below the configured level are skipped and that the rest
+    are written with their fields, as text or JSON lines.
+    """
+    logger = get_logger("test")
+    configure_logging("INFO", stream=stream)
+    logger.debug("query", concept="hidden")
+    logger.info("store", concept="gravity", edges=2)
+    stop_logging()
+    assert stream.getvalue().count("\n") == 1
+    assert "INFO neuralblitz.test store concept='gravity' edges=2" in stream.getvalue()
+
+    stream.seek(0)
+    stream.truncate()
+    configure_logging("DEBUG", stream=stream, json_lines=True, queue_size=0)
+    logger.debug("query", concept="gravity")
+    record = json.loads(stream.getvalue())
+    assert (record["logger"], record["event"], record["concept"]) == ("neuralblitz.test", "query", "gravity")
+
+
+def test_events_are_sampled(stream):
+    """
+    Tests that sampling keeps about the configured fraction of one event while
+    other events are all kept.
+    """
+    logger = get_logger("test")
+    configure_logging("DEBUG", sample_rates={"test.query": 0.1, "test.never": 0.0}, stream=stream, queue_size=0)
+    for _ in range(2000):
+        logger.debug("query")
+        logger.debug("never")
+    logger.debug("store")
+    lines = stream.getvalue().splitlines()
+    assert 100 < sum(" query" in line for line in lines) < 300
+    assert not any(" never" in line for line in lines)
+    assert lines[-1].endswith(" store")
+
+
+def test_full_queue_drops_records_instead_of_blocking():
+    """
+    Tests that the queue handler never blocks a caller on a full queue.
+    """
+    handler = DroppingQueueHandler(queue.Queue(1))
+    logger = get_logger("test")._logger
+    for _ in range(3):
+        handler.handle(logger.makeRecord(logger.name, 20, __file__, 1, "event", (), None))
+    assert handler.queue.qsize() == 1
+    assert handler.dropped == 2
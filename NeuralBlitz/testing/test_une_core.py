@@ -5,7 +5,12 @@ These tests validate the core functionality of the UNE in isolation, ensuring
 that its logic is sound and its contracts are met.
 """
 
+import copy
+
 import pytest
+from core_engine.drs_engine.drs_manager import DRSEngine
+from core_engine.une import pruning
+from core_engine.une.concept_extractor import ConceptIndex
 from core_engine.une.une_core import UniversalNeuralEngine
 
 # --- Mock Dependencies ---
@@ -66,3 +71,276 @@ def test_direct_focus_returns_valid_plan(une_instance):
     assert focus_plan["status"] == "PLAN_GENERATED"
     assert "symbiotic" in focus_plan["key_concepts"]
     assert "intelligence" in focus_plan["key_concepts"]
+
+def test_direct_focus_many_matches_single_plans(une_instance):
+    """
+    Tests that batch planning returns, in order, the plans `direct_focus`
+    makes one at a time.
+    """
+    intents = ["Explain symbiotic intelligence", "Describe causal reasoning", "Hi"]
+
+    focus_plans = une_instance.direct_focus_many(intents, {})
+
+    assert focus_plans == [une_instance.direct_focus(intent, {}) for intent in intents]
+    assert une_instance.direct_focus_many([], {}) == []
+
+def test_concept_index_prefers_longest_match():
+    """
+    Tests that names are matched across case and separators, the longest name
+    wins over the words inside it, and longer, then more frequent, names rank first.
+    """
+    index = ConceptIndex(["AI_Ethics", "Ethics", "symbiotic intelligence", "intelligence", "Gravity"])
+
+    concepts = index.extract("Ethics of intelligence: is Symbiotic-Intelligence about ai ethics? Ethics!")
+
+    assert concepts == ["symbiotic intelligence", "AI_Ethics", "Ethics", "intelligence"]
+    assert index.extract("nothing relevant here") == []
+    assert index.extract("ethics intelligence ethics", limit=1) == ["Ethics"]
+
+    assert index.remove("symbiotic intelligence") and not index.remove("symbiotic intelligence")
+    assert not index.remove("AI") and len(index) == 4
+    assert index.extract("symbiotic intelligence and ai ethics") == ["AI_Ethics", "intelligence"]
+    assert index.remove("AI_Ethics") and "ai" not in index._root  # Its unshared nodes are pruned.
+
+def test_direct_focus_extracts_drs_concepts():
+    """
+    Tests that key concepts are DRS concept IDs, and that concepts stored
+    after the first plan are found too.
+    """
+    drs = DRSEngine({})
+    drs.store("Symbiotic_Intelligence", {"summary": "Humans and AI thinking together."})
+    une = UniversalNeuralEngine({"max_key_concepts": 2}, drs, MockCharterLayer())
+
+    focus_plan = une.direct_focus("Explain symbiotic intelligence and causal reasoning", {})
+    assert focus_plan["key_concepts"] == ["Symbiotic_Intelligence"]
+
+    drs.store("causal reasoning", {})
+    drs.store("Explain", {})
+    focus_plan = une.direct_focus("Explain symbiotic intelligence and causal reasoning", {})
+    assert focus_plan["key_concepts"] == ["Symbiotic_Intelligence", "causal reasoning"]
+
+def test_concept_index_follows_drs_without_rebuilding(tmp_path, monkeypatch):
+    """
+    Tests that concepts stored after the index is built are added to it
+    without rereading every name, and that loading a snapshot rebuilds it.
+    """
+    drs = DRSEngine({})
+    drs.store("Gravity", {})
+    une = UniversalNeuralEngine({}, drs, MockCharterLayer())
+    assert une.direct_focus("gravity and tides", {})["key_concepts"] == ["Gravity"]
+
+    drs.save_snapshot(str(tmp_path / "drs.snapshot"))
+    names = drs.concept_names
+    monkeypatch.setattr(drs, "concept_names", lambda: pytest.fail("The index should have been extended."))
+    drs.store("Tides", {})
+    drs.connect("Tides", "Gravity", "caused_by")
+    assert une.direct_focus("gravity and tides", {})["key_concepts"] == ["Gravity", "Tides"]
+
+    monkeypatch.setattr(drs, "concept_names", names)
+    drs.load_snapshot(str(tmp_path / "drs.snapshot"))
+    assert une.direct_focus("gravity and tides", {})["key_concepts"] == ["Gravity"]
+
+class CountingCharterLayer(MockCharterLayer):
+    """A compliant Charter Layer that counts its checks."""
+    def __init__(self):
+        self.version = 1
+        self.checks = 0
+
+    def is_compliant(self, action: str) -> bool:
+        self.checks += 1
+        return True
+
+def test_plan_cache_reuses_exact_and_near_duplicate_plans():
+    """
+    Tests that repeated and near-identical intents skip planning, and that a
+    DRS or Charter change invalidates cached plans.
+    """
+    drs = DRSEngine({})
+    drs.store("symbiotic intelligence", {})
+    charter = CountingCharterLayer()
+    une = UniversalNeuralEngine({"plan_cache": True}, drs, charter)
+    intent = "explain how symbiotic intelligence changes scientific research and everyday reasoning"
+
+    focus_plan = une.direct_focus(intent, {"session_id": "1"})
+    assert une.direct_focus("  Explain how SYMBIOTIC intelligence changes scientific research "
+                            "and everyday reasoning?", {"session_id": "2"}) == focus_plan
+    assert une.direct_focus(intent + " today", {}) == focus_plan
+    assert une.direct_focus("What is gravity?", {}) != focus_plan
+    assert charter.checks == 2
+    stats = une.cache_stats()
+    assert (stats["hits"], stats["near_hits"], stats["misses"]) == (1, 1, 2)
+
+    charter.version = 2
+    une.direct_focus(intent, {})
+    drs.store("scientific research", {})
+    assert une.direct_focus(intent, {})["key_concepts"] == ["symbiotic intelligence", "scientific research"]
+    assert charter.checks == 4
+
+def test_plan_cache_never_shares_plans_across_concepts():
+    """
+    Tests that near-identical intents naming different DRS concepts each get
+    their own plan, and that a near duplicate must share enough tokens.
+    """
+    from core_engine.une.plan_cache import PlanCache
+
+    drs = DRSEngine({})
+    for concept in ("quantum", "biology", "chemistry", "logic"):
+        drs.store(concept, {})
+    une = UniversalNeuralEngine({"plan_cache": {"max_distance": 63}}, drs, CountingCharterLayer())
+    template = "please explain the relationship between {} and {} in detail for me"
+
+    first = une.direct_focus(template.format("chemistry", "logic"), {})
+    second = une.direct_focus(template.format("quantum", "biology"), {})
+    assert first["key_concepts"] == ["chemistry", "logic"]
+    assert second["key_concepts"] == ["quantum", "biology"]
+    assert une.cache_stats()["near_hits"] == 0
+
+    cache = PlanCache(max_distance=63)
+    cache.put(cache.key("explain how gravity bends light", concepts=["gravity"]), 1, {"plan": 1})
+    assert cache.get(cache.key("explain how gravity bends light today", concepts=["gravity"]), 1) == (True, {"plan": 1})
+    assert cache.get(cache.key("why does gravity hold planets in orbit", concepts=["gravity"]), 1) == (False, None)
+    with pytest.raises(ValueError):
+        PlanCache(min_similarity=0)
+
+def test_plan_cache_hands_out_independent_copies():
+    """
+    Tests that altering a returned plan, nested context included, does not
+    alter what later cache hits return.
+    """
+    drs = DRSEngine({})
+    drs.store("Gravity", {}, [{"target": "Tides", "relation": "causes"}])
+    une = UniversalNeuralEngine({"plan_cache": True, "pruning": True}, drs, CountingCharterLayer())
+
+    first = une.direct_focus("How does gravity work?", {})
+    expected = copy.deepcopy(first)
+    first["relevant_context"][0]["path"].append("tampered")
+    first["relevant_context"][0]["score"] = -1.0
+    first["key_concepts"].append("tampered")
+
+    assert une.direct_focus("How does gravity work?", {}) == expected
+    assert une.cache_stats()["hits"] == 1
+
+def test_direct_focus_many_uses_plan_cache():
+    """
+    Tests that batch planning serves cached plans, plans repeats within a
+    batch once, and matches uncached plans.
+    """
+    charter = CountingCharterLayer()
+    une = UniversalNeuralEngine({"plan_cache": True}, MockDRSEngine(), charter)
+    intents = ["Explain symbiotic intelligence", "explain symbiotic intelligence!", "Describe causal reasoning"]
+
+    focus_plans = une.direct_focus_many(intents, {})
+    assert focus_plans[1] == focus_plans[0]
+    uncached = UniversalNeuralEngine({}, MockDRSEngine(), MockCharterLayer())
+    assert [focus_plans[0], focus_plans[2]] == uncached.direct_focus_many([intents[0], intents[2]], {})
+    assert une.direct_focus_many(intents, {}) == focus_plans
+    assert une.cache_stats()["misses"] == 2
+    assert charter.checks == 1
+
+def test_relevance_pruner_keeps_best_candidates_within_budget(monkeypatch):
+    """
+    Tests ranking by distance, path cost and word overlap, node and token
+    budgets, and that scoring without NumPy gives the same result.
+    """
+    candidates = {
+        "gravity": {"hops": 0, "cost": 0.0, "path": ["gravity"], "data": {}},
+        "orbit": {"hops": 1, "cost": 1.0, "path": ["gravity", "causes", "orbit"], "data": {}},
+        "tide": {"hops": 1, "cost": 4.0, "path": ["gravity", "causes", "tide"], "data": {"note": "ocean tides"}},
+        "moon": {"hops": 2, "cost": 2.0, "path": ["gravity", "causes", "orbit", "of", "moon"],
+                 "data": {"summary": "the moon orbits the earth and pulls the tides"}},
+    }
+    intent = "how does gravity move the moon"
+
+    kept, pruned = pruning.RelevancePruner(budget=2).prune(intent, candidates)
+    assert [item["concept"] for item in kept] == ["gravity", "orbit"]
+    assert pruned == ["moon", "tide"]
+    assert kept[1]["path"] == ["gravity", "causes", "orbit"]
+
+    kept, pruned = pruning.RelevancePruner(budget=4, budget_unit="tokens").prune(intent, candidates)
+    assert [item["concept"] for item in kept] == ["gravity", "orbit"]
+    overlap_first = pruning.RelevancePruner(budget=2, proximity_weight=0, strength_weight=0)
+    assert [item["concept"] for item in overlap_first.prune(intent, candidates)[0]] == ["moon", "gravity"]
+    assert pruning.RelevancePruner(budget=None).prune(intent, candidates)[1] == []
+
+    ranked = pruning.RelevancePruner(budget=3, budget_unit="tokens").prune(intent, candidates)
+    monkeypatch.setattr(pruning, "np", None)
+    assert pruning.RelevancePruner(budget=3, budget_unit="tokens").prune(intent, candidates) == ranked
+    with pytest.raises(ValueError):
+        pruning.RelevancePruner(budget_unit="bytes")
+
+def test_relevance_pruner_keeps_key_concepts_and_fills_budget_past_large_candidates(monkeypatch):
+    """
+    Tests that key concepts are kept even when larger than the budget, and that
+    a candidate too large to fit is skipped rather than ending the selection.
+    """
+    words = " ".join(["word"] * 50)
+    candidates = {
+        "quantum": {"hops": 0, "cost": 0.0, "path": ["quantum"], "data": {"summary": words}},
+        "gravity": {"hops": 1, "cost": 1.0, "path": ["quantum", "relates", "gravity"], "data": {"note": "curvature"}},
+    }
+    kept, pruned = pruning.RelevancePruner(budget=20, budget_unit="tokens").prune("explain quantum", candidates)
+    assert [item["concept"] for item in kept] == ["quantum"]
+    assert kept[0]["tokens"] == 51 and pruned == ["gravity"]
+
+    candidates["quantum"]["data"] = {}
+    candidates["field"] = {"hops": 1, "cost": 0.0, "path": ["quantum", "has", "field"], "data": {"summary": words}}
+    ranked = pruning.RelevancePruner(budget=None).prune("explain quantum", candidates)[0]
+    assert [item["concept"] for item in ranked] == ["quantum", "field", "gravity"]
+    kept, pruned = pruning.RelevancePruner(budget=20, budget_unit="tokens").prune("explain quantum", candidates)
+    assert [item["concept"] for item in kept] == ["quantum", "gravity"] and pruned == ["field"]
+    monkeypatch.setattr(pruning, "np", None)
+    assert pruning.RelevancePruner(budget=20, budget_unit="tokens").prune("explain quantum", candidates) == (kept, pruned)
+
+def test_direct_focus_prunes_drs_region():
+    """
+    Tests that a plan carries the most relevant concepts around its key
+    concepts and lists the rest as pruned, and that pruning is opt-in.
+    """
+    drs = DRSEngine({})
+    drs.store("gravity", {}, [{"target": "orbit", "relation": "causes"},
+                              {"target": "tide", "relation": "causes", "weight": 4.0}])
+    drs.store("orbit", {}, [{"target": "satellite", "relation": "carries"}])
+    une = UniversalNeuralEngine({"pruning": {"budget": 2}}, drs, MockCharterLayer())
+
+    focus_plan = une.direct_focus("Why does gravity bend light?", {})
+    assert [item["concept"] for item in focus_plan["relevant_context"]] == ["gravity", "orbit"]
+    assert focus_plan["pruned_info"] == ["tide", "satellite"]
+    for config in ({}, {"pruning": False}):
+        unpruned = UniversalNeuralEngine(config, drs, MockCharterLayer()).direct_focus("Why does gravity bend light?", {})
+        assert "relevant_context" not in unpruned
+        assert unpruned["pruned_info"] == [" tangential_topic_A", " historical_data_B (not relevant)"]
+
+class CountingDRSEngine(DRSEngine):
+    """A DRS that counts the region searches made of it."""
+    def __init__(self, config: dict):
+        super().__init__(config)
+        self.region_calls = 0
+
+    def focus_region(self, concepts, hops=2, limit=None):
+        self.region_calls += 1
+        return super().focus_region(concepts, hops=hops, limit=limit)
+
+    def focus_regions(self, concept_groups, hops=2, limit=None):
+        self.region_calls += 1
+        return super().focus_regions(concept_groups, hops=hops, limit=limit)
+
+def test_direct_focus_many_searches_the_drs_once_per_batch():
+    """
+    Tests that a batch's regions come from one DRS call, with and without the
+    plan cache, and give the plans `direct_focus` makes one at a time.
+    """
+    drs = CountingDRSEngine({})
+    drs.store("gravity", {}, [{"target": "orbit", "relation": "causes"}, {"target": "tide", "relation": "causes"}])
+    drs.store("light", {}, [{"target": "optics", "relation": "studied_by"}])
+    intents = ["Why does gravity bend light?", "What is light?", "How does gravity work?", "What is light?", "Hi"]
+
+    for config in ({"pruning": {"budget": 2}}, {"pruning": {"budget": 2}, "plan_cache": True}):
+        une = UniversalNeuralEngine(config, drs, MockCharterLayer())
+        une.direct_focus("warm up the concept index", {})
+        drs.region_calls = 0
+        focus_plans = une.direct_focus_many(intents, {})
+        assert drs.region_calls == 1
+
+        single = UniversalNeuralEngine({"pruning": {"budget": 2}}, drs, MockCharterLayer())
+        assert focus_plans == [single.direct_focus(intent, {}) for intent in intents]
+        assert [item["concept"] for item in focus_plans[1]["relevant_context"]] == ["light", "optics"]